@@ -0,0 +1,78 @@
+"""
+Background archiver for the leaderboard history.
+Keeps PostgreSQL partitions created ahead of time and moves months that
+fall outside the retention window into compressed archive files.
+"""
+import asyncio
+import logging
+from datetime import datetime, UTC
+from typing import List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from . import config
+from .cache import leaderboard_cache
+from .db.partitions import ensure_partitions, archive_before, month_start, add_months
+
+logger = logging.getLogger("snake-game.archiver")
+
+
+class LeaderboardArchiver:
+    """Periodically archives old leaderboard partitions"""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        retention_months: int = config.LEADERBOARD_RETENTION_MONTHS,
+        archive_dir: str = config.LEADERBOARD_ARCHIVE_DIR,
+        interval: float = config.LEADERBOARD_ARCHIVE_INTERVAL,
+        partitions_ahead: int = config.LEADERBOARD_PARTITIONS_AHEAD,
+    ):
+        self.engine = engine
+        self.retention_months = retention_months
+        self.archive_dir = archive_dir
+        self.interval = interval
+        self.partitions_ahead = partitions_ahead
+        self._task: Optional[asyncio.Task] = None
+
+    def cutoff(self, now: Optional[datetime] = None) -> datetime:
+        """Rows dated before this instant are archived"""
+        return add_months(month_start(now or datetime.now(UTC)), -self.retention_months)
+
+    async def run_once(self, now: Optional[datetime] = None) -> List[str]:
+        """Run a single maintenance pass and return the archive files written"""
+        async with self.engine.begin() as conn:
+            await ensure_partitions(conn, now, self.partitions_ahead)
+
+        if self.retention_months <= 0:
+            return []
+
+        written = await archive_before(self.engine, self.cutoff(now), self.archive_dir)
+        if written:
+            leaderboard_cache.invalidate()
+            logger.info(f"Archived leaderboard history to {', '.join(written)}")
+        return written
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Leaderboard archival failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start the background loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the background loop and wait for it to finish"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
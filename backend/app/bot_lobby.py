@@ -0,0 +1,131 @@
+"""
+Server-hosted bot games for the live lobby.
+
+BotLobby runs BOTS_COUNT BotPlayers (app/bots.py), spread over the game
+modes and grid sizes, moving every one of them each BOTS_TICK_INTERVAL
+seconds. Every BOTS_SYNC_INTERVAL seconds their games are upserted into the
+active games table in one transaction, and finished games deleted, so they
+show up in GET /api/games/active next to real players. Besides filling the
+lobby, a large BOTS_COUNT makes a steady load on the game engine and the
+active games table.
+"""
+import asyncio
+import logging
+import random
+import uuid
+from datetime import datetime, UTC
+from typing import List, Optional
+
+from . import config
+from .bots import BotPlayer
+from .database import db
+from .models import GRID_SIZES, ActiveGame
+
+logger = logging.getLogger("snake-game.bots")
+
+MODES = ("walls", "passthrough")
+# Bots moved between yields to the event loop
+TICK_CHUNK = 256
+
+
+class BotLobby:
+    """Plays bot games in the background and publishes them as active games"""
+
+    def __init__(
+        self,
+        count: Optional[int] = None,
+        tick_interval: Optional[float] = None,
+        sync_interval: Optional[float] = None,
+        seed: Optional[int] = None,
+    ):
+        self.count = config.BOTS_COUNT if count is None else count
+        self.tick_interval = config.BOTS_TICK_INTERVAL if tick_interval is None else tick_interval
+        self.sync_interval = config.BOTS_SYNC_INTERVAL if sync_interval is None else sync_interval
+        rng = random.Random(seed)
+        # Tells this lobby's bots from those of other workers and hosts
+        self.instance = uuid.uuid4().hex[:6]
+        self.bots: List[BotPlayer] = []
+        self.games: List[ActiveGame] = []
+        for slot in range(self.count):
+            mode = MODES[slot % len(MODES)]
+            grid_size = GRID_SIZES[slot // len(MODES) % len(GRID_SIZES)]
+            self.bots.append(BotPlayer(mode, grid_size, random.Random(rng.random())))
+            self.games.append(self._new_game(slot, mode, grid_size))
+        # Games finished since the last sync
+        self._finished: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def _new_game(self, slot: int, mode: str, grid_size: int) -> ActiveGame:
+        username = f"bot-{self.instance}-{slot}"
+        return ActiveGame(
+            id=f"{username}-{uuid.uuid4().hex[:8]}",
+            username=username,
+            score=0,
+            mode=mode,
+            gridSize=grid_size,
+            startedAt=datetime.now(UTC),
+        )
+
+    def _advance(self, slot: int):
+        bot, game = self.bots[slot], self.games[slot]
+        if bot.step() == "gameover":
+            self._finished.append(game.id)
+            bot.restart()
+            self.games[slot] = self._new_game(slot, game.mode, game.gridSize)
+        else:
+            game.score = bot.game.score
+
+    async def tick(self):
+        """Move every bot once, starting a new game for bots that lost"""
+        for start in range(0, self.count, TICK_CHUNK):
+            for slot in range(start, min(start + TICK_CHUNK, self.count)):
+                self._advance(slot)
+            # Let requests run between chunks of a large lobby
+            await asyncio.sleep(0)
+
+    async def sync(self):
+        """Write the bots' games to the active games table"""
+        finished, self._finished = self._finished, []
+        await db.delete_active_games(finished)
+        await db.save_active_games(self.games)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_sync = loop.time() + self.sync_interval
+        while True:
+            started = loop.time()
+            try:
+                await self.tick()
+                if started >= next_sync:
+                    next_sync = started + self.sync_interval
+                    await self.sync()
+            except Exception as e:
+                logger.error(f"Bot tick failed: {e}")
+            await asyncio.sleep(max(0.0, self.tick_interval - (loop.time() - started)))
+
+    async def start(self):
+        """Publish the bots' games and start the background loop"""
+        if self._task is not None or not self.count:
+            return
+        try:
+            await self.sync()
+        except Exception as e:
+            logger.error(f"Bot sync failed: {e}")
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Started {self.count} bots")
+
+    async def stop(self):
+        """Cancel the background loop and remove the bots' games"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        try:
+            await db.delete_active_games(self._finished + [game.id for game in self.games])
+        except Exception as e:
+            logger.error(f"Bot cleanup failed: {e}")
+        self._finished = []
@@ -0,0 +1,197 @@
+"""
+Bot players for server-hosted games (see app/bot_lobby.py).
+
+A bot steers its SnakeGame towards the food along a shortest path found by
+A* over the game's occupancy bitset. The path is cached and followed move
+by move until the food moves or a cell on it becomes occupied; the body
+only ever moves away from the path ahead of the head, so one search usually
+serves every move to the next food. A typical decision is a lookup and a
+bitset check.
+
+When no path exists, or once the snake fills half the board and greedy
+paths start to trap it, the bot follows a Hamiltonian cycle through every
+cell. Cycles, like neighbour tables, are computed once per grid size and
+mode and shared by every bot.
+"""
+import heapq
+import random
+from array import array
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from .game_engine import DIRECTIONS, SnakeGame
+
+# Searches for unreachable food are retried after this many moves
+RETRY_AFTER = 8
+# Share of the board the snake must fill before it follows the cycle
+CYCLE_SHARE = 0.5
+
+Neighbours = Tuple[Tuple[Tuple[str, int], ...], ...]
+
+
+@lru_cache(maxsize=None)
+def neighbour_table(grid_size: int, mode: str) -> Neighbours:
+    """(direction, cell) of each cell's neighbours; moves off a walled grid are left out"""
+    table = []
+    for cell in range(grid_size * grid_size):
+        y, x = divmod(cell, grid_size)
+        neighbours = []
+        for direction, (dx, dy) in DIRECTIONS.items():
+            nx, ny = x + dx, y + dy
+            if mode == "passthrough":
+                nx, ny = nx % grid_size, ny % grid_size
+            elif not (0 <= nx < grid_size and 0 <= ny < grid_size):
+                continue
+            neighbours.append((direction, ny * grid_size + nx))
+        table.append(tuple(neighbours))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def hamiltonian_cycle(grid_size: int, mode: str) -> Optional[array]:
+    """
+    Successor of each cell on a cycle through every cell, or None when the
+    grid has none (an odd walled grid).
+
+    Walled grids of even size: along row 0, then back and forth over
+    columns 1.. of the other rows, returning up column 0. With wrapping,
+    any size: row y runs rightwards from column -y, ending above where row
+    y + 1 starts, and the last row wraps to the first.
+    """
+    cells = grid_size * grid_size
+    order: List[Tuple[int, int]] = []
+    if mode == "passthrough":
+        for k in range(cells):
+            y = k // grid_size
+            order.append(((k - y) % grid_size, y))
+    elif grid_size % 2 == 0:
+        order.extend((x, 0) for x in range(grid_size))
+        for y in range(1, grid_size):
+            columns = range(grid_size - 1, 0, -1) if y % 2 else range(1, grid_size)
+            order.extend((x, y) for x in columns)
+        order.extend((0, y) for y in range(grid_size - 1, 0, -1))
+    else:
+        return None
+
+    successor = array("i", bytes(4 * cells))
+    for (x, y), (nx, ny) in zip(order, order[1:] + order[:1]):
+        successor[y * grid_size + x] = ny * grid_size + nx
+    return successor
+
+
+class BotPlayer:
+    """Plays one SnakeGame, deciding each move from a cached path to the food"""
+
+    def __init__(self, mode: str = "walls", grid_size: int = 20, rng: Optional[random.Random] = None):
+        self.game = SnakeGame(mode, grid_size, rng)
+        self.neighbours = neighbour_table(grid_size, mode)
+        self.cycle = hamiltonian_cycle(grid_size, mode)
+        self.games_played = 0
+        self._forget_path()
+
+    def _forget_path(self):
+        # Cells still to visit, next one last
+        self._path: List[int] = []
+        self._path_food: Optional[int] = None
+        self._retry_in = 0
+
+    def _cell(self, position) -> int:
+        return position[1] * self.game.grid_size + position[0]
+
+    def _heuristic(self, cell: int, goal: int) -> int:
+        size = self.game.grid_size
+        y, x = divmod(cell, size)
+        gy, gx = divmod(goal, size)
+        dx, dy = abs(x - gx), abs(y - gy)
+        if self.game.mode == "passthrough":
+            dx, dy = min(dx, size - dx), min(dy, size - dy)
+        return dx + dy
+
+    def find_path(self, start: int, goal: int) -> Optional[List[int]]:
+        """A* from start to goal through free cells; the path excludes start, next cell last"""
+        is_free = self.game.board.is_free_index
+        neighbours = self.neighbours
+        heuristic = self._heuristic
+        came_from = {start: -1}
+        cost = {start: 0}
+        # Ties go to the deepest node, which keeps searches on open boards narrow
+        frontier = [(heuristic(start, goal), 0, start)]
+        while frontier:
+            _, depth, cell = heapq.heappop(frontier)
+            if cell == goal:
+                path = []
+                while cell != start:
+                    path.append(cell)
+                    cell = came_from[cell]
+                return path
+            steps = -depth
+            if steps > cost[cell]:
+                continue
+            for _, nxt in neighbours[cell]:
+                if not is_free(nxt) or cost.get(nxt, steps + 2) <= steps + 1:
+                    continue
+                cost[nxt] = steps + 1
+                came_from[nxt] = cell
+                heapq.heappush(frontier, (steps + 1 + heuristic(nxt, goal), -(steps + 1), nxt))
+        return None
+
+    def _direction_to(self, head: int, cell: int) -> Optional[str]:
+        for direction, nxt in self.neighbours[head]:
+            if nxt == cell:
+                return direction
+        return None
+
+    def _fallback(self, head: int) -> str:
+        """Next cell on the cycle if free, else the free neighbour with most free neighbours"""
+        is_free = self.game.board.is_free_index
+        if self.cycle is not None and is_free(self.cycle[head]):
+            return self._direction_to(head, self.cycle[head])
+        best, best_exits = self.game.direction, -1
+        for direction, nxt in self.neighbours[head]:
+            if not is_free(nxt):
+                continue
+            exits = sum(1 for _, beyond in self.neighbours[nxt] if is_free(beyond))
+            if exits > best_exits:
+                best, best_exits = direction, exits
+        return best
+
+    def decide(self) -> str:
+        """Direction of the next move"""
+        game = self.game
+        head = self._cell(game.head)
+        if game.food is None:
+            return self._fallback(head)
+        if self.cycle is not None and len(game.snake) >= CYCLE_SHARE * game.board.width * game.board.height:
+            return self._fallback(head)
+
+        food = self._cell(game.food)
+        path = self._path
+        if food == self._path_food and path and game.board.is_free_index(path[-1]):
+            direction = self._direction_to(head, path[-1])
+            if direction is not None:
+                path.pop()
+                return direction
+        if food == self._path_food and not path and self._retry_in > 0:
+            # The food was unreachable a moment ago
+            self._retry_in -= 1
+            return self._fallback(head)
+
+        path = self._path = self.find_path(head, food) or []
+        self._path_food = food
+        if not path:
+            self._retry_in = RETRY_AFTER
+            return self._fallback(head)
+        return self._direction_to(head, path.pop())
+
+    def step(self) -> str:
+        """Decide and make one move, returning the game status"""
+        self.game.set_direction(self.decide())
+        status = self.game.step()
+        if status == "gameover":
+            self.games_played += 1
+        return status
+
+    def restart(self):
+        """Start a new game on the same board"""
+        self.game.reset()
+        self._forget_path()
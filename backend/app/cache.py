@@ -0,0 +1,361 @@
+"""
+In-process caches kept coherent across worker processes.
+
+Each worker holds its own LocalCache instances (leaderboard pages, users,
+token -> user id). A write invalidates the local entry and publishes the
+invalidation on a CacheBus so the other workers drop theirs too:
+
+- ``local``: single process, nothing to publish
+- ``ipc``: Unix datagram sockets in a directory shared by the workers of one
+  host (CACHE_BUS_DIR)
+- ``postgres``: LISTEN/NOTIFY on the application database, which also covers
+  workers on other hosts
+
+CACHE_BUS=auto picks postgres on PostgreSQL, ipc when WEB_CONCURRENCY > 1
+and local otherwise. Every entry also carries a TTL, which bounds staleness
+if an invalidation is ever lost.
+
+Cache misses of hot reads go through a SingleFlight, so a burst of
+identical requests arriving together runs one query rather than one each.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import tempfile
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+from . import config
+from .metrics import record_cache, coalesced_requests_total
+
+logger = logging.getLogger("snake-game.cache")
+
+CHANNEL = "snake_cache_invalidate"
+
+
+class LocalCache:
+    """TTL cache with a bounded number of entries"""
+
+    def __init__(self, name: str, ttl: float, max_entries: int = 10000):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Bumped on every invalidation so that a value read from the database
+        # before the invalidation is not stored after it
+        self.generation = 0
+        self._data: Dict[Hashable, tuple] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value for key, or None"""
+        if not config.CACHE_ENABLED:
+            return None
+        entry = self._data.get(key)
+        if entry is not None:
+            if entry[1] > time.monotonic():
+                record_cache(self.name, True)
+                return entry[0]
+            del self._data[key]
+        record_cache(self.name, False)
+        return None
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None):
+        """
+        Store a value. Pass the generation read before loading the value to
+        skip the store if the cache was invalidated in the meantime.
+        """
+        if not config.CACHE_ENABLED or value is None:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        if key not in self._data and len(self._data) >= self.max_entries:
+            # Dicts keep insertion order: drop the oldest entry
+            del self._data[next(iter(self._data))]
+        self._data[key] = (value, time.monotonic() + self.ttl)
+
+    def discard(self, key: Optional[Hashable] = None):
+        """Drop one key (or everything) from this process only"""
+        self.generation += 1
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one key (or everything) here and in every other worker"""
+        self.discard(key)
+        bus.publish(self.name, key)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_caches: Dict[str, LocalCache] = {}
+
+
+def register_cache(cache: LocalCache) -> LocalCache:
+    _caches[cache.name] = cache
+    return cache
+
+
+def clear_all_caches():
+    """Empty every cache in this process"""
+    for cache in _caches.values():
+        cache.discard()
+
+
+leaderboard_cache = register_cache(LocalCache("leaderboard", config.CACHE_LEADERBOARD_TTL, max_entries=64))
+user_cache = register_cache(LocalCache("users", config.CACHE_USER_TTL))
+token_cache = register_cache(LocalCache("tokens", config.CACHE_TOKEN_TTL))
+
+
+class SingleFlight:
+    """Shares one in-flight call among concurrent callers with the same key"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn(), or the call already running for key. Every caller gets
+        the same result or exception. A caller that is cancelled does not
+        cancel the shared call.
+        """
+        if not config.COALESCE_READS:
+            return await fn()
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            coalesced_requests_total.inc(self.name)
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Retrieved here so it is not reported as never retrieved when
+            # every caller was cancelled
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+
+leaderboard_flight = SingleFlight("leaderboard")
+active_games_flight = SingleFlight("active_games")
+
+
+class CacheBus:
+    """Single-process bus: invalidations stay local"""
+    kind = "local"
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def publish(self, cache: str, key: Optional[Hashable]):
+        pass
+
+    def _encode(self, cache: str, key: Optional[Hashable]) -> bytes:
+        return json.dumps({"origin": self.origin, "cache": cache, "key": key}).encode()
+
+    def deliver(self, payload: bytes):
+        """Apply an invalidation received from another worker"""
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed cache invalidation")
+            return
+        if message.get("origin") == self.origin:
+            return
+        cache = _caches.get(message.get("cache"))
+        if cache is not None:
+            cache.discard(message.get("key"))
+
+
+class IpcCacheBus(CacheBus):
+    """Fans invalidations out over Unix datagram sockets, one per worker"""
+    kind = "ipc"
+
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = directory
+        self.path = os.path.join(directory, f"{self.origin}.sock")
+        self._sock: Optional[socket.socket] = None
+
+    async def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.path)
+        self._sock.setblocking(False)
+        asyncio.get_running_loop().add_reader(self._sock.fileno(), self._on_readable)
+
+    async def stop(self):
+        if self._sock is None:
+            return
+        asyncio.get_running_loop().remove_reader(self._sock.fileno())
+        self._sock.close()
+        self._sock = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def _on_readable(self):
+        while True:
+            try:
+                payload = self._sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                return
+            self.deliver(payload)
+
+    def publish(self, cache: str, key: Optional[Hashable]):
+        if self._sock is None:
+            return
+        payload = self._encode(cache, key)
+        for name in os.listdir(self.directory):
+            peer = os.path.join(self.directory, name)
+            if not name.endswith(".sock") or peer == self.path:
+                continue
+            try:
+                self._sock.sendto(payload, peer)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Socket left behind by a worker that has exited
+                try:
+                    os.remove(peer)
+                except OSError:
+                    pass
+            except BlockingIOError:
+                logger.warning(f"Cache bus peer {name} is not draining; relying on TTL")
+
+
+class PostgresCacheBus(CacheBus):
+    """Publishes invalidations with NOTIFY and applies them from LISTEN"""
+    kind = "postgres"
+
+    def __init__(self, dsn: str):
+        super().__init__()
+        self.dsn = dsn
+        self._conn = None
+        self._lock = asyncio.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+        self._reconnect: Optional[asyncio.Task] = None
+
+    async def _connect(self):
+        import asyncpg
+        conn = await asyncpg.connect(self.dsn)
+        await conn.add_listener(CHANNEL, self._on_notify)
+        conn.add_termination_listener(self._on_terminated)
+        self._conn = conn
+
+    async def start(self):
+        try:
+            await self._connect()
+        except Exception as e:
+            logger.error(f"Cache bus could not connect: {e}")
+            self._schedule_reconnect()
+
+    async def stop(self):
+        if self._reconnect is not None:
+            self._reconnect.cancel()
+            self._reconnect = None
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
+
+    def _on_notify(self, connection, pid, channel, payload):
+        self.deliver(payload.encode())
+
+    def _on_terminated(self, connection):
+        if self._conn is not connection:
+            return
+        # Invalidations may have been missed while disconnected
+        logger.warning("Cache bus connection lost; clearing local caches")
+        self._conn = None
+        clear_all_caches()
+        self._schedule_reconnect()
+
+    def _schedule_reconnect(self):
+        if self._reconnect is None or self._reconnect.done():
+            self._reconnect = asyncio.create_task(self._reconnect_loop())
+
+    async def _reconnect_loop(self):
+        while self._conn is None:
+            await asyncio.sleep(1)
+            try:
+                await self._connect()
+                clear_all_caches()
+            except Exception as e:
+                logger.warning(f"Cache bus reconnect failed: {e}")
+
+    async def _notify(self, payload: str):
+        async with self._lock:
+            if self._conn is None:
+                return
+            try:
+                await self._conn.execute("SELECT pg_notify($1, $2)", CHANNEL, payload)
+            except Exception as e:
+                logger.warning(f"Cache invalidation not published: {e}")
+
+    def publish(self, cache: str, key: Optional[Hashable]):
+        task = asyncio.create_task(self._notify(self._encode(cache, key).decode()))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+bus: CacheBus = CacheBus()
+
+
+def create_bus(kind: str = None) -> CacheBus:
+    """Build the bus named by CACHE_BUS (resolving "auto")"""
+    from .db.session import DATABASE_URL
+
+    kind = kind or config.CACHE_BUS
+    is_postgres = DATABASE_URL.startswith("postgresql")
+    if kind == "auto":
+        if is_postgres:
+            kind = "postgres"
+        elif config.WEB_CONCURRENCY > 1:
+            kind = "ipc"
+        else:
+            kind = "local"
+
+    if kind == "postgres":
+        if not is_postgres:
+            raise ValueError("CACHE_BUS=postgres requires a PostgreSQL DATABASE_URL")
+        return PostgresCacheBus(DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1))
+    if kind == "ipc":
+        directory = config.CACHE_BUS_DIR or os.path.join(
+            tempfile.gettempdir(), f"snake-cache-bus-{os.getppid()}")
+        return IpcCacheBus(directory)
+    if kind == "local":
+        return CacheBus()
+    raise ValueError(f"Unknown CACHE_BUS: {kind}")
+
+
+async def start_bus(kind: str = None) -> CacheBus:
+    """Create and start the process-wide bus"""
+    global bus
+    bus = create_bus(kind)
+    await bus.start()
+    logger.info(f"Cache invalidation bus: {bus.kind}")
+    return bus
+
+
+async def stop_bus():
+    global bus
+    await bus.stop()
+    bus = CacheBus()
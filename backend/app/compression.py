@@ -0,0 +1,208 @@
+"""
+Negotiated compression of API responses.
+
+CompressionMiddleware compresses complete response bodies of at least
+COMPRESSION_MIN_SIZE bytes with the best encoding the client accepts:
+zstd (``zstandard`` package) and br (``brotli`` package) when installed,
+otherwise gzip. It leaves alone:
+
+- streaming responses (more than one body message), e.g. data exports
+- responses that already have a Content-Encoding, e.g. pre-compressed
+  static files (see app/static_files.py)
+- content types that do not compress, HEAD requests, 204/206/304
+
+Bodies of at least COMPRESSION_THREAD_MIN_SIZE bytes are compressed in a
+worker thread so large leaderboards do not stall the event loop.
+
+Compressed bodies are cached by encoding and a hash of the uncompressed
+body. Responses served from the leaderboard and active games caches are
+byte-identical between invalidations, so each is compressed once per
+encoding and then served from here. Hashing is an order of magnitude
+cheaper than compressing, and content keys never go stale.
+"""
+import asyncio
+import gzip
+import hashlib
+from typing import Callable, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from . import config
+from .metrics import http_responses_compressed_total
+from .static_files import parse_accept_encoding
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+}
+SKIPPED_STATUSES = {204, 206, 304}
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=config.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _brotli(data: bytes) -> bytes:
+    return brotli.compress(data, quality=config.COMPRESSION_BROTLI_QUALITY)
+
+
+def _zstd(data: bytes) -> bytes:
+    # Compressors are not thread-safe, so one per call
+    return zstandard.ZstdCompressor(level=config.COMPRESSION_ZSTD_LEVEL).compress(data)
+
+
+def available_encodings() -> Dict[str, Callable[[bytes], bytes]]:
+    """Content-Encoding name -> compressor, in order of preference"""
+    encodings: Dict[str, Callable[[bytes], bytes]] = {}
+    if zstandard is not None:
+        encodings["zstd"] = _zstd
+    if brotli is not None:
+        encodings["br"] = _brotli
+    encodings["gzip"] = _gzip
+    return encodings
+
+
+ENCODINGS = available_encodings()
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Preferred encoding for an Accept-Encoding header, or None for identity"""
+    accepted = parse_accept_encoding(accept_encoding)
+    best, best_q = None, 0.0
+    for name in ENCODINGS:
+        q = accepted.get(name, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith("text/") or media_type.endswith("+json") or media_type in COMPRESSIBLE_TYPES
+
+
+class CompressedBodyCache:
+    """Compressed bodies keyed by (encoding, body hash), least recently used evicted first"""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, bytes], bytes] = {}
+
+    def _limit(self) -> int:
+        return config.COMPRESSION_CACHE_ENTRIES if self.max_entries is None else self.max_entries
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[bytes]:
+        body = self._entries.pop(key, None)
+        if body is not None:
+            self._entries[key] = body
+        return body
+
+    def set(self, key: Tuple[str, bytes], body: bytes):
+        limit = self._limit()
+        if limit <= 0:
+            return
+        self._entries.pop(key, None)
+        while len(self._entries) >= limit:
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = body
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+compressed_bodies = CompressedBodyCache()
+
+
+async def compress(encoding: str, body: bytes, cache: CompressedBodyCache = compressed_bodies) -> bytes:
+    """Compress body with encoding, reusing a cached result for identical bodies"""
+    key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+    compressed = cache.get(key)
+    if compressed is not None:
+        http_responses_compressed_total.inc(encoding, "hit")
+        return compressed
+    compressor = ENCODINGS[encoding]
+    if len(body) >= config.COMPRESSION_THREAD_MIN_SIZE:
+        compressed = await asyncio.to_thread(compressor, body)
+    else:
+        compressed = compressor(body)
+    cache.set(key, compressed)
+    http_responses_compressed_total.inc(encoding, "miss")
+    return compressed
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete response bodies"""
+
+    def __init__(self, app, cache: CompressedBodyCache = compressed_bodies):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not config.COMPRESSION_ENABLED or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            # First body message: decide for the whole response
+            passthrough = True
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or start["status"] < 200
+                or start["status"] in SKIPPED_STATUSES
+                or "content-encoding" in headers
+                or len(body) < config.COMPRESSION_MIN_SIZE
+                or not is_compressible(headers.get("content-type"))
+            ):
+                await send(start)
+                await send(message)
+                return
+
+            compressed = await compress(encoding, body, self.cache)
+            if len(compressed) < len(body):
+                body = compressed
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    # The compressed bytes differ from what a strong ETag names
+                    headers["ETag"] = f"W/{etag}"
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
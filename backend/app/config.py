@@ -0,0 +1,173 @@
+"""
+Runtime configuration read from environment variables.
+Values can also be placed in backend/.env (loaded via python-dotenv).
+"""
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _get_int(name: str, default: int) -> int:
+    """Read an integer environment variable, falling back to default"""
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return int(value)
+
+
+def _get_float(name: str, default: float) -> float:
+    """Read a float environment variable, falling back to default"""
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return float(value)
+
+
+def _get_bool(name: str, default: bool) -> bool:
+    """Read a boolean environment variable (1/true/yes/on), falling back to default"""
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Server (used by python -m app.serve)
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = _get_int("PORT", 3000)
+# Worker processes; each keeps its own in-process caches
+WEB_CONCURRENCY = _get_int("WEB_CONCURRENCY", 1)
+# Proxy addresses whose X-Forwarded-For/-Proto headers are trusted for the
+# client address ("*" trusts any, for a host reachable only through its proxy)
+FORWARDED_ALLOW_IPS = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+# Apply pending schema migrations at startup (disable to require running
+# `python -m app.migrate upgrade` before rollout)
+DB_MIGRATE_ON_STARTUP = _get_bool("DB_MIGRATE_ON_STARTUP", True)
+
+# Expose /api/debug/routes (development only)
+DEBUG_ROUTES = _get_bool("DEBUG_ROUTES", False)
+
+# In-process caches (see app/cache.py)
+CACHE_ENABLED = _get_bool("CACHE_ENABLED", True)
+CACHE_LEADERBOARD_TTL = _get_float("CACHE_LEADERBOARD_TTL", 5)
+CACHE_USER_TTL = _get_float("CACHE_USER_TTL", 60)
+CACHE_TOKEN_TTL = _get_float("CACHE_TOKEN_TTL", 300)
+# Concurrent identical reads (leaderboard, active games) share one query
+COALESCE_READS = _get_bool("COALESCE_READS", True)
+# Invalidation bus between workers: auto, local, ipc or postgres
+CACHE_BUS = os.getenv("CACHE_BUS", "auto")
+# Socket directory for the ipc bus (defaults to a per-server temp directory)
+CACHE_BUS_DIR = os.getenv("CACHE_BUS_DIR", "")
+
+# Logging
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# Fraction of successful requests that are logged (errors and slow requests always are)
+LOG_SAMPLE_RATE = _get_float("LOG_SAMPLE_RATE", 0.1)
+# Requests slower than this are always logged
+LOG_SLOW_REQUEST_MS = _get_float("LOG_SLOW_REQUEST_MS", 500)
+# Log every SQL statement (development only)
+SQL_ECHO = _get_bool("SQL_ECHO", False)
+
+# Metrics collection for /api/metrics
+METRICS_ENABLED = _get_bool("METRICS_ENABLED", True)
+
+# Opt-in request profiling (see app/profiling.py)
+PROFILING_ENABLED = _get_bool("PROFILING_ENABLED", False)
+# "sample" (collapsed stacks) or "cprofile" (pstats)
+PROFILING_MODE = os.getenv("PROFILING_MODE", "sample")
+# Fraction of requests profiled without the X-Profile header
+PROFILING_SAMPLE_RATE = _get_float("PROFILING_SAMPLE_RATE", 0.0)
+PROFILING_INTERVAL_MS = _get_float("PROFILING_INTERVAL_MS", 1.0)
+PROFILING_DIR = os.getenv("PROFILING_DIR", "./profiles")
+PROFILING_MAX_FILES = _get_int("PROFILING_MAX_FILES", 50)
+
+# Readiness probe: seconds before the database ping counts as unreachable
+READINESS_DB_TIMEOUT = _get_float("READINESS_DB_TIMEOUT", 2.0)
+
+# Admission control: shed low-priority requests while the server is overloaded
+ADMISSION_ENABLED = _get_bool("ADMISSION_ENABLED", True)
+# How often event loop lag and pool saturation are sampled
+ADMISSION_CHECK_INTERVAL_MS = _get_float("ADMISSION_CHECK_INTERVAL_MS", 100)
+ADMISSION_MAX_LOOP_LAG_MS = _get_float("ADMISSION_MAX_LOOP_LAG_MS", 200)
+ADMISSION_MAX_POOL_WAIT_MS = _get_float("ADMISSION_MAX_POOL_WAIT_MS", 500)
+# Retry-After (seconds) sent with shed responses
+ADMISSION_RETRY_AFTER = _get_int("ADMISSION_RETRY_AFTER", 2)
+
+# Authentication tokens
+# Lifetime of a token issued at login/register (seconds)
+TOKEN_TTL = _get_int("TOKEN_TTL", 30 * 24 * 3600)
+# Live tokens kept per user; logging in beyond this revokes the oldest
+TOKEN_MAX_PER_USER = _get_int("TOKEN_MAX_PER_USER", 10)
+# Seconds between sweeps of expired tokens, and rows deleted per statement
+TOKEN_SWEEP_INTERVAL = _get_int("TOKEN_SWEEP_INTERVAL", 3600)
+TOKEN_SWEEP_BATCH_SIZE = _get_int("TOKEN_SWEEP_BATCH_SIZE", 500)
+
+# Serialise response models straight to JSON bytes with pydantic-core
+# instead of FastAPI's validate + jsonable_encoder path (see app/responses.py)
+FAST_JSON_RESPONSES = _get_bool("FAST_JSON_RESPONSES", True)
+
+# Response compression (see app/compression.py)
+COMPRESSION_ENABLED = _get_bool("COMPRESSION_ENABLED", True)
+# Bodies smaller than this (bytes) are sent uncompressed
+COMPRESSION_MIN_SIZE = _get_int("COMPRESSION_MIN_SIZE", 1024)
+# Bodies at least this large (bytes) are compressed in a worker thread
+COMPRESSION_THREAD_MIN_SIZE = _get_int("COMPRESSION_THREAD_MIN_SIZE", 64 * 1024)
+# Compressed bodies kept per worker, reused for identical responses
+COMPRESSION_CACHE_ENTRIES = _get_int("COMPRESSION_CACHE_ENTRIES", 32)
+COMPRESSION_GZIP_LEVEL = _get_int("COMPRESSION_GZIP_LEVEL", 6)
+COMPRESSION_BROTLI_QUALITY = _get_int("COMPRESSION_BROTLI_QUALITY", 4)
+COMPRESSION_ZSTD_LEVEL = _get_int("COMPRESSION_ZSTD_LEVEL", 3)
+
+# Score percentiles (see app/score_distribution.py)
+# Days of per-day sketches kept for the "day" and "week" windows
+SCORE_SKETCH_DAYS = _get_int("SCORE_SKETCH_DAYS", 7)
+# Seconds between merging this worker's sketch updates into the database
+SCORE_SKETCH_FLUSH_INTERVAL = _get_float("SCORE_SKETCH_FLUSH_INTERVAL", 30)
+
+# Server-side bots in the live lobby (see app/bot_lobby.py)
+# Bots run by each worker (0 disables them)
+BOTS_COUNT = _get_int("BOTS_COUNT", 0)
+# Seconds between bot moves
+BOTS_TICK_INTERVAL = _get_float("BOTS_TICK_INTERVAL", 0.15)
+# Seconds between writing the bots' games to the active games table
+BOTS_SYNC_INTERVAL = _get_float("BOTS_SYNC_INTERVAL", 2)
+
+# Rate limiting of write endpoints per client IP (see app/ratelimit.py)
+RATE_LIMIT_ENABLED = _get_bool("RATE_LIMIT_ENABLED", True)
+# "memory" (per worker) or "database" (shared by all workers)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+# Login and registration
+RATE_LIMIT_AUTH_BURST = _get_int("RATE_LIMIT_AUTH_BURST", 10)
+RATE_LIMIT_AUTH_PER_MINUTE = _get_float("RATE_LIMIT_AUTH_PER_MINUTE", 10)
+# Score submission
+RATE_LIMIT_SCORES_BURST = _get_int("RATE_LIMIT_SCORES_BURST", 30)
+RATE_LIMIT_SCORES_PER_MINUTE = _get_float("RATE_LIMIT_SCORES_PER_MINUTE", 60)
+
+# Shared secret for /api/admin routes (admin routes are disabled when empty)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# Password hashing (scrypt cost parameters and worker pool sizing)
+PASSWORD_SCRYPT_LOG_N = _get_int("PASSWORD_SCRYPT_LOG_N", 14)
+PASSWORD_SCRYPT_R = _get_int("PASSWORD_SCRYPT_R", 8)
+PASSWORD_SCRYPT_P = _get_int("PASSWORD_SCRYPT_P", 1)
+# Threads running the KDF (0 runs it inline on the event loop)
+PASSWORD_HASH_WORKERS = _get_int("PASSWORD_HASH_WORKERS", min(4, os.cpu_count() or 1))
+# Maximum hashes in flight at once; further requests wait their turn
+PASSWORD_HASH_CONCURRENCY = _get_int("PASSWORD_HASH_CONCURRENCY", 2 * PASSWORD_HASH_WORKERS or 1)
+
+# Leaderboard partitioning / archival
+# Number of whole months kept in the hot leaderboard table (0 disables archival)
+LEADERBOARD_RETENTION_MONTHS = _get_int("LEADERBOARD_RETENTION_MONTHS", 0)
+# Directory where archived partitions are written as gzipped NDJSON
+LEADERBOARD_ARCHIVE_DIR = os.getenv("LEADERBOARD_ARCHIVE_DIR", "./archive")
+# Seconds between archiver runs
+LEADERBOARD_ARCHIVE_INTERVAL = _get_int("LEADERBOARD_ARCHIVE_INTERVAL", 3600)
+# Number of future monthly partitions to pre-create on PostgreSQL
+LEADERBOARD_PARTITIONS_AHEAD = _get_int("LEADERBOARD_PARTITIONS_AHEAD", 2)
+
+# Background maintenance (archiver, token sweeper) runs in one worker (see app/leader.py)
+# Lock file used without PostgreSQL (defaults to a file in the temp directory)
+MAINTENANCE_LOCK_FILE = os.getenv("MAINTENANCE_LOCK_FILE", "")
+# Seconds between attempts by the other workers to take over maintenance
+LEADER_RETRY_INTERVAL = _get_float("LEADER_RETRY_INTERVAL", 30)
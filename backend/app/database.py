@@ -1,14 +1,48 @@
+import json
 import uuid
-from datetime import datetime, UTC
-from typing import List, Optional
-from sqlalchemy import select, update, delete
+from datetime import datetime, timedelta, UTC
+from typing import Dict, List, Optional, AsyncIterator, Tuple
+from sqlalchemy import select, update, delete, text, and_, or_, case, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-import hashlib
 
-from .models import User, LeaderboardEntry, ActiveGame, GameScore
-from .db.models import UserModel, LeaderboardEntryModel, ActiveGameModel, TokenModel
+from . import config
+from .models import DEFAULT_GRID_SIZE, User, LeaderboardEntry, RankedLeaderboardEntry, AroundMeResponse, ActiveGame, GameScore
+from .db.models import UserModel, LeaderboardEntryModel, ActiveGameModel, TokenModel, RateLimitBucketModel, ScoreSketchModel
 from .db.session import AsyncSessionLocal
+from .passwords import password_hasher
+from .sketches import QuantileSketch
+from .metrics import instrument_db_methods
+from .cache import leaderboard_cache, user_cache, token_cache, leaderboard_flight, active_games_flight
 
+# Rows per multi-row active games upsert (6 bind parameters each) or ids per
+# delete, well under PostgreSQL's limit of 32,767 parameters per statement
+ACTIVE_GAMES_UPSERT_BATCH = 1000
+
+class DuplicateUserError(Exception):
+    """Raised when a username or email is already registered"""
+    
+    def __init__(self, field: str):
+        super().__init__(f"Duplicate {field}")
+        self.field = field
+
+def _duplicate_field(error: IntegrityError) -> Optional[str]:
+    """Work out which unique column a constraint violation refers to"""
+    message = str(error.orig)
+    # SQLite: "UNIQUE constraint failed: users.email"
+    # PostgreSQL: 'unique constraint "ix_users_email" ... Key (email)=(...)'
+    for field in ("email", "username"):
+        if f"users.{field}" in message or f"ix_users_{field}" in message or f"({field})=" in message:
+            return field
+    return None
+
+def _as_utc(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; they are stored in UTC"""
+    return value if value.tzinfo else value.replace(tzinfo=UTC)
+
+@instrument_db_methods
 class DatabaseManager:
     """Database manager using SQLAlchemy with async support"""
     
@@ -20,120 +54,183 @@ class DatabaseManager:
         """Get a new database session"""
         return AsyncSessionLocal()
     
+    # Health Methods
+    async def ping(self):
+        """Run a trivial query to check the database is reachable"""
+        async with AsyncSessionLocal() as session:
+            await session.execute(text("SELECT 1"))
+
+    # Token Methods
     @staticmethod
-    def _hash_password(password: str) -> str:
-        """Hash a password using SHA256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+    def _new_token(token: str, user_id: str) -> TokenModel:
+        """Token row expiring TOKEN_TTL from now"""
+        now = datetime.now(UTC)
+        return TokenModel(
+            token=token,
+            user_id=user_id,
+            created_at=now,
+            expires_at=now + timedelta(seconds=config.TOKEN_TTL),
+        )
     
-    # Token Methods
-    async def store_token(self, token: str, user_id: str):
-        """Store authentication token"""
-        async with AsyncSessionLocal() as session:
-            token_model = TokenModel(token=token, user_id=user_id)
-            session.add(token_model)
-            await session.commit()
+    @staticmethod
+    def _expired(now: datetime):
+        """Condition matching expired tokens (NULL expires_at: TOKEN_TTL after created_at)"""
+        return or_(
+            TokenModel.expires_at <= now,
+            and_(
+                TokenModel.expires_at.is_(None),
+                TokenModel.created_at <= now - timedelta(seconds=config.TOKEN_TTL),
+            ),
+        )
     
-    async def get_user_by_token(self, token: str) -> Optional[User]:
-        """Get user by authentication token"""
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(TokenModel).where(TokenModel.token == token)
-            )
-            token_model = result.scalar_one_or_none()
-            if token_model:
-                return await self.get_user_by_id(token_model.user_id)
-            return None
+    @staticmethod
+    def _live(now: datetime):
+        """Complement of _expired (negating it would drop NULL expires_at rows)"""
+        return or_(
+            TokenModel.expires_at > now,
+            and_(
+                TokenModel.expires_at.is_(None),
+                TokenModel.created_at > now - timedelta(seconds=config.TOKEN_TTL),
+            ),
+        )
     
-    # User Methods
-    async def get_user_by_email(self, email: str) -> Optional[User]:
-        """Get user by email"""
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(UserModel).where(UserModel.email == email)
-            )
-            user_model = result.scalar_one_or_none()
-            if user_model:
-                return User(
-                    id=user_model.id,
-                    username=user_model.username,
-                    email=user_model.email,
-                    highScore=user_model.high_score,
-                    gamesPlayed=user_model.games_played,
-                    createdAt=user_model.created_at
-                )
-            return None
+    async def _revoke_excess_tokens(self, session: AsyncSession, user_id: str):
+        """Delete a user's oldest tokens beyond TOKEN_MAX_PER_USER (caller commits)"""
+        result = await session.execute(
+            select(TokenModel.token)
+            .where(TokenModel.user_id == user_id)
+            .order_by(TokenModel.created_at.desc())
+            .offset(config.TOKEN_MAX_PER_USER)
+        )
+        excess = result.scalars().all()
+        if excess:
+            await session.execute(delete(TokenModel).where(TokenModel.token.in_(excess)))
+        return excess
     
-    async def get_user_by_id(self, user_id: str) -> Optional[User]:
-        """Get user by ID"""
+    async def revoke_token(self, token: str) -> bool:
+        """Delete a token (logout). Returns False if it did not exist"""
         async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(UserModel).where(UserModel.id == user_id)
-            )
-            user_model = result.scalar_one_or_none()
-            if user_model:
-                return User(
-                    id=user_model.id,
-                    username=user_model.username,
-                    email=user_model.email,
-                    highScore=user_model.high_score,
-                    gamesPlayed=user_model.games_played,
-                    createdAt=user_model.created_at
-                )
-            return None
+            result = await session.execute(delete(TokenModel).where(TokenModel.token == token))
+            await session.commit()
+        token_cache.invalidate(token)
+        return result.rowcount > 0
     
-    async def get_user_by_username(self, username: str) -> Optional[User]:
-        """Get user by username"""
+    async def delete_expired_tokens(self, batch_size: int, now: Optional[datetime] = None) -> int:
+        """
+        Delete up to batch_size expired tokens in one short transaction.
+        Returns the number deleted; the sweeper calls this until it is
+        below batch_size.
+        """
+        now = now or datetime.now(UTC)
         async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(UserModel).where(UserModel.username == username)
-            )
-            user_model = result.scalar_one_or_none()
-            if user_model:
-                return User(
-                    id=user_model.id,
-                    username=user_model.username,
-                    email=user_model.email,
-                    highScore=user_model.high_score,
-                    gamesPlayed=user_model.games_played,
-                    createdAt=user_model.created_at
+            expired = select(TokenModel.token).where(self._expired(now)).limit(batch_size)
+            result = await session.execute(delete(TokenModel).where(TokenModel.token.in_(expired)))
+            await session.commit()
+            return result.rowcount
+    
+    async def get_user_by_token(self, token: str) -> Optional[User]:
+        """Get user by authentication token, or None if it is unknown or expired"""
+        now = datetime.now(UTC)
+        cached = token_cache.get(token)
+        if cached is None:
+            generation = token_cache.generation
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(TokenModel.user_id, TokenModel.created_at, TokenModel.expires_at)
+                    .where(TokenModel.token == token, self._live(now))
                 )
+                row = result.one_or_none()
+            if row is None:
+                return None
+            expires_at = row.expires_at or row.created_at + timedelta(seconds=config.TOKEN_TTL)
+            cached = (row.user_id, _as_utc(expires_at))
+            token_cache.set(token, cached, generation)
+        user_id, expires_at = cached
+        if expires_at <= now:
             return None
+        return await self.get_user_by_id(user_id)
     
-    async def verify_password(self, email: str, password: str) -> bool:
-        """Verify user password"""
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(UserModel).where(UserModel.email == email)
-            )
-            user_model = result.scalar_one_or_none()
-            if user_model:
-                return user_model.password_hash == self._hash_password(password)
-            return False
+    # User Methods
+    @staticmethod
+    def _to_user(user_model: UserModel) -> User:
+        """Convert a user row into the API model"""
+        return User(
+            id=user_model.id,
+            username=user_model.username,
+            email=user_model.email,
+            highScore=user_model.high_score,
+            gamesPlayed=user_model.games_played,
+            createdAt=user_model.created_at
+        )
     
-    async def create_user(self, username: str, email: str, password: str) -> User:
-        """Create a new user"""
+    async def register_user(self, username: str, email: str, password: str, token: str) -> User:
+        """
+        Create a user and their first token in a single transaction.
+        Uniqueness is enforced by the unique indexes on username/email;
+        a violation raises DuplicateUserError naming the field.
+        """
+        password_hash = await password_hasher.hash(password)
         async with AsyncSessionLocal() as session:
             user_model = UserModel(
                 id=str(uuid.uuid4()),
                 username=username,
                 email=email,
-                password_hash=self._hash_password(password),
+                password_hash=password_hash,
                 high_score=0,
                 games_played=0,
                 created_at=datetime.now(UTC)
             )
             session.add(user_model)
-            await session.commit()
-            await session.refresh(user_model)
+            session.add(self._new_token(token, user_model.id))
+            try:
+                await session.commit()
+            except IntegrityError as e:
+                await session.rollback()
+                field = _duplicate_field(e)
+                if field is None:
+                    raise
+                raise DuplicateUserError(field) from e
+            return self._to_user(user_model)
+    
+    async def login_user(self, email: str, password: str, token: str) -> Optional[User]:
+        """
+        Verify credentials with a single user fetch and store the new token
+        in the same session. Returns None if the credentials are invalid.
+        """
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(UserModel).where(UserModel.email == email)
+            )
+            user_model = result.scalar_one_or_none()
+            if not user_model or not await password_hasher.verify(password, user_model.password_hash):
+                return None
             
-            return User(
-                id=user_model.id,
-                username=user_model.username,
-                email=user_model.email,
-                highScore=user_model.high_score,
-                gamesPlayed=user_model.games_played,
-                createdAt=user_model.created_at
+            if password_hasher.needs_rehash(user_model.password_hash):
+                user_model.password_hash = await password_hasher.hash(password)
+            session.add(self._new_token(token, user_model.id))
+            await session.flush()
+            revoked = await self._revoke_excess_tokens(session, user_model.id)
+            await session.commit()
+        for old_token in revoked:
+            token_cache.invalidate(old_token)
+        return self._to_user(user_model)
+    
+    async def get_user_by_id(self, user_id: str) -> Optional[User]:
+        """Get user by ID"""
+        user = user_cache.get(user_id)
+        if user is not None:
+            return user
+        generation = user_cache.generation
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(UserModel).where(UserModel.id == user_id)
             )
+            user_model = result.scalar_one_or_none()
+            if user_model:
+                user = self._to_user(user_model)
+                user_cache.set(user_id, user, generation)
+                return user
+            return None
     
     async def update_user(self, user_id: str, updates: dict) -> Optional[User]:
         """Update user information"""
@@ -153,31 +250,136 @@ class DatabaseManager:
                 update(UserModel).where(UserModel.id == user_id).values(**db_updates)
             )
             await session.commit()
+            user_cache.invalidate(user_id)
             
             return await self.get_user_by_id(user_id)
     
     # Leaderboard Methods
-    async def get_leaderboard(self, mode: str = None) -> List[LeaderboardEntry]:
-        """Get leaderboard entries, optionally filtered by mode"""
+    async def get_leaderboard(
+        self, mode: str = None, grid_size: int = DEFAULT_GRID_SIZE, offset: int = 0, limit: Optional[int] = None
+    ) -> List[LeaderboardEntry]:
+        """Get a page of the leaderboard of a grid size, optionally filtered by mode"""
+        cache_key = f"{mode or 'all'}:{grid_size}:{offset}:{limit or 'all'}"
+        cached = leaderboard_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        generation = leaderboard_cache.generation
+        # Requests arriving after an invalidation start a new query rather
+        # than joining one that may predate the write
+        return await leaderboard_flight.do(
+            (cache_key, generation),
+            lambda: self._load_leaderboard(mode, grid_size, offset, limit, cache_key, generation),
+        )
+    
+    async def _load_leaderboard(
+        self, mode: Optional[str], grid_size: int, offset: int, limit: Optional[int], cache_key: str, generation: int
+    ) -> List[LeaderboardEntry]:
         async with AsyncSessionLocal() as session:
-            query = select(LeaderboardEntryModel)
-            if mode:
-                query = query.where(LeaderboardEntryModel.mode == mode)
-            query = query.order_by(LeaderboardEntryModel.score.desc())
+            query = self._on_board(select(LeaderboardEntryModel), mode, grid_size)
+            # Pages are read through the (grid_size, [mode,] score) indexes, so
+            # a page after a score write costs `limit` rows, not the whole board
+            query = query.order_by(*self._leaderboard_order()).offset(offset).limit(limit)
             
             result = await session.execute(query)
             entries = result.scalars().all()
             
-            return [
+            leaderboard = [
                 LeaderboardEntry(
                     id=entry.id,
                     username=entry.username,
                     score=entry.score,
                     mode=entry.mode,
+                    gridSize=entry.grid_size,
                     date=entry.date
                 )
                 for entry in entries
             ]
+            leaderboard_cache.set(cache_key, leaderboard, generation)
+            return leaderboard
+    
+    @staticmethod
+    def _on_board(query, mode: Optional[str], grid_size: int):
+        """Restrict a leaderboard query to one grid size and optionally one mode"""
+        query = query.where(LeaderboardEntryModel.grid_size == grid_size)
+        return query.where(LeaderboardEntryModel.mode == mode) if mode else query
+    
+    @staticmethod
+    def _leaderboard_order():
+        """Board order: score descending, ties broken by id so ranks are stable"""
+        return LeaderboardEntryModel.score.desc(), LeaderboardEntryModel.id.asc()
+    
+    @staticmethod
+    def _ranked_above(score: int, entry_id: str):
+        """Entries placed before (score, entry_id) in board order"""
+        return or_(
+            LeaderboardEntryModel.score > score,
+            and_(LeaderboardEntryModel.score == score, LeaderboardEntryModel.id < entry_id),
+        )
+    
+    async def _rank(
+        self, session: AsyncSession, score: int, entry_id: str, grid_size: int, mode: Optional[str] = None
+    ) -> int:
+        """1-based rank of an entry, counted over the (grid_size, [mode,] score) indexes"""
+        query = select(func.count()).select_from(LeaderboardEntryModel).where(self._ranked_above(score, entry_id))
+        return (await session.execute(self._on_board(query, mode, grid_size))).scalar_one() + 1
+    
+    async def get_leaderboard_around_user(
+        self, username: str, mode: Optional[str] = None, radius: int = 5, grid_size: int = DEFAULT_GRID_SIZE
+    ) -> AroundMeResponse:
+        """
+        The user's best entry with up to radius entries on either side.
+        Neighbours are two keyset reads of radius rows from the user's
+        (score, id) position, so the cost does not depend on how far down
+        the board the user is, apart from the index-only rank count.
+        """
+        def in_mode(query):
+            return self._on_board(query, mode, grid_size)
+        
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                in_mode(select(LeaderboardEntryModel))
+                .where(LeaderboardEntryModel.username == username)
+                .order_by(*self._leaderboard_order())
+                .limit(1)
+            )
+            own = result.scalar_one_or_none()
+            if own is None:
+                return AroundMeResponse()
+            
+            rank = await self._rank(session, own.score, own.id, grid_size, mode)
+            above = (await session.execute(
+                in_mode(select(LeaderboardEntryModel))
+                .where(self._ranked_above(own.score, own.id))
+                .order_by(LeaderboardEntryModel.score.asc(), LeaderboardEntryModel.id.desc())
+                .limit(radius)
+            )).scalars().all()
+            below = (await session.execute(
+                in_mode(select(LeaderboardEntryModel))
+                .where(or_(
+                    LeaderboardEntryModel.score < own.score,
+                    and_(LeaderboardEntryModel.score == own.score, LeaderboardEntryModel.id > own.id),
+                ))
+                .order_by(*self._leaderboard_order())
+                .limit(radius)
+            )).scalars().all()
+        
+        window = list(reversed(above)) + [own] + list(below)
+        first_rank = rank - len(above)
+        return AroundMeResponse(
+            rank=rank,
+            entries=[
+                RankedLeaderboardEntry(
+                    rank=first_rank + offset,
+                    id=entry.id,
+                    username=entry.username,
+                    score=entry.score,
+                    mode=entry.mode,
+                    gridSize=entry.grid_size,
+                    date=entry.date
+                )
+                for offset, entry in enumerate(window)
+            ],
+        )
     
     async def submit_score(self, user_id: str, score_data: GameScore) -> int:
         """Submit a game score and return rank"""
@@ -199,29 +401,25 @@ class DatabaseManager:
                 username=user.username,
                 score=score_data.score,
                 mode=score_data.mode,
+                grid_size=score_data.gridSize,
                 date=datetime.now(UTC)
             )
             session.add(entry)
             await session.commit()
+            leaderboard_cache.invalidate()
             
-            # Calculate rank
-            result = await session.execute(
-                select(LeaderboardEntryModel).order_by(LeaderboardEntryModel.score.desc())
-            )
-            sorted_board = result.scalars().all()
-            
-            try:
-                rank = next(i for i, e in enumerate(sorted_board) if e.id == entry.id) + 1
-            except StopIteration:
-                rank = 0
-            
-            return rank
+            # Rank across all modes of the grid size, counted rather than loading the board
+            return await self._rank(session, entry.score, entry.id, entry.grid_size)
     
     # Game Methods
     async def get_active_games(self) -> List[ActiveGame]:
         """Get all active games"""
+        return await active_games_flight.do("all", self._load_active_games)
+    
+    async def _load_active_games(self) -> List[ActiveGame]:
         async with AsyncSessionLocal() as session:
-            result = await session.execute(select(ActiveGameModel))
+            # A stable order, so pages of the list do not overlap
+            result = await session.execute(select(ActiveGameModel).order_by(ActiveGameModel.id))
             games = result.scalars().all()
             
             return [
@@ -230,6 +428,7 @@ class DatabaseManager:
                     username=game.username,
                     score=game.score,
                     mode=game.mode,
+                    gridSize=game.grid_size,
                     startedAt=game.started_at
                 )
                 for game in games
@@ -249,9 +448,186 @@ class DatabaseManager:
                     username=game.username,
                     score=game.score,
                     mode=game.mode,
+                    gridSize=game.grid_size,
                     startedAt=game.started_at
                 )
             return None
 
+    async def save_active_games(self, games: List[ActiveGame], batch_size: int = ACTIVE_GAMES_UPSERT_BATCH):
+        """
+        Insert active games, updating the score of those already stored, in
+        one transaction of multi-row upserts of at most batch_size rows each
+        """
+        if not games:
+            return
+        table = ActiveGameModel.__table__
+        async with AsyncSessionLocal() as session:
+            insert = pg_insert if session.bind.dialect.name == "postgresql" else sqlite_insert
+            for start in range(0, len(games), batch_size):
+                statement = insert(table).values([
+                    {
+                        "id": game.id,
+                        "username": game.username,
+                        "score": game.score,
+                        "mode": game.mode,
+                        "grid_size": game.gridSize,
+                        "started_at": game.startedAt,
+                    }
+                    for game in games[start:start + batch_size]
+                ])
+                statement = statement.on_conflict_do_update(
+                    index_elements=[table.c.id], set_={"score": statement.excluded.score}
+                )
+                await session.execute(statement)
+            await session.commit()
+    
+    async def delete_active_games(self, game_ids: List[str], batch_size: int = ACTIVE_GAMES_UPSERT_BATCH) -> int:
+        """Delete the given active games, batch_size ids per statement; returns the number deleted"""
+        if not game_ids:
+            return 0
+        deleted = 0
+        async with AsyncSessionLocal() as session:
+            for start in range(0, len(game_ids), batch_size):
+                result = await session.execute(
+                    delete(ActiveGameModel).where(ActiveGameModel.id.in_(game_ids[start:start + batch_size]))
+                )
+                deleted += result.rowcount
+            await session.commit()
+        return deleted
+
+    # Rate Limit Methods
+    async def take_rate_limit_token(self, key: str, capacity: int, refill_rate: float, now: float) -> Tuple[bool, float]:
+        """
+        Take one token from the shared bucket for key, refilled at
+        refill_rate tokens/second up to capacity. A single UPSERT reads,
+        refills and updates the row, so concurrent workers cannot both take
+        the last token. Returns (allowed, tokens left).
+        """
+        table = RateLimitBucketModel.__table__
+        async with AsyncSessionLocal() as session:
+            insert = pg_insert if session.bind.dialect.name == "postgresql" else sqlite_insert
+            elapsed = now - table.c.updated_at
+            refilled = case(
+                (table.c.tokens + elapsed * refill_rate > capacity, float(capacity)),
+                else_=table.c.tokens + elapsed * refill_rate,
+            )
+            statement = (
+                insert(table)
+                .values(key=key, tokens=capacity - 1, updated_at=now, allowed=True)
+                .on_conflict_do_update(
+                    index_elements=[table.c.key],
+                    set_={
+                        "tokens": case((refilled >= 1, refilled - 1), else_=refilled),
+                        "updated_at": now,
+                        "allowed": refilled >= 1,
+                    },
+                )
+                .returning(table.c.allowed, table.c.tokens)
+            )
+            row = (await session.execute(statement)).one()
+            await session.commit()
+            return bool(row.allowed), row.tokens
+    
+    async def prune_rate_limit_buckets(self, before: float, batch_size: int = 1000) -> int:
+        """Delete up to batch_size buckets idle since before (they would be full again)"""
+        async with AsyncSessionLocal() as session:
+            idle = (
+                select(RateLimitBucketModel.key)
+                .where(RateLimitBucketModel.updated_at < before)
+                .limit(batch_size)
+            )
+            result = await session.execute(delete(RateLimitBucketModel).where(RateLimitBucketModel.key.in_(idle)))
+            await session.commit()
+            return result.rowcount
+
+    # Score Distribution Methods
+    async def load_score_sketches(self) -> Dict[Tuple[str, int, str], QuantileSketch]:
+        """Every persisted sketch, keyed by (mode, grid_size, period)"""
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(
+                ScoreSketchModel.mode, ScoreSketchModel.grid_size, ScoreSketchModel.period, ScoreSketchModel.data
+            ))
+            return {
+                (row.mode, row.grid_size, row.period): QuantileSketch.from_dict(json.loads(row.data))
+                for row in result
+            }
+    
+    async def merge_score_sketches(self, deltas: Dict[Tuple[str, int, str], QuantileSketch]):
+        """
+        Add each worker-local delta to its persisted sketch in one
+        transaction. Rows are locked while merged on PostgreSQL, so
+        workers flushing at the same time do not lose each other's counts.
+        """
+        async with AsyncSessionLocal() as session:
+            for (mode, grid_size, period), delta in deltas.items():
+                result = await session.execute(
+                    select(ScoreSketchModel)
+                    .where(
+                        ScoreSketchModel.mode == mode,
+                        ScoreSketchModel.grid_size == grid_size,
+                        ScoreSketchModel.period == period,
+                    )
+                    .with_for_update()
+                )
+                row = result.scalar_one_or_none()
+                if row is None:
+                    session.add(ScoreSketchModel(
+                        mode=mode, grid_size=grid_size, period=period,
+                        data=json.dumps(delta.to_dict()), updated_at=datetime.now(UTC),
+                    ))
+                    continue
+                sketch = QuantileSketch.from_dict(json.loads(row.data))
+                sketch.merge(delta)
+                row.data = json.dumps(sketch.to_dict())
+                row.updated_at = datetime.now(UTC)
+            await session.commit()
+    
+    async def delete_score_sketches_before(self, period: str) -> int:
+        """Delete daily sketches older than period ("YYYY-MM-DD"); "all" is kept"""
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                delete(ScoreSketchModel).where(ScoreSketchModel.period != "all", ScoreSketchModel.period < period)
+            )
+            await session.commit()
+            return result.rowcount
+    
+    # Export Methods
+    async def stream_export_rows(self, table: str, chunk_size: int = 1000) -> AsyncIterator[List[dict]]:
+        """
+        Stream every row of an exportable table in chunks of chunk_size.
+        Uses a server-side cursor so memory use is bounded by the chunk size.
+        """
+        if table == "users":
+            query = select(
+                UserModel.id,
+                UserModel.username,
+                UserModel.email,
+                UserModel.high_score.label("highScore"),
+                UserModel.games_played.label("gamesPlayed"),
+                UserModel.created_at.label("createdAt"),
+            ).order_by(UserModel.created_at, UserModel.id)
+        elif table == "leaderboard":
+            query = select(
+                LeaderboardEntryModel.id,
+                LeaderboardEntryModel.username,
+                LeaderboardEntryModel.score,
+                LeaderboardEntryModel.mode,
+                LeaderboardEntryModel.grid_size.label("gridSize"),
+                LeaderboardEntryModel.date,
+            ).order_by(LeaderboardEntryModel.date, LeaderboardEntryModel.id)
+        else:
+            raise ValueError(f"Unknown export table: {table}")
+
+        # Plain column rows rather than ORM objects: nothing accumulates in
+        # the session's identity map while streaming
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(query.execution_options(yield_per=chunk_size))
+            async for rows in result.mappings().partitions(chunk_size):
+                chunk = [dict(row) for row in rows]
+                for row in chunk:
+                    if "mode" in row:
+                        row["mode"] = getattr(row["mode"], "value", row["mode"])
+                yield chunk
+
 # Create singleton instance
 db = DatabaseManager()
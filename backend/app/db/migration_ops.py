@@ -0,0 +1,138 @@
+"""
+Online schema change helpers for migration scripts (migrations/versions).
+
+- create_index_online / drop_index_online build and drop indexes without
+  blocking writes: CREATE INDEX CONCURRENTLY on PostgreSQL, including on
+  the partitioned leaderboard table, plain DDL elsewhere.
+- backfill_in_batches updates existing rows in small committed batches, so
+  no statement holds row locks on the whole table.
+
+Both run outside the migration's transaction (Alembic autocommit block), so
+everything the script did before them is committed first. Keep such
+migrations small and idempotent: a failed concurrent build is retried by
+running the migration again.
+"""
+from typing import Dict, List, Optional, Sequence
+
+from alembic import op
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+def _quote(bind: Connection, name: str) -> str:
+    return bind.dialect.identifier_preparer.quote(name)
+
+
+def _partitions(bind: Connection, table: str) -> Optional[List[str]]:
+    """Partition names of a partitioned PostgreSQL table, or None if it is not partitioned"""
+    relkind = bind.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+    ).scalar()
+    if relkind != "p":
+        return None
+    return list(bind.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass(:table) ORDER BY c.relname"
+    ), {"table": table}).scalars())
+
+
+def _drop_if_invalid(bind: Connection, name: str):
+    """Remove the leftover of an interrupted CREATE INDEX CONCURRENTLY"""
+    valid = bind.execute(
+        text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": name}
+    ).scalar()
+    if valid is False:
+        bind.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {_quote(bind, name)}"))
+
+
+def _is_attached(bind: Connection, child: str, parent: str) -> bool:
+    return bind.execute(text(
+        "SELECT 1 FROM pg_inherits WHERE inhrelid = to_regclass(:child) AND inhparent = to_regclass(:parent)"
+    ), {"child": child, "parent": parent}).scalar() is not None
+
+
+def create_index_online(name: str, table: str, columns: Sequence[str], unique: bool = False):
+    """
+    Create an index without blocking writes to the table.
+
+    A partitioned PostgreSQL table cannot be indexed concurrently, so the
+    index is created ON ONLY the parent (initially invalid), built
+    concurrently on every partition and attached; the parent index becomes
+    valid once all partitions are attached, and partitions created later
+    inherit it.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        op.create_index(name, table, list(columns), unique=unique, if_not_exists=True)
+        return
+
+    unique_sql = "UNIQUE " if unique else ""
+    column_sql = ", ".join(_quote(bind, c) for c in columns)
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        partitions = _partitions(bind, table)
+        if partitions is None:
+            _drop_if_invalid(bind, name)
+            bind.execute(text(
+                f"CREATE {unique_sql}INDEX CONCURRENTLY IF NOT EXISTS {_quote(bind, name)} "
+                f"ON {_quote(bind, table)} ({column_sql})"
+            ))
+            return
+
+        bind.execute(text(
+            f"CREATE {unique_sql}INDEX IF NOT EXISTS {_quote(bind, name)} "
+            f"ON ONLY {_quote(bind, table)} ({column_sql})"
+        ))
+        for partition in partitions:
+            child = name.replace(table, partition, 1) if table in name else f"{partition}_{name}"
+            _drop_if_invalid(bind, child)
+            bind.execute(text(
+                f"CREATE {unique_sql}INDEX CONCURRENTLY IF NOT EXISTS {_quote(bind, child)} "
+                f"ON {_quote(bind, partition)} ({column_sql})"
+            ))
+            if not _is_attached(bind, child, name):
+                bind.execute(text(f"ALTER INDEX {_quote(bind, name)} ATTACH PARTITION {_quote(bind, child)}"))
+
+
+def drop_index_online(name: str, table: str):
+    """Drop an index without blocking writes where the database allows it"""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        op.drop_index(name, table_name=table, if_exists=True)
+        return
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        if _partitions(bind, table) is None:
+            bind.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {_quote(bind, name)}"))
+        else:
+            # Not supported concurrently on partitioned indexes; drops the
+            # per-partition indexes with it
+            bind.execute(text(f"DROP INDEX IF EXISTS {_quote(bind, name)}"))
+
+
+def backfill_in_batches(
+    table: str,
+    set_sql: str,
+    where_sql: str,
+    key: str = "id",
+    batch_size: int = 1000,
+    params: Optional[Dict] = None,
+) -> int:
+    """
+    Run ``UPDATE table SET set_sql WHERE where_sql`` batch_size rows at a
+    time, committing after every batch. where_sql must stop matching a row
+    once it has been updated, otherwise the loop does not terminate.
+    Returns the number of rows updated.
+    """
+    total = 0
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        statement = text(
+            f"UPDATE {_quote(bind, table)} SET {set_sql} WHERE {_quote(bind, key)} IN ("
+            f"SELECT {_quote(bind, key)} FROM {_quote(bind, table)} WHERE {where_sql} LIMIT :batch_size)"
+        )
+        while True:
+            updated = bind.execute(statement, {**(params or {}), "batch_size": batch_size}).rowcount
+            total += updated
+            if updated < batch_size:
+                return total
@@ -1,6 +1,6 @@
 from datetime import datetime
-from typing import Literal
-from sqlalchemy import String, Integer, DateTime, Enum as SQLEnum
+from typing import Literal, Optional
+from sqlalchemy import String, Integer, Float, Boolean, DateTime, Text, Index, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column
 import enum
 
@@ -24,14 +24,26 @@ class UserModel(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
 
 class LeaderboardEntryModel(Base):
-    """Leaderboard entry model"""
+    """Leaderboard entry model
+
+    On PostgreSQL the table is range-partitioned by month on ``date``
+    (see app.db.partitions), so ``date`` is part of the primary key.
+    """
     __tablename__ = "leaderboard_entries"
+    __table_args__ = (
+        # Leaderboard reads: WHERE grid_size = ? [AND mode = ?] ORDER BY score DESC
+        Index("ix_leaderboard_entries_grid_size_mode_score", "grid_size", "mode", "score"),
+        Index("ix_leaderboard_entries_grid_size_score", "grid_size", "score"),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
     
     id: Mapped[str] = mapped_column(String, primary_key=True)
     username: Mapped[str] = mapped_column(String, nullable=False, index=True)
     score: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
     mode: Mapped[str] = mapped_column(SQLEnum(GameMode), nullable=False, index=True)
-    date: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False, index=True)
+    # Cells per side of the board the game was played on
+    grid_size: Mapped[int] = mapped_column(Integer, nullable=False, default=20, server_default="20")
+    date: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, primary_key=True, nullable=False, index=True)
 
 class ActiveGameModel(Base):
     """Active game session model"""
@@ -41,13 +53,41 @@ class ActiveGameModel(Base):
     username: Mapped[str] = mapped_column(String, nullable=False, index=True)
     score: Mapped[int] = mapped_column(Integer, nullable=False)
     mode: Mapped[str] = mapped_column(SQLEnum(GameMode), nullable=False)
+    grid_size: Mapped[int] = mapped_column(Integer, nullable=False, default=20, server_default="20")
     started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
 
 class TokenModel(Base):
     """Authentication token model"""
     __tablename__ = "tokens"
+    # A user's tokens, oldest first
+    __table_args__ = (Index("ix_tokens_user_id_created_at", "user_id", "created_at"),)
     
     token: Mapped[str] = mapped_column(String, primary_key=True, index=True)
     user_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    # NULL for tokens issued before expiry existed: they expire TOKEN_TTL after created_at
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+
+class RateLimitBucketModel(Base):
+    """Token bucket shared by all workers (RATE_LIMIT_BACKEND=database)"""
+    __tablename__ = "rate_limit_buckets"
+    
+    # "<rule>:<client>"
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    # Epoch seconds of the last request, used to refill tokens
+    updated_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+    # Outcome of the last request, returned by the same UPSERT that takes a token
+    allowed: Mapped[bool] = mapped_column(Boolean, nullable=False)
 
+class ScoreSketchModel(Base):
+    """Persisted score distribution sketch (see app/sketches.py) for one board and period"""
+    __tablename__ = "score_sketches"
+    
+    mode: Mapped[str] = mapped_column(String, primary_key=True)
+    grid_size: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # "all" or the UTC day ("YYYY-MM-DD") the scores were submitted on
+    period: Mapped[str] = mapped_column(String, primary_key=True)
+    # QuantileSketch.to_dict() as JSON
+    data: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
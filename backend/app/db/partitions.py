@@ -0,0 +1,322 @@
+"""
+Time-partitioned layout for the leaderboard history.
+
+PostgreSQL: ``leaderboard_entries`` is declared ``PARTITION BY RANGE (date)``
+with one partition per calendar month plus a DEFAULT partition. Old months
+are archived and then detached and dropped, which is O(1) and leaves the
+indexes of the remaining partitions untouched.
+
+SQLite has no native partitioning, so the hot table is rotated instead:
+it is renamed aside, a fresh table is created, and the rows that are still
+inside the retention window are copied back. The rotated table is then
+archived and dropped. Each append to an archive file is journaled with the
+file's previous size until the table is dropped, so a run interrupted in
+between truncates the appends away and archives the table again rather than
+duplicating its rows.
+
+Databases created before partitioning have a plain table until migration
+0007_partition_leaderboard converts it; partition maintenance skips such a
+table instead of failing.
+
+Archives are gzipped NDJSON files, one per month, written in fixed-size
+chunks so memory use does not depend on the partition size.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import datetime, UTC
+from typing import List, Optional, Set
+
+from sqlalchemy import select, insert, delete, table, column, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from .models import LeaderboardEntryModel
+
+TABLE_NAME = LeaderboardEntryModel.__tablename__
+DEFAULT_PARTITION = f"{TABLE_NAME}_default"
+ROTATED_PREFIX = f"{TABLE_NAME}_rotated_"
+JOURNAL_SUFFIX = ".journal"
+_PARTITION_RE = re.compile(rf"^{TABLE_NAME}_y(\d{{4}})m(\d{{2}})$")
+
+logger = logging.getLogger("snake-game.archiver")
+
+
+def month_start(dt: datetime) -> datetime:
+    """Return the first instant of the month containing dt (UTC)"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return dt.astimezone(UTC).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(dt: datetime, months: int) -> datetime:
+    """Shift a month-start datetime by a number of months"""
+    index = dt.year * 12 + (dt.month - 1) + months
+    return dt.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(start: datetime) -> str:
+    """Name of the monthly partition starting at start"""
+    return f"{TABLE_NAME}_y{start.year:04d}m{start.month:02d}"
+
+
+def archive_filename(start: datetime) -> str:
+    """Name of the archive file for the month starting at start"""
+    return f"{TABLE_NAME}_{start.year:04d}_{start.month:02d}.ndjson.gz"
+
+
+def _table_clause(name: str):
+    """Lightweight table clause with the leaderboard columns under another name"""
+    source = LeaderboardEntryModel.__table__
+    return table(name, *[column(c.name, c.type) for c in source.columns])
+
+
+# Partition maintenance (PostgreSQL)
+async def is_partitioned(conn: AsyncConnection, name: str = TABLE_NAME) -> bool:
+    """Whether a PostgreSQL table is declared PARTITION BY"""
+    relkind = await conn.execute(
+        text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"), {"name": name}
+    )
+    return relkind.scalar() == "p"
+
+
+async def ensure_partitions(conn: AsyncConnection, now: Optional[datetime] = None, ahead: int = 2):
+    """Create the DEFAULT partition and monthly partitions up to `ahead` months out"""
+    if conn.dialect.name != "postgresql":
+        return
+    if not await is_partitioned(conn):
+        logger.warning(f"{TABLE_NAME} is not partitioned; run the migrations to convert it")
+        return
+
+    await conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {TABLE_NAME} DEFAULT"
+    ))
+    start = month_start(now or datetime.now(UTC))
+    for offset in range(ahead + 1):
+        lower = add_months(start, offset)
+        upper = add_months(lower, 1)
+        await conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(lower)} PARTITION OF {TABLE_NAME} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        ))
+
+
+async def list_partitions(conn: AsyncConnection) -> List[datetime]:
+    """Return the start of every monthly partition currently attached"""
+    result = await conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :parent"
+    ), {"parent": TABLE_NAME})
+
+    starts = []
+    for (name,) in result:
+        match = _PARTITION_RE.match(name)
+        if match:
+            starts.append(datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=UTC))
+    return sorted(starts)
+
+
+# Archive writing
+class _MonthlyArchiveWriter:
+    """Writes rows into one gzipped NDJSON file per month"""
+
+    def __init__(self, archive_dir: str):
+        self.archive_dir = archive_dir
+        self.written: List[str] = []
+        # Table being archived; its appends are journaled (see _settle_journals)
+        self.source: Optional[str] = None
+        self._month: Optional[datetime] = None
+        self._file = None
+        self._path: Optional[str] = None
+
+    def _open(self, month: datetime):
+        self._close()
+        self._month = month
+        self._path = os.path.join(self.archive_dir, archive_filename(month))
+        self._file = gzip.open(self._path + ".tmp", "wt", encoding="utf-8")
+
+    def _close(self):
+        if self._file is None:
+            return
+        self._file.close()
+        tmp_path = self._path + ".tmp"
+        if self.source is not None:
+            self._journal(self._path, self.source)
+        if os.path.exists(self._path):
+            # Concatenated gzip members are a valid gzip stream
+            with open(self._path, "ab") as dst, open(tmp_path, "rb") as src:
+                dst.write(src.read())
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, self._path)
+        if self._path not in self.written:
+            self.written.append(self._path)
+        self._file = None
+        self._month = None
+
+    @staticmethod
+    def _journal(path: str, source: str):
+        """Record the size of path before source's first append to it"""
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        try:
+            with open(f"{path}.{source}{JOURNAL_SUFFIX}", "x") as f:
+                f.write(str(size))
+        except FileExistsError:
+            pass
+
+    def write_chunk(self, rows):
+        for row in rows:
+            month = month_start(row.date)
+            if month != self._month:
+                self._open(month)
+            self._file.write(json.dumps({
+                "id": row.id,
+                "username": row.username,
+                "score": row.score,
+                "mode": getattr(row.mode, "value", row.mode),
+                "grid_size": row.grid_size,
+                "date": row.date.isoformat(),
+            }) + "\n")
+
+    def close(self):
+        self._close()
+
+
+def _settle_journals(archive_dir: str, live_sources: Set[str]):
+    """
+    Truncate archive files back to their journaled size for sources that
+    still exist (their run stopped before dropping them), and forget the
+    journals of sources that were dropped.
+    """
+    for name in os.listdir(archive_dir):
+        if not name.endswith(JOURNAL_SUFFIX):
+            continue
+        journal = os.path.join(archive_dir, name)
+        archive_name, source = name[:-len(JOURNAL_SUFFIX)].rsplit(".", 1)
+        if source in live_sources:
+            path = os.path.join(archive_dir, archive_name)
+            with open(journal) as f:
+                size = int(f.read())
+            if size:
+                os.truncate(path, size)
+            elif os.path.exists(path):
+                os.remove(path)
+        os.remove(journal)
+
+
+async def _stream_to_archive(conn: AsyncConnection, query, writer: _MonthlyArchiveWriter, chunk_size: int):
+    """Stream query results into the writer, chunk by chunk"""
+    result = await conn.stream(query.execution_options(yield_per=chunk_size))
+    async for rows in result.partitions(chunk_size):
+        await asyncio.to_thread(writer.write_chunk, rows)
+
+
+# Archival
+async def archive_before(
+    engine: AsyncEngine,
+    cutoff: datetime,
+    archive_dir: str,
+    chunk_size: int = 1000,
+) -> List[str]:
+    """
+    Archive every leaderboard row dated before cutoff and remove it from
+    the hot table. cutoff should be a month boundary. Returns the paths of
+    the archive files written.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    writer = _MonthlyArchiveWriter(archive_dir)
+    try:
+        if engine.dialect.name == "postgresql":
+            await _archive_partitions(engine, cutoff, writer, chunk_size)
+        else:
+            await _rotate_table(engine, cutoff)
+            await _drain_rotated_tables(engine, writer, chunk_size)
+    finally:
+        await asyncio.to_thread(writer.close)
+    return writer.written
+
+
+async def _archive_partitions(engine: AsyncEngine, cutoff: datetime, writer: _MonthlyArchiveWriter, chunk_size: int):
+    """
+    Stream out and drop every monthly partition that ends on or before
+    cutoff, then archive and delete the DEFAULT partition's rows dated
+    before cutoff (rows outside every monthly partition land there).
+    """
+    async with engine.connect() as conn:
+        if not await is_partitioned(conn):
+            logger.warning(f"{TABLE_NAME} is not partitioned; skipping archival until it is converted")
+            return
+        starts = await list_partitions(conn)
+        has_default = (await conn.execute(
+            text("SELECT to_regclass(:name) IS NOT NULL"), {"name": DEFAULT_PARTITION}
+        )).scalar()
+
+    for start in starts:
+        if add_months(start, 1) > cutoff:
+            continue
+        name = partition_name(start)
+        async with engine.connect() as conn:
+            async with conn.begin():
+                await _stream_to_archive(conn, select(_table_clause(name)).order_by(text("date")), writer, chunk_size)
+        await asyncio.to_thread(writer.close)
+        async with engine.begin() as conn:
+            await conn.execute(text(f"ALTER TABLE {TABLE_NAME} DETACH PARTITION {name}"))
+            await conn.execute(text(f"DROP TABLE {name}"))
+
+    if not has_default:
+        return
+    default = _table_clause(DEFAULT_PARTITION)
+    stale = default.c.date < cutoff
+    async with engine.connect() as conn:
+        async with conn.begin():
+            await _stream_to_archive(conn, select(default).where(stale).order_by(default.c.date), writer, chunk_size)
+    await asyncio.to_thread(writer.close)
+    async with engine.begin() as conn:
+        await conn.execute(delete(default).where(stale))
+
+
+async def _rotate_table(engine: AsyncEngine, cutoff: datetime):
+    """Swap in a fresh hot table holding only rows dated on or after cutoff"""
+    hot = LeaderboardEntryModel.__table__
+    async with engine.begin() as conn:
+        stale = await conn.execute(select(hot.c.id).where(hot.c.date < cutoff).limit(1))
+        if stale.first() is None:
+            return
+
+        rotated = f"{ROTATED_PREFIX}{datetime.now(UTC):%Y%m%d%H%M%S%f}"
+        await conn.execute(text(f"ALTER TABLE {TABLE_NAME} RENAME TO {rotated}"))
+        # SQLite index names are global and follow the renamed table
+        for index in hot.indexes:
+            await conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+        await conn.run_sync(lambda sync_conn: hot.create(sync_conn))
+
+        old = _table_clause(rotated)
+        keep = select(*old.c).where(old.c.date >= cutoff)
+        await conn.execute(insert(hot).from_select([c.name for c in hot.columns], keep))
+        await conn.execute(old.delete().where(old.c.date >= cutoff))
+
+
+async def _drain_rotated_tables(engine: AsyncEngine, writer: _MonthlyArchiveWriter, chunk_size: int):
+    """Archive and drop rotated tables, including leftovers from interrupted runs"""
+    async with engine.connect() as conn:
+        result = await conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE :prefix ORDER BY name"
+        ), {"prefix": f"{ROTATED_PREFIX}%"})
+        names = [name for (name,) in result]
+
+    await asyncio.to_thread(_settle_journals, writer.archive_dir, set(names))
+
+    for name in names:
+        old = _table_clause(name)
+        writer.source = name
+        async with engine.connect() as conn:
+            await _stream_to_archive(conn, select(old).order_by(old.c.date), writer, chunk_size)
+        await asyncio.to_thread(writer.close)
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP TABLE {name}"))
+        await asyncio.to_thread(_settle_journals, writer.archive_dir, set())
+    writer.source = None
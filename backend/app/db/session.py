@@ -1,9 +1,12 @@
 import os
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, ProgrammingError
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from dotenv import load_dotenv
 
-from .base import Base
+from .. import config
+from ..config import SQL_ECHO
 
 # Load environment variables
 load_dotenv()
@@ -19,10 +22,14 @@ elif DATABASE_URL.startswith("postgresql://"):
     DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
 
 
+# Alembic revision the models correspond to; a test checks that it is the
+# newest script in migrations/versions
+SCHEMA_REVISION = "0007_partition_leaderboard"
+
 # Create async engine
 engine = create_async_engine(
     DATABASE_URL,
-    echo=True,  # Set to False in production
+    echo=SQL_ECHO,  # Enable with SQL_ECHO=1 for development
     future=True,
 )
 
@@ -50,9 +57,31 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
-async def init_db():
-    """Initialize database tables"""
-    async with engine.begin() as conn:
-        # Import all models here to ensure they're registered
-        from . import models  # noqa: F401
-        await conn.run_sync(Base.metadata.create_all)
+async def current_revision() -> Optional[str]:
+    """Alembic revision the database is at, or None before the first migration"""
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            return result.scalar_one_or_none()
+    except (OperationalError, ProgrammingError):
+        # alembic_version does not exist yet
+        return None
+
+async def init_db() -> bool:
+    """
+    Bring the database schema up to date. A boot against a current database
+    only reads alembic_version; pending migrations are applied when
+    DB_MIGRATE_ON_STARTUP is set. Returns True if migrations ran.
+    """
+    revision = await current_revision()
+    if revision == SCHEMA_REVISION:
+        return False
+    if not config.DB_MIGRATE_ON_STARTUP:
+        raise RuntimeError(
+            f"Database schema is at {revision or 'no revision'}, expected {SCHEMA_REVISION}; "
+            "run `python -m app.migrate upgrade`"
+        )
+    # Alembic is only imported when there is something to migrate
+    from ..migrate import upgrade
+    await upgrade(engine)
+    return True
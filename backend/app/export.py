@@ -0,0 +1,167 @@
+"""
+Streaming bulk export of users and leaderboard data.
+
+Rows are read in fixed-size chunks through a server-side cursor and
+encoded chunk by chunk, so memory use is constant regardless of table size.
+
+Run with: uv run python -m app.export leaderboard --format csv --output leaderboard.csv
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import sys
+from datetime import datetime
+from typing import AsyncIterator, Dict, List
+
+from .database import db
+
+EXPORT_TABLES = ("leaderboard", "users")
+EXPORT_FORMATS = ("ndjson", "csv", "parquet")
+DEFAULT_CHUNK_SIZE = 1000
+
+EXPORT_COLUMNS: Dict[str, List[str]] = {
+    "leaderboard": ["id", "username", "score", "mode", "gridSize", "date"],
+    "users": ["id", "username", "email", "highScore", "gamesPlayed", "createdAt"],
+}
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class ExportFormatUnavailable(Exception):
+    """Raised when an export format needs an optional dependency that is missing"""
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Unserializable value: {value!r}")
+
+
+async def _encode_ndjson(table: str, chunks: AsyncIterator[List[dict]]) -> AsyncIterator[bytes]:
+    async for rows in chunks:
+        yield "".join(json.dumps(row, default=_json_default) + "\n" for row in rows).encode()
+
+
+async def _encode_csv(table: str, chunks: AsyncIterator[List[dict]]) -> AsyncIterator[bytes]:
+    columns = EXPORT_COLUMNS[table]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+
+    async for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        for row in rows:
+            writer.writerow([
+                row[c].isoformat() if isinstance(row[c], datetime) else row[c]
+                for c in columns
+            ])
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands out whatever has been written so far"""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+async def _encode_parquet(table: str, chunks: AsyncIterator[List[dict]]) -> AsyncIterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    timestamp = pa.timestamp("us", tz="UTC")
+    schemas = {
+        "leaderboard": pa.schema([
+            ("id", pa.string()), ("username", pa.string()), ("score", pa.int64()),
+            ("mode", pa.string()), ("gridSize", pa.int64()), ("date", timestamp),
+        ]),
+        "users": pa.schema([
+            ("id", pa.string()), ("username", pa.string()), ("email", pa.string()),
+            ("highScore", pa.int64()), ("gamesPlayed", pa.int64()), ("createdAt", timestamp),
+        ]),
+    }
+    schema = schemas[table]
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    async for rows in chunks:
+        # One row group per chunk
+        writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+_ENCODERS = {
+    "ndjson": _encode_ndjson,
+    "csv": _encode_csv,
+    "parquet": _encode_parquet,
+}
+
+
+def check_format(fmt: str):
+    """Validate the export format, raising if its dependency is unavailable"""
+    if fmt not in _ENCODERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == "parquet":
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise ExportFormatUnavailable("Parquet export requires the 'pyarrow' package")
+
+
+def export_stream(table: str, fmt: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Return an async iterator of encoded chunks for the given table"""
+    if table not in EXPORT_TABLES:
+        raise ValueError(f"Unknown export table: {table}")
+    check_format(fmt)
+    return _ENCODERS[fmt](table, db.stream_export_rows(table, chunk_size))
+
+
+async def export_to_file(table: str, fmt: str, output, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """Write an export to a binary file object, returning the number of bytes written"""
+    written = 0
+    async for data in export_stream(table, fmt, chunk_size):
+        await asyncio.to_thread(output.write, data)
+        written += len(data)
+    return written
+
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export Snake Game World data")
+    parser.add_argument("table", choices=EXPORT_TABLES)
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("--output", "-o", help="Output file (defaults to stdout)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    if args.output:
+        with open(args.output, "wb") as output:
+            written = await export_to_file(args.table, args.format, output, args.chunk_size)
+        print(f"Exported {args.table} to {args.output} ({written} bytes)", file=sys.stderr)
+    else:
+        await export_to_file(args.table, args.format, sys.stdout.buffer, args.chunk_size)
+        sys.stdout.buffer.flush()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
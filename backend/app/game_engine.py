@@ -0,0 +1,176 @@
+"""
+Server-side snake game engine, following the rules of the frontend's
+useSnakeGame hook: a snake on a square grid moving one cell per step,
+10 points per food, and in "walls" mode hitting the edge ends the game,
+while in "passthrough" mode the snake wraps around.
+
+Occupancy is tracked by FreeCells, so collision checks and food placement
+are O(1) whatever the length of the snake, and a game on the largest
+(200x200) board takes about 320 KB.
+"""
+import random
+from array import array
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+Position = Tuple[int, int]
+
+GRID_SIZE = 20
+MIN_GRID_SIZE = 5
+FOOD_POINTS = 10
+
+
+def initial_snake(grid_size: int) -> List[Position]:
+    """Three segments facing right from the centre; (10, 10) on the classic board"""
+    centre = grid_size // 2
+    return [(centre, centre), (centre - 1, centre), (centre - 2, centre)]
+
+
+INITIAL_SNAKE = initial_snake(GRID_SIZE)
+
+DIRECTIONS = {
+    "UP": (0, -1),
+    "DOWN": (0, 1),
+    "LEFT": (-1, 0),
+    "RIGHT": (1, 0),
+}
+OPPOSITES = {"UP": "DOWN", "DOWN": "UP", "LEFT": "RIGHT", "RIGHT": "LEFT"}
+
+
+class FreeCells:
+    """
+    Index of the free cells of a width x height grid.
+
+    ``_cells[:size]`` holds the indices (y * width + x) of the free cells in
+    no particular order and ``_slots[index]`` the position of a cell in
+    ``_cells``. Occupying a cell swaps the last free cell into its slot;
+    releasing appends it. Occupancy itself is a bitset, one bit per cell,
+    which is what collision checks read and what ``occupancy()`` exports.
+    Every operation is O(1).
+    """
+
+    def __init__(self, width: int, height: Optional[int] = None):
+        self.width = width
+        self.height = width if height is None else height
+        cells = self.width * self.height
+        self._cells = array("i", range(cells))
+        self._slots = array("i", range(cells))
+        self._occupied = bytearray((cells + 7) // 8)
+        self.size = cells
+
+    def _index(self, position: Position) -> int:
+        return position[1] * self.width + position[0]
+
+    def _is_set(self, index: int) -> bool:
+        return bool(self._occupied[index >> 3] & (1 << (index & 7)))
+
+    def is_free(self, position: Position) -> bool:
+        return not self._is_set(self._index(position))
+
+    def is_free_index(self, index: int) -> bool:
+        """is_free for a cell index (y * width + x)"""
+        return not self._occupied[index >> 3] & (1 << (index & 7))
+
+    def occupy(self, position: Position):
+        index = self._index(position)
+        if self._is_set(index):
+            return
+        self._occupied[index >> 3] |= 1 << (index & 7)
+        slot = self._slots[index]
+        self.size -= 1
+        last = self._cells[self.size]
+        self._cells[slot] = last
+        self._slots[last] = slot
+
+    def release(self, position: Position):
+        index = self._index(position)
+        if not self._is_set(index):
+            return
+        self._occupied[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+        self._cells[self.size] = index
+        self._slots[index] = self.size
+        self.size += 1
+
+    def occupancy(self) -> bytes:
+        """Occupied cells as a bitset, bit (index & 7) of byte (index >> 3)"""
+        return bytes(self._occupied)
+
+    def random_free(self, rng: random.Random) -> Optional[Position]:
+        """Uniformly random free cell, or None when the grid is full"""
+        if not self.size:
+            return None
+        index = self._cells[rng.randrange(self.size)]
+        return index % self.width, index // self.width
+
+    def __len__(self) -> int:
+        return self.size
+
+
+class SnakeGame:
+    """One game, advanced a step at a time"""
+
+    def __init__(self, mode: str = "walls", grid_size: int = GRID_SIZE, rng: Optional[random.Random] = None):
+        if mode not in ("walls", "passthrough"):
+            raise ValueError(f"Unknown game mode: {mode}")
+        if grid_size < MIN_GRID_SIZE:
+            raise ValueError(f"grid_size must be at least {MIN_GRID_SIZE}")
+        self.mode = mode
+        self.grid_size = grid_size
+        self.rng = rng or random.Random()
+        self.reset()
+
+    def reset(self):
+        self.board = FreeCells(self.grid_size)
+        self.snake: Deque[Position] = deque(initial_snake(self.grid_size))
+        for segment in self.snake:
+            self.board.occupy(segment)
+        self.food = self.board.random_free(self.rng)
+        self.direction = "RIGHT"
+        self.score = 0
+        self.status = "playing"
+
+    @property
+    def head(self) -> Position:
+        return self.snake[0]
+
+    def set_direction(self, direction: str):
+        """Turn before the next step; reversing onto the snake is ignored"""
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown direction: {direction}")
+        if direction != OPPOSITES[self.direction]:
+            self.direction = direction
+
+    def next_head(self, direction: Optional[str] = None) -> Optional[Position]:
+        """Where the head moves in direction, or None if that is off the grid in walls mode"""
+        dx, dy = DIRECTIONS[direction or self.direction]
+        x, y = self.head[0] + dx, self.head[1] + dy
+        if self.mode == "passthrough":
+            return x % self.grid_size, y % self.grid_size
+        if 0 <= x < self.grid_size and 0 <= y < self.grid_size:
+            return x, y
+        return None
+
+    def is_free(self, position: Position) -> bool:
+        return self.board.is_free(position)
+
+    def step(self) -> str:
+        """Advance one move and return the game status"""
+        if self.status != "playing":
+            return self.status
+        new_head = self.next_head()
+        # As in the frontend, moving into the current tail cell is a collision
+        if new_head is None or not self.board.is_free(new_head):
+            self.status = "gameover"
+            return self.status
+
+        self.snake.appendleft(new_head)
+        self.board.occupy(new_head)
+        if new_head == self.food:
+            self.score += FOOD_POINTS
+            self.food = self.board.random_free(self.rng)
+            if self.food is None:
+                # The snake fills the grid
+                self.status = "gameover"
+        else:
+            self.board.release(self.snake.pop())
+        return self.status
@@ -0,0 +1,291 @@
+"""
+Synthetic data generator for load and scaling tests.
+
+Creates users, leaderboard scores, tokens and active games at realistic
+volumes. Rows are written in batches with bulk Core inserts (COPY on
+PostgreSQL), and the output is fully determined by --seed and --anchor so
+benchmark datasets are reproducible. The generated scores are also merged
+into score_sketches, as submitted scores are, so percentiles cover them.
+
+Run with: uv run python -m app.generate_data --users 100000 --seed 42
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, UTC
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from . import config
+from .db.models import UserModel, LeaderboardEntryModel, ActiveGameModel, TokenModel, ScoreSketchModel, GameMode
+from .passwords import password_hasher
+from .score_distribution import ALL_TIME, RELATIVE_ACCURACY, day_period
+from .sketches import QuantileSketch
+
+DEFAULT_PASSWORD = "password123"
+
+# Lognormal parameters (mu, sigma) of the final score per mode. Walls games
+# end sooner, pass-through games run longer with a heavier tail.
+SCORE_DISTRIBUTIONS: Dict[str, Tuple[float, float]] = {
+    "walls": (math.log(60), 0.8),
+    "passthrough": (math.log(110), 0.9),
+}
+# Share of games played in each mode
+MODE_WEIGHTS = {"walls": 0.55, "passthrough": 0.45}
+# Share of games played on each grid size; most are on the classic board
+GRID_SIZE_WEIGHTS = {20: 0.7, 50: 0.15, 100: 0.1, 200: 0.05}
+# A 20x20 board holds at most 397 food items past the initial snake
+MAX_SCORE = 3970
+
+
+class SyntheticDataGenerator:
+    """Deterministic generator of table rows, produced in batches"""
+
+    def __init__(self, seed: int = 0, anchor: Optional[datetime] = None, history_days: int = 365):
+        self.rng = random.Random(seed)
+        self.anchor = anchor or datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+        self.history_days = history_days
+        # One shared hash: per-user KDF runs would dominate generation time
+        self.password_hash = password_hasher.hash_sync(DEFAULT_PASSWORD, salt=self.rng.randbytes(16))
+        self._modes = list(MODE_WEIGHTS)
+        self._mode_weights = list(MODE_WEIGHTS.values())
+        self._grid_sizes = list(GRID_SIZE_WEIGHTS)
+        self._grid_size_weights = list(GRID_SIZE_WEIGHTS.values())
+
+    def _uuid(self) -> str:
+        return str(uuid.UUID(int=self.rng.getrandbits(128), version=4))
+
+    def _past(self, max_days: float) -> datetime:
+        return self.anchor - timedelta(seconds=self.rng.uniform(0, max_days * 86400))
+
+    def score(self, mode: str) -> int:
+        """Draw a final score for a game in the given mode"""
+        mu, sigma = SCORE_DISTRIBUTIONS[mode]
+        return min(MAX_SCORE, int(self.rng.lognormvariate(mu, sigma)) // 10 * 10)
+
+    def mode(self) -> str:
+        return self.rng.choices(self._modes, self._mode_weights)[0]
+
+    def grid_size(self) -> int:
+        return self.rng.choices(self._grid_sizes, self._grid_size_weights)[0]
+
+    def users(
+        self,
+        count: int,
+        scores_per_user: float,
+        tokens_per_user: int,
+        batch_size: int,
+    ) -> Iterator[Dict[str, List[dict]]]:
+        """Yield batches of users together with their scores and tokens"""
+        for start in range(0, count, batch_size):
+            batch = {"users": [], "leaderboard": [], "tokens": []}
+            for i in range(start, min(start + batch_size, count)):
+                user_id = self._uuid()
+                username = f"player{i:07d}"
+                created_at = self._past(self.history_days)
+                account_age = (self.anchor - created_at).total_seconds() / 86400
+
+                # Games per player are heavily skewed: most play a few, some play a lot
+                games = int(self.rng.expovariate(1 / scores_per_user)) if scores_per_user > 0 else 0
+                high_score = 0
+                for _ in range(games):
+                    mode = self.mode()
+                    score = self.score(mode)
+                    high_score = max(high_score, score)
+                    batch["leaderboard"].append({
+                        "id": self._uuid(),
+                        "username": username,
+                        "score": score,
+                        "mode": mode,
+                        "grid_size": self.grid_size(),
+                        "date": self._past(account_age),
+                    })
+
+                for _ in range(tokens_per_user):
+                    issued_at = self._past(min(account_age, 30))
+                    batch["tokens"].append({
+                        "token": self._uuid(),
+                        "user_id": user_id,
+                        "created_at": issued_at,
+                        "expires_at": issued_at + timedelta(seconds=config.TOKEN_TTL),
+                    })
+
+                batch["users"].append({
+                    "id": user_id,
+                    "username": username,
+                    "email": f"{username}@example.com",
+                    "password_hash": self.password_hash,
+                    "high_score": high_score,
+                    "games_played": games,
+                    "created_at": created_at,
+                })
+            yield batch
+
+    def active_games(self, count: int, user_count: int, batch_size: int) -> Iterator[List[dict]]:
+        """Yield batches of in-progress games"""
+        for start in range(0, count, batch_size):
+            batch = []
+            for i in range(start, min(start + batch_size, count)):
+                mode = self.mode()
+                player = self.rng.randrange(user_count) if user_count else i
+                batch.append({
+                    "id": f"game-{i:07d}",
+                    "username": f"player{player:07d}",
+                    "score": self.score(mode) // 2 // 10 * 10,
+                    "mode": mode,
+                    "grid_size": self.grid_size(),
+                    "started_at": self.anchor - timedelta(seconds=self.rng.uniform(0, 1800)),
+                })
+            yield batch
+
+
+TABLES = {
+    "users": UserModel.__table__,
+    "leaderboard": LeaderboardEntryModel.__table__,
+    "tokens": TokenModel.__table__,
+    "active_games": ActiveGameModel.__table__,
+}
+
+
+def copy_records(rows: List[dict]) -> Tuple[List[str], List[tuple]]:
+    """
+    Columns and records for COPY. Only the generated columns are listed, so
+    the others get their server defaults; modes are stored by enum name.
+    """
+    columns = list(rows[0])
+    records = [
+        tuple(GameMode(row[c]).name if c == "mode" else row[c] for c in columns)
+        for row in rows
+    ]
+    return columns, records
+
+
+async def insert_rows(conn: AsyncConnection, name: str, rows: List[dict]):
+    """Bulk insert rows: COPY on PostgreSQL, executemany Core insert elsewhere"""
+    if not rows:
+        return
+    table = TABLES[name]
+    if conn.dialect.name == "postgresql":
+        columns, records = copy_records(rows)
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(table.name, records=records, columns=columns)
+    else:
+        await conn.execute(insert(table), rows)
+
+
+SketchKey = Tuple[str, int, str]
+
+
+def add_to_sketches(sketches: Dict[SketchKey, QuantileSketch], rows: List[dict], oldest_day: str):
+    """Add leaderboard rows to the all-time sketches and the daily ones since oldest_day"""
+    for row in rows:
+        keys = [(row["mode"], row["grid_size"], ALL_TIME)]
+        day = day_period(row["date"])
+        if day >= oldest_day:
+            keys.append((row["mode"], row["grid_size"], day))
+        for key in keys:
+            sketch = sketches.get(key)
+            if sketch is None:
+                sketch = sketches[key] = QuantileSketch(RELATIVE_ACCURACY)
+            sketch.add(row["score"])
+
+
+async def merge_sketches(conn: AsyncConnection, sketches: Dict[SketchKey, QuantileSketch]):
+    """Merge sketches into score_sketches, adding to rows already there"""
+    table = ScoreSketchModel.__table__
+    now = datetime.now(UTC)
+    for (mode, grid_size, period), sketch in sketches.items():
+        key = (table.c.mode == mode) & (table.c.grid_size == grid_size) & (table.c.period == period)
+        data = (await conn.execute(select(table.c.data).where(key))).scalar_one_or_none()
+        if data is None:
+            await conn.execute(insert(table).values(
+                mode=mode, grid_size=grid_size, period=period,
+                data=json.dumps(sketch.to_dict()), updated_at=now,
+            ))
+            continue
+        merged = QuantileSketch.from_dict(json.loads(data))
+        merged.merge(sketch)
+        await conn.execute(update(table).where(key).values(data=json.dumps(merged.to_dict()), updated_at=now))
+
+
+async def generate(
+    engine: AsyncEngine,
+    users: int,
+    scores_per_user: float = 20,
+    tokens_per_user: int = 1,
+    active_games: int = 0,
+    batch_size: int = 5000,
+    seed: int = 0,
+    anchor: Optional[datetime] = None,
+) -> Dict[str, int]:
+    """Generate and insert a dataset, returning row counts per table"""
+    generator = SyntheticDataGenerator(seed=seed, anchor=anchor)
+    counts = {name: 0 for name in TABLES}
+    sketches: Dict[SketchKey, QuantileSketch] = {}
+    # Older daily sketches would be dropped by the first flush anyway
+    oldest_day = day_period(generator.anchor - timedelta(days=config.SCORE_SKETCH_DAYS - 1))
+
+    for batch in generator.users(users, scores_per_user, tokens_per_user, batch_size):
+        # One transaction per user batch keeps each commit bounded
+        async with engine.begin() as conn:
+            for name, rows in batch.items():
+                for offset in range(0, len(rows), batch_size):
+                    await insert_rows(conn, name, rows[offset:offset + batch_size])
+                counts[name] += len(rows)
+        add_to_sketches(sketches, batch["leaderboard"], oldest_day)
+
+    async with engine.begin() as conn:
+        await merge_sketches(conn, sketches)
+    counts["score_sketches"] = len(sketches)
+
+    for rows in generator.active_games(active_games, users, batch_size):
+        async with engine.begin() as conn:
+            await insert_rows(conn, "active_games", rows)
+        counts["active_games"] += len(rows)
+
+    return counts
+
+
+async def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic Snake Game World data")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--scores-per-user", type=float, default=20, help="Mean games per user")
+    parser.add_argument("--tokens-per-user", type=int, default=1)
+    parser.add_argument("--active-games", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--anchor", type=datetime.fromisoformat,
+                        help="Reference 'now' for generated timestamps (ISO 8601); pin it for reproducible runs")
+    args = parser.parse_args(argv)
+
+    from .db.session import engine, init_db
+    await init_db()
+
+    started = time.perf_counter()
+    counts = await generate(
+        engine,
+        users=args.users,
+        scores_per_user=args.scores_per_user,
+        tokens_per_user=args.tokens_per_user,
+        active_games=args.active_games,
+        batch_size=args.batch_size,
+        seed=args.seed,
+        anchor=args.anchor,
+    )
+    elapsed = time.perf_counter() - started
+    await engine.dispose()
+
+    total = sum(counts.values())
+    for name, count in counts.items():
+        print(f"{name:>13}: {count:>10} rows")
+    print(f"{'total':>13}: {total:>10} rows in {elapsed:.2f}s ({total / elapsed:,.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,204 @@
+"""
+Readiness checks and admission control.
+
+A LoadMonitor task samples two overload signals every
+ADMISSION_CHECK_INTERVAL_MS:
+
+- event loop lag: how late a timer of the monitor fires
+- pool wait: how long the connection pool has been fully checked out, which
+  bounds how long a new query has to queue for a connection
+
+While either exceeds its threshold, AdmissionMiddleware answers low-priority
+requests (leaderboard polling, the active games list) with 503 and
+Retry-After, leaving capacity for score submission and authentication.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+
+from . import config
+from .database import db
+from .db import session as db_session_module
+from .metrics import http_requests_shed_total, event_loop_lag_seconds, db_pool_wait_seconds
+
+# (method, path) of requests that are shed first under load
+LOW_PRIORITY_ROUTES = {
+    ("GET", "/api/leaderboard"),
+    ("GET", "/api/games/active"),
+}
+
+
+def is_low_priority(method: str, path: str) -> bool:
+    return (method, path.rstrip("/")) in LOW_PRIORITY_ROUTES
+
+
+def pool_stats() -> dict:
+    """Current connection pool usage (only counts for sized pools)"""
+    pool = db_session_module.engine.pool
+    if not callable(getattr(pool, "size", None)):
+        return {"size": None, "checked_out": None, "capacity": None, "saturated": False}
+    size = pool.size()
+    checked_out = pool.checkedout()
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    # A negative max_overflow means the pool never blocks
+    capacity = size + max_overflow if max_overflow >= 0 else None
+    return {
+        "size": size,
+        "checked_out": checked_out,
+        "capacity": capacity,
+        "saturated": capacity is not None and checked_out >= capacity,
+    }
+
+
+class LoadMonitor:
+    """Samples event loop lag and pool wait in the background"""
+
+    def __init__(self, interval: float = config.ADMISSION_CHECK_INTERVAL_MS / 1000):
+        self.interval = interval
+        self.loop_lag_ms = 0.0
+        self.pool_wait_ms = 0.0
+        self._saturated_since: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def sample(self, lag_ms: float, saturated: bool, now: Optional[float] = None):
+        """Fold one observation into the current load signals"""
+        now = time.monotonic() if now is None else now
+        # Rise immediately, decay over a few samples so one quiet tick
+        # does not reopen the gate in the middle of a burst
+        self.loop_lag_ms = max(lag_ms, self.loop_lag_ms * 0.5)
+        if saturated:
+            if self._saturated_since is None:
+                self._saturated_since = now
+            self.pool_wait_ms = (now - self._saturated_since) * 1000
+        else:
+            self._saturated_since = None
+            self.pool_wait_ms = 0.0
+        event_loop_lag_seconds.set(value=self.loop_lag_ms / 1000)
+        db_pool_wait_seconds.set(value=self.pool_wait_ms / 1000)
+
+    def overloaded(self) -> Optional[str]:
+        """Name the signal over its threshold, or None"""
+        if self.loop_lag_ms > config.ADMISSION_MAX_LOOP_LAG_MS:
+            return "loop_lag"
+        if self.pool_wait_ms > config.ADMISSION_MAX_POOL_WAIT_MS:
+            return "pool_wait"
+        return None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (loop.time() - start - self.interval) * 1000)
+            try:
+                saturated = pool_stats()["saturated"]
+            except Exception:
+                saturated = False
+            self.sample(lag_ms, saturated)
+
+    def start(self):
+        """Start the background loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the background loop and wait for it to finish"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+load_monitor = LoadMonitor()
+
+
+class ReadinessState:
+    """Startup outcome and recent database probe latencies"""
+
+    def __init__(self, window: int = 20):
+        self.init_error: Optional[str] = None
+        self.db_latencies_ms: Deque[float] = deque(maxlen=window)
+
+    def latency_summary(self) -> Optional[dict]:
+        if not self.db_latencies_ms:
+            return None
+        ordered = sorted(self.db_latencies_ms)
+        return {
+            "samples": len(ordered),
+            "p50": ordered[len(ordered) // 2],
+            "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+            "max": ordered[-1],
+        }
+
+
+readiness = ReadinessState()
+
+
+async def check_readiness() -> Tuple[bool, dict]:
+    """Run the readiness checks, returning (ready, per-check details)"""
+    from .db.session import SCHEMA_REVISION, current_revision
+
+    # After a failed startup, only check whether the schema has since been
+    # brought up to date (by `app.migrate upgrade` or another worker).
+    # Migrations are never run here: the probe timeout would cancel them
+    # mid-DDL, and every worker's probe would start them again.
+    if readiness.init_error is not None:
+        try:
+            revision = await asyncio.wait_for(current_revision(), timeout=config.READINESS_DB_TIMEOUT)
+            if revision == SCHEMA_REVISION:
+                readiness.init_error = None
+        except Exception:
+            pass
+    schema = {"status": "ok"} if readiness.init_error is None else {"status": "failed", "error": readiness.init_error}
+
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(db.ping(), timeout=config.READINESS_DB_TIMEOUT)
+        latency_ms = round((time.perf_counter() - start) * 1000, 3)
+        readiness.db_latencies_ms.append(latency_ms)
+        database = {"status": "ok", "latency_ms": latency_ms}
+    except Exception as e:
+        database = {"status": "unreachable", "error": str(e) or type(e).__name__}
+    database["recent_latency_ms"] = readiness.latency_summary()
+
+    pool = pool_stats()
+    pool["wait_ms"] = round(load_monitor.pool_wait_ms, 3)
+    pool["status"] = "saturated" if load_monitor.pool_wait_ms > config.ADMISSION_MAX_POOL_WAIT_MS else "ok"
+
+    event_loop = {"lag_ms": round(load_monitor.loop_lag_ms, 3)}
+    event_loop["status"] = "lagging" if load_monitor.loop_lag_ms > config.ADMISSION_MAX_LOOP_LAG_MS else "ok"
+
+    checks = {"schema": schema, "database": database, "pool": pool, "event_loop": event_loop}
+    # Event loop lag is reported but does not fail readiness: shedding
+    # handles it without taking the instance out of rotation
+    ready = all(checks[name]["status"] == "ok" for name in ("schema", "database", "pool"))
+    return ready, checks
+
+
+class AdmissionMiddleware:
+    """ASGI middleware shedding low-priority requests while overloaded"""
+
+    def __init__(self, app, monitor: LoadMonitor = load_monitor):
+        self.app = app
+        self.monitor = monitor
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and config.ADMISSION_ENABLED and is_low_priority(scope["method"], scope["path"]):
+            reason = self.monitor.overloaded()
+            if reason:
+                http_requests_shed_total.inc(scope["path"].rstrip("/"), reason)
+                response = JSONResponse(
+                    {"detail": "Server is busy, please retry"},
+                    status_code=503,
+                    headers={"Retry-After": str(config.ADMISSION_RETRY_AFTER)},
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
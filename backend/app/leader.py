@@ -0,0 +1,176 @@
+"""
+Leader election for background maintenance.
+
+Every worker process runs the app's lifespan, but the leaderboard archiver
+and the token sweeper must run once per deployment: concurrent archivers
+write the same temporary archive files and race to detach and drop the same
+partitions. The worker holding the maintenance lock runs them; the others
+retry every LEADER_RETRY_INTERVAL seconds and take over if the leader exits.
+
+The lock is a PostgreSQL advisory lock on PostgreSQL, held by a dedicated
+connection (so it also covers workers on other hosts), and an flock on
+MAINTENANCE_LOCK_FILE otherwise (the workers of one server).
+"""
+import asyncio
+import logging
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from . import config
+
+logger = logging.getLogger("snake-game.leader")
+
+# pg_advisory_lock key of the maintenance lock ("snakemnt")
+ADVISORY_LOCK_KEY = 0x736E616B656D6E74
+
+
+class LeaderLock(ABC):
+    """A lock held by at most one worker at a time"""
+
+    @abstractmethod
+    async def try_acquire(self) -> bool:
+        """Take the lock if it is free; returns whether it is now held"""
+
+    @abstractmethod
+    async def is_held(self) -> bool:
+        """Whether the lock taken earlier is still held"""
+
+    @abstractmethod
+    async def release(self):
+        """Release the lock if it is held"""
+
+
+class FileLeaderLock(LeaderLock):
+    """Exclusive flock on a file, released when the process exits"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    async def try_acquire(self) -> bool:
+        import fcntl
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    async def is_held(self) -> bool:
+        return self._fd is not None
+
+    async def release(self):
+        if self._fd is not None:
+            fd, self._fd = self._fd, None
+            os.close(fd)
+
+
+class PostgresLeaderLock(LeaderLock):
+    """Session advisory lock, released when its connection closes"""
+
+    def __init__(self, dsn: str, key: int = ADVISORY_LOCK_KEY):
+        self.dsn = dsn
+        self.key = key
+        self._conn = None
+
+    async def try_acquire(self) -> bool:
+        import asyncpg
+        conn = await asyncpg.connect(self.dsn)
+        try:
+            acquired = await conn.fetchval("SELECT pg_try_advisory_lock($1)", self.key)
+        except BaseException:
+            await conn.close()
+            raise
+        if not acquired:
+            await conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    async def is_held(self) -> bool:
+        if self._conn is None:
+            return False
+        try:
+            await self._conn.fetchval("SELECT 1")
+            return True
+        except Exception:
+            # The lock went with the connection; another worker may hold it now
+            await self.release()
+            return False
+
+    async def release(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            try:
+                await conn.close()
+            except Exception:
+                conn.terminate()
+
+
+def create_lock() -> LeaderLock:
+    """Advisory lock on PostgreSQL, lock file otherwise"""
+    from .db.session import DATABASE_URL
+
+    if DATABASE_URL.startswith("postgresql"):
+        return PostgresLeaderLock(DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1))
+    return FileLeaderLock(
+        config.MAINTENANCE_LOCK_FILE or os.path.join(tempfile.gettempdir(), "snake-game-maintenance.lock")
+    )
+
+
+class MaintenanceLeader:
+    """Runs services (objects with start() and async stop()) while holding the lock"""
+
+    def __init__(self, services: List, lock: Optional[LeaderLock] = None, interval: Optional[float] = None):
+        self.services = services
+        self.lock = lock or create_lock()
+        self.interval = config.LEADER_RETRY_INTERVAL if interval is None else interval
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self):
+        """Take the lock and start the services, or stop them if the lock was lost"""
+        if self.is_leader:
+            if not await self.lock.is_held():
+                logger.warning("Lost the maintenance lock; stopping maintenance tasks")
+                await self._stop_services()
+        elif await self.lock.try_acquire():
+            logger.info(f"Worker {os.getpid()} holds the maintenance lock")
+            self.is_leader = True
+            for service in self.services:
+                service.start()
+
+    async def _stop_services(self):
+        self.is_leader = False
+        for service in reversed(self.services):
+            await service.stop()
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Leader election failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start the background loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the loop, stop the services and release the lock"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.is_leader:
+            await self._stop_services()
+        await self.lock.release()
@@ -0,0 +1,97 @@
+"""
+Non-blocking structured logging.
+
+Log records are put on an in-memory queue by a QueueHandler and written as
+JSON lines by a QueueListener thread, so request handlers never block on
+stdout. Request logs are sampled: successful requests are logged at
+LOG_SAMPLE_RATE, errors and slow requests are always logged.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from datetime import datetime, UTC
+from typing import Optional
+
+from . import config
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def setup_logging(level: str = config.LOG_LEVEL):
+    """Route the root and uvicorn loggers through a queue to a JSON stdout writer"""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=False)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(level)
+
+    for name in ("uvicorn", "uvicorn.error"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+    # Requests are logged (with sampling) by the app's own middleware
+    logging.getLogger("uvicorn.access").disabled = True
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def should_log_request(
+    status_code: int,
+    duration_ms: float,
+    sample_rate: float = None,
+    slow_ms: float = None,
+) -> Optional[str]:
+    """
+    Decide whether a request is logged. Returns the reason ("error", "slow"
+    or "sampled") or None to skip it.
+    """
+    sample_rate = config.LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+    slow_ms = config.LOG_SLOW_REQUEST_MS if slow_ms is None else slow_ms
+    if status_code >= 400:
+        return "error"
+    if duration_ms >= slow_ms:
+        return "slow"
+    if sample_rate >= 1 or (sample_rate > 0 and random.random() < sample_rate):
+        return "sampled"
+    return None
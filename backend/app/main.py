@@ -1,18 +1,30 @@
 import os
+import time
 import logging
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
-from .routers import auth, leaderboard, games, users
-from .db.session import init_db
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-)
+from . import config
+from .routers import auth, leaderboard, games, users, admin, health
+from .db.session import init_db, engine
+from .archiver import LeaderboardArchiver
+from .token_sweeper import TokenSweeper
+from .leader import MaintenanceLeader
+from .score_distribution import score_distribution
+from .bot_lobby import BotLobby
+from .passwords import password_hasher
+from .cache import start_bus, stop_bus
+from .static_files import StaticManifest
+from .logging_config import setup_logging, should_log_request
+from .health import AdmissionMiddleware, load_monitor, readiness
+from .profiling import ProfilingMiddleware
+from .compression import CompressionMiddleware
+from .metrics import MetricsMiddleware, REGISTRY, CONTENT_TYPE as METRICS_CONTENT_TYPE
+
+# Configure logging: JSON lines written off the event loop
+setup_logging()
 logger = logging.getLogger("snake-game")
 
 @asynccontextmanager
@@ -20,14 +32,32 @@ async def lifespan(app: FastAPI):
     # Startup: Initialize database
     logger.info("Starting up application...")
     try:
-        await init_db()
-        logger.info("Database initialized successfully.")
+        if await init_db():
+            logger.info("Database schema created.")
+        else:
+            logger.info("Database schema is up to date.")
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
-        # We don't raise here to allow the app to start and serve a debug message
+        # We don't raise here to allow the app to start and serve a debug message;
+        # readiness reports the failure until the schema is current
+        readiness.init_error = str(e) or type(e).__name__
+    await start_bus()
+    load_monitor.start()
+    # Only the worker holding the maintenance lock archives and sweeps
+    maintenance = MaintenanceLeader([LeaderboardArchiver(engine), TokenSweeper()])
+    maintenance.start()
+    await score_distribution.start()
+    bot_lobby = BotLobby()
+    await bot_lobby.start()
     yield
     # Shutdown: cleanup if needed
     logger.info("Shutting down application...")
+    await bot_lobby.stop()
+    await score_distribution.stop()
+    await maintenance.stop()
+    await load_monitor.stop()
+    await stop_bus()
+    password_hasher.shutdown()
 
 app = FastAPI(
     title="Snake Game World API",
@@ -36,7 +66,54 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# Configure CORS - be more permissive for production debugging
+# Compress large JSON bodies for clients that accept it
+app.add_middleware(CompressionMiddleware)
+
+# Middleware for request logging (sampled; errors and slow requests always logged)
+@app.middleware("http")
+async def log_requests(request: Request, call_next):
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception:
+        logger.exception("request failed", extra={
+            "method": request.method,
+            "path": request.url.path,
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+        })
+        raise
+
+    duration_ms = (time.perf_counter() - start) * 1000
+    reason = should_log_request(response.status_code, duration_ms)
+    if reason:
+        route = request.scope.get("route")
+        if response.status_code >= 500:
+            level = logging.ERROR
+        elif reason == "slow":
+            level = logging.WARNING
+        else:
+            level = logging.INFO
+        logger.log(level, "request", extra={
+            "method": request.method,
+            "path": request.url.path,
+            "route": getattr(route, "path", None),
+            "status": response.status_code,
+            "duration_ms": round(duration_ms, 2),
+            "reason": reason,
+        })
+    return response
+
+# Opt-in request profiling (no-op unless PROFILING_ENABLED)
+app.add_middleware(ProfilingMiddleware)
+
+# Shed leaderboard/active games polling with 503 while overloaded
+app.add_middleware(AdmissionMiddleware)
+
+# Per-route request counts and latency histograms
+app.add_middleware(MetricsMiddleware)
+
+# Configure CORS - be more permissive for production debugging. Added last so
+# it is the outermost middleware and shed 503s carry CORS headers too.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -45,32 +122,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Middleware for request logging
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    logger.info(f"Incoming request: {request.method} {request.url.path}")
-    response = await call_next(request)
-    logger.info(f"Response status: {response.status_code}")
-    return response
-
 # Include Routers with /api prefix
 app.include_router(auth.router, prefix="/api")
 app.include_router(leaderboard.router, prefix="/api")
 app.include_router(games.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
+app.include_router(health.router, prefix="/api")
 
 @app.get("/api")
 async def root():
     return {"message": "Welcome to Snake Game World API"}
 
-@app.get("/api/health")
-async def health_check():
-    return {"status": "healthy"}
+@app.get("/api/metrics")
+async def metrics():
+    return Response(REGISTRY.render(), media_type=METRICS_CONTENT_TYPE)
 
-# Debug routes endpoint
-@app.get("/api/debug/routes")
-async def list_routes():
-    return [{"path": route.path, "name": route.name, "methods": list(route.methods)} for route in app.routes]
+# Debug routes are opt-in and only imported when enabled
+if config.DEBUG_ROUTES:
+    from .routers import debug
+    app.include_router(debug.router, prefix="/api")
 
 # Mount static files
 static_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
@@ -79,21 +150,25 @@ logger.info(f"Static directory identified: {static_dir}")
 if os.path.exists(static_dir):
     logger.info("Static directory found. Serving frontend and SPA routing.")
     
+    # Index the build once; requests are answered from the in-memory manifest
+    static_manifest = StaticManifest(static_dir)
+    logger.info(f"Indexed {len(static_manifest.entries)} static files.")
+
     # Catch-all for SPA must be registered LAST
     # However, mounting static must happen BEFORE catch-all but AFTER API
     app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
     # Serve index.html for root
     @app.get("/")
-    async def serve_root():
-        index_path = os.path.join(static_dir, "index.html")
-        if os.path.exists(index_path):
-            return FileResponse(index_path)
+    async def serve_root(request: Request):
+        response = static_manifest.response("index.html", request.headers)
+        if response is not None:
+            return response
         return JSONResponse({"error": "index.html not found"}, status_code=404)
 
     # SPA catch-all
     @app.get("/{full_path:path}")
-    async def serve_spa(full_path: str):
+    async def serve_spa(full_path: str, request: Request):
         # Skip API paths
         if full_path.startswith("api"):
             logger.warning(f"API path {full_path} not found in routers, falling through to 404")
@@ -101,14 +176,14 @@ if os.path.exists(static_dir):
 
         # If it's a file request (has an extension), try to serve the file
         if "." in full_path.split("/")[-1]:
-            file_path = os.path.join(static_dir, full_path)
-            if os.path.exists(file_path):
-                return FileResponse(file_path)
+            response = static_manifest.response(full_path, request.headers)
+            if response is not None:
+                return response
         
         # Default to index.html for SPA routing
-        index_path = os.path.join(static_dir, "index.html")
-        if os.path.exists(index_path):
-            return FileResponse(index_path)
+        response = static_manifest.response("index.html", request.headers)
+        if response is not None:
+            return response
         
         return JSONResponse({"detail": "Not Found"}, status_code=404)
 else:
@@ -0,0 +1,314 @@
+"""
+In-process metrics exposed in the Prometheus text format at /api/metrics.
+
+Collected:
+- per-route request counts and latency histograms (MetricsMiddleware)
+- call counts, durations and SQL statement counts per DatabaseManager method
+- connection pool statistics, read at scrape time
+- cache hit/miss counters and hit ratios for in-process caches
+- event loop lag, pool wait and requests shed by admission control
+
+Metrics are plain dicts updated on the event loop thread, which keeps the
+per-request cost to a few dictionary operations.
+"""
+import contextvars
+import functools
+import inspect
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from . import config
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonic counter with labels"""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        self.values[label_values] = self.values.get(label_values, 0.0) + amount
+
+    def get(self, *label_values: str) -> float:
+        return self.values.get(label_values, 0.0)
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in self.values.items()
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down"""
+    kind = "gauge"
+
+    def set(self, *label_values: str, value: float):
+        self.values[label_values] = value
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets and labels"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self.values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, *label_values: str):
+        series = self.values.get(label_values)
+        if series is None:
+            series = self.values[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, *label_values: str) -> int:
+        series = self.values.get(label_values)
+        return series[2] if series else 0
+
+    def render(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in self.values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class Registry:
+    """Holds metrics and scrape-time collectors"""
+
+    def __init__(self):
+        self.metrics: List = []
+        self.collectors: List[Callable[[], None]] = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]):
+        """Register a callback that refreshes gauges right before rendering"""
+        self.collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self.collectors:
+            try:
+                collector()
+            except Exception:
+                pass
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# HTTP
+http_requests_total = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by route template and status", ("method", "route", "status")))
+http_request_duration_seconds = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route")))
+
+http_requests_shed_total = REGISTRY.register(Counter(
+    "http_requests_shed_total", "Low-priority requests rejected by admission control", ("route", "reason")))
+
+# Load
+event_loop_lag_seconds = REGISTRY.register(Gauge(
+    "event_loop_lag_seconds", "Recent event loop scheduling delay"))
+db_pool_wait_seconds = REGISTRY.register(Gauge(
+    "db_pool_wait_seconds", "Time the connection pool has been fully checked out"))
+
+# Database
+db_calls_total = REGISTRY.register(Counter(
+    "db_calls_total", "DatabaseManager method calls", ("method",)))
+db_call_duration_seconds = REGISTRY.register(Histogram(
+    "db_call_duration_seconds", "DatabaseManager method latency", ("method",)))
+db_statements_total = REGISTRY.register(Counter(
+    "db_statements_total", "SQL statements executed, by calling DatabaseManager method", ("method",)))
+db_statement_duration_seconds = REGISTRY.register(Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time", ("method",)))
+db_pool_connections = REGISTRY.register(Gauge(
+    "db_pool_connections", "Connection pool state", ("state",)))
+
+# Caches
+cache_requests_total = REGISTRY.register(Counter(
+    "cache_requests_total", "Cache lookups by result", ("cache", "result")))
+cache_hit_ratio = REGISTRY.register(Gauge(
+    "cache_hit_ratio", "Fraction of cache lookups that were hits", ("cache",)))
+coalesced_requests_total = REGISTRY.register(Counter(
+    "coalesced_requests_total", "Reads that shared an identical in-flight query", ("flight",)))
+
+# Rate limiting
+http_requests_rate_limited_total = REGISTRY.register(Counter(
+    "http_requests_rate_limited_total", "Requests rejected by the rate limiter", ("rule",)))
+
+# Response compression
+http_responses_compressed_total = REGISTRY.register(Counter(
+    "http_responses_compressed_total", "Responses compressed, by encoding and compressed-body cache result",
+    ("encoding", "cache")))
+
+
+# Database instrumentation
+_current_db_method: contextvars.ContextVar[str] = contextvars.ContextVar("current_db_method", default="other")
+
+
+def instrument_db_methods(cls):
+    """Wrap every public coroutine method of a class with call metrics"""
+    for name, fn in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(fn):
+            continue
+        setattr(cls, name, _instrument(name, fn))
+    return cls
+
+
+def _instrument(name: str, fn):
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        if not config.METRICS_ENABLED:
+            return await fn(*args, **kwargs)
+        token = _current_db_method.set(name)
+        start = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            db_calls_total.inc(name)
+            db_call_duration_seconds.observe(time.perf_counter() - start, name)
+            _current_db_method.reset(token)
+    return wrapper
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if not config.METRICS_ENABLED:
+        return
+    conn.info.setdefault("_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    method = _current_db_method.get()
+    db_statements_total.inc(method)
+    db_statement_duration_seconds.observe(elapsed, method)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute: drop its start
+    # time so the next statement is not timed from it
+    conn = context.connection
+    starts = conn.info.get("_query_start") if conn is not None else None
+    if starts:
+        starts.pop()
+
+
+def _collect_pool_stats():
+    from .db import session as db_session_module
+    pool = db_session_module.engine.pool
+    for state, attr in (("size", "size"), ("checked_in", "checkedin"), ("checked_out", "checkedout"), ("overflow", "overflow")):
+        getter = getattr(pool, attr, None)
+        if callable(getter):
+            db_pool_connections.set(state, value=getter())
+
+
+REGISTRY.add_collector(_collect_pool_stats)
+
+
+# Caches
+def record_cache(cache: str, hit: bool):
+    """Count a cache lookup"""
+    cache_requests_total.inc(cache, "hit" if hit else "miss")
+
+
+def _collect_cache_ratios():
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), value in cache_requests_total.values.items():
+        hits_total = totals.setdefault(cache, [0.0, 0.0])
+        hits_total[1] += value
+        if result == "hit":
+            hits_total[0] += value
+    for cache, (hits, total) in totals.items():
+        cache_hit_ratio.set(cache, value=hits / total if total else 0.0)
+
+
+REGISTRY.add_collector(_collect_cache_ratios)
+
+
+# HTTP middleware
+class MetricsMiddleware:
+    """ASGI middleware recording request counts and latency per route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not config.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = scope.get("route")
+            # Unmatched paths share one label to keep cardinality bounded
+            template = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_requests_total.inc(method, template, str(status_code))
+            http_request_duration_seconds.observe(elapsed, method, template)
@@ -0,0 +1,151 @@
+"""
+Schema migrations.
+
+Scripts live in backend/migrations/versions and are applied with Alembic
+over the application's async engine. Run them before rolling out a release
+(startup also applies pending ones unless DB_MIGRATE_ON_STARTUP=0):
+
+    uv run python -m app.migrate upgrade            # to the newest revision
+    uv run python -m app.migrate upgrade --sql      # print the SQL instead
+    uv run python -m app.migrate downgrade 0001_baseline
+    uv run python -m app.migrate current
+    uv run python -m app.migrate history
+    uv run python -m app.migrate revision -m "add column"
+
+Databases created with create_all before migrations existed are adopted
+automatically: they are stamped at the revision their schema matches and
+upgraded from there.
+"""
+import argparse
+import asyncio
+import logging
+import os
+from typing import Optional
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .db.base import Base
+from .db import models  # noqa: F401
+from .db.partitions import ensure_partitions
+
+logger = logging.getLogger("snake-game.migrate")
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALEMBIC_INI = os.path.join(BACKEND_DIR, "alembic.ini")
+# Schema created by create_all before migrations were introduced
+BASELINE_REVISION = "0001_baseline"
+
+
+def alembic_config(connection: Optional[Connection] = None) -> Config:
+    """Alembic config for the migration scripts, optionally bound to a connection"""
+    cfg = Config(ALEMBIC_INI)
+    cfg.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    if connection is not None:
+        cfg.attributes["connection"] = connection
+    return cfg
+
+
+def head_revision() -> str:
+    """Newest revision among the migration scripts"""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def _adopt(connection: Connection) -> Optional[str]:
+    """Stamp a pre-migrations database; returns the revision stamped, if any"""
+    context = MigrationContext.configure(connection)
+    if context.get_current_revision() is not None or not inspect(connection).has_table("users"):
+        return None
+    revision = "head" if not compare_metadata(context, Base.metadata) else BASELINE_REVISION
+    command.stamp(alembic_config(connection), revision)
+    return revision
+
+
+def _upgrade(connection: Connection, revision: str):
+    stamped = _adopt(connection)
+    if stamped:
+        logger.info(f"Adopted existing schema at {stamped}")
+    # Migrations manage their own transactions (autocommit blocks included)
+    connection.commit()
+    command.upgrade(alembic_config(connection), revision)
+    connection.commit()
+
+
+def _downgrade(connection: Connection, revision: str):
+    command.downgrade(alembic_config(connection), revision)
+    connection.commit()
+
+
+def _current(connection: Connection) -> Optional[str]:
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+async def upgrade(engine: AsyncEngine, revision: str = "head"):
+    """Apply migrations up to revision, then create upcoming partitions"""
+    async with engine.connect() as conn:
+        await conn.run_sync(_upgrade, revision)
+    async with engine.begin() as conn:
+        await ensure_partitions(conn)
+
+
+async def downgrade(engine: AsyncEngine, revision: str):
+    async with engine.connect() as conn:
+        await conn.run_sync(_downgrade, revision)
+
+
+async def current(engine: AsyncEngine) -> Optional[str]:
+    async with engine.connect() as conn:
+        return await conn.run_sync(_current)
+
+
+async def _run(args):
+    from .db.session import engine
+    try:
+        if args.command == "upgrade":
+            await upgrade(engine, args.revision)
+        elif args.command == "downgrade":
+            await downgrade(engine, args.revision)
+        elif args.command == "current":
+            print(await current(engine) or "(none)")
+    finally:
+        await engine.dispose()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Snake Game World schema migrations")
+    sub = parser.add_subparsers(dest="command", required=True)
+    up = sub.add_parser("upgrade", help="Apply migrations")
+    up.add_argument("revision", nargs="?", default="head")
+    up.add_argument("--sql", action="store_true", help="Print the SQL instead of running it")
+    down = sub.add_parser("downgrade", help="Revert migrations")
+    down.add_argument("revision")
+    down.add_argument("--sql", action="store_true", help="Print the SQL instead of running it")
+    sub.add_parser("current", help="Show the database's revision")
+    sub.add_parser("history", help="List migration scripts")
+    rev = sub.add_parser("revision", help="Create a migration script")
+    rev.add_argument("-m", "--message", required=True)
+    rev.add_argument("--autogenerate", action="store_true", help="Diff the models against the database")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
+
+    if args.command == "history":
+        command.history(alembic_config())
+    elif args.command == "revision":
+        command.revision(alembic_config(), message=args.message, autogenerate=args.autogenerate)
+    elif getattr(args, "sql", False):
+        # Offline mode: env.py renders SQL for the configured DATABASE_URL
+        getattr(command, args.command)(alembic_config(), args.revision, sql=True)
+    else:
+        asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -27,26 +27,57 @@ class AuthResponse(BaseModel):
     user: Optional[User] = None
     error: Optional[str] = None
 
+# Board sizes (cells per side); each has its own leaderboard. 200 is the arena.
+GRID_SIZES = (20, 50, 100, 200)
+DEFAULT_GRID_SIZE = 20
+GridSize = Literal[20, 50, 100, 200]
+
 class GameScore(BaseModel):
     score: int
     mode: Literal['passthrough', 'walls']
+    gridSize: GridSize = DEFAULT_GRID_SIZE
 
 class LeaderboardEntry(BaseModel):
     id: str
     username: str
     score: int
     mode: Literal['passthrough', 'walls']
+    gridSize: int = DEFAULT_GRID_SIZE
     date: datetime
 
+class RankedLeaderboardEntry(LeaderboardEntry):
+    rank: int
+
+class AroundMeResponse(BaseModel):
+    # None when the user has no score in the requested mode
+    rank: Optional[int] = None
+    entries: List[RankedLeaderboardEntry] = []
+
 class ScoreResponse(BaseModel):
     success: bool
     rank: Optional[int] = None
+    # Percentage of all games in the mode that scored lower (approximate)
+    percentile: Optional[float] = None
+
+class ScoreQuantile(BaseModel):
+    q: float
+    score: float
+
+class ScoreDistributionResponse(BaseModel):
+    mode: Literal['passthrough', 'walls']
+    gridSize: int
+    window: Literal['all', 'day', 'week']
+    count: int
+    quantiles: List[ScoreQuantile]
+    # Relative error of the quantile scores
+    relativeAccuracy: float
 
 class ActiveGame(BaseModel):
     id: str
     username: str
     score: int
     mode: Literal['passthrough', 'walls']
+    gridSize: int = DEFAULT_GRID_SIZE
     startedAt: datetime
 
 class UserUpdate(BaseModel):
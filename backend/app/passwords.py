@@ -0,0 +1,131 @@
+"""
+Password hashing service.
+
+Passwords are hashed with scrypt. The KDF runs in a bounded thread pool
+(hashlib releases the GIL while it works) behind a concurrency limit, so a
+burst of logins queues up instead of stalling the event loop.
+
+Stored format: ``scrypt$<log2 n>$<r>$<p>$<salt b64>$<hash b64>``. The cost
+parameters travel with each hash, so the cost can be raised later and old
+hashes still verify; needs_rehash() reports hashes to upgrade. Legacy
+unsalted SHA-256 hex digests are still accepted and always need a rehash.
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from . import config
+
+ALGORITHM = "scrypt"
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode().rstrip("=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def _is_legacy_sha256(stored: str) -> bool:
+    return len(stored) == 64 and all(c in "0123456789abcdef" for c in stored)
+
+
+def _scrypt(password: str, salt: bytes, log_n: int, r: int, p: int) -> bytes:
+    n = 1 << log_n
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * n * r * p, dklen=KEY_BYTES,
+    )
+
+
+class PasswordHasher:
+    """Hashes and verifies passwords off the event loop"""
+
+    def __init__(
+        self,
+        log_n: int = config.PASSWORD_SCRYPT_LOG_N,
+        r: int = config.PASSWORD_SCRYPT_R,
+        p: int = config.PASSWORD_SCRYPT_P,
+        workers: int = config.PASSWORD_HASH_WORKERS,
+        concurrency: int = config.PASSWORD_HASH_CONCURRENCY,
+    ):
+        self.log_n = log_n
+        self.r = r
+        self.p = p
+        self.workers = workers
+        self.concurrency = concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    # Synchronous core
+    def hash_sync(self, password: str, salt: Optional[bytes] = None) -> str:
+        """Hash a password on the current thread (salt is random unless given)"""
+        salt = salt or os.urandom(SALT_BYTES)
+        key = _scrypt(password, salt, self.log_n, self.r, self.p)
+        return f"{ALGORITHM}${self.log_n}${self.r}${self.p}${_b64encode(salt)}${_b64encode(key)}"
+
+    def verify_sync(self, password: str, stored: str) -> bool:
+        """Verify a password against a stored hash on the current thread"""
+        if _is_legacy_sha256(stored):
+            candidate = hashlib.sha256(password.encode()).hexdigest()
+            return hmac.compare_digest(candidate, stored)
+
+        try:
+            algorithm, log_n, r, p, salt, key = stored.split("$")
+            if algorithm != ALGORITHM:
+                return False
+            expected = _b64decode(key)
+            candidate = _scrypt(password, _b64decode(salt), int(log_n), int(r), int(p))
+        except ValueError:
+            return False
+        return hmac.compare_digest(candidate, expected)
+
+    def needs_rehash(self, stored: str) -> bool:
+        """True if the stored hash is legacy or uses different cost parameters"""
+        parts = stored.split("$")
+        if len(parts) != 6 or parts[0] != ALGORITHM:
+            return True
+        return parts[1:4] != [str(self.log_n), str(self.r), str(self.p)]
+
+    # Async API
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def _run(self, fn, *args):
+        # workers == 0 runs the KDF inline on the event loop
+        if self.workers <= 0:
+            return fn(*args)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+        async with self._get_semaphore():
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password in the worker pool"""
+        return await self._run(self.hash_sync, password)
+
+    async def verify(self, password: str, stored: str) -> bool:
+        """Verify a password in the worker pool"""
+        return await self._run(self.verify_sync, password, stored)
+
+    def shutdown(self):
+        """Stop the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# Create singleton instance
+password_hasher = PasswordHasher()
@@ -0,0 +1,243 @@
+"""
+Opt-in per-request profiling.
+
+When PROFILING_ENABLED is set, a request is profiled if it carries
+``X-Profile: 1`` together with a valid ``X-Admin-Token``, or if it is picked
+by PROFILING_SAMPLE_RATE. Two profilers are available:
+
+- ``sample`` (default): a background thread samples the event loop thread's
+  stack every PROFILING_INTERVAL_MS and writes collapsed stacks, ready for
+  flamegraph.pl / speedscope.
+- ``cprofile``: deterministic cProfile, written as a pstats file.
+
+Both observe the whole event loop thread, so concurrent requests show up in
+the profile too; only one request is profiled at a time. SQL statements
+executed by the profiled request are recorded with their durations.
+
+Profiles are kept in a bounded on-disk ring (PROFILING_DIR, at most
+PROFILING_MAX_FILES) and listed/downloaded through /api/admin/profiles.
+"""
+import asyncio
+import contextvars
+import cProfile
+import json
+import marshal
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, UTC
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from . import config
+
+# SQL statements of the request being profiled: list of [statement, start]
+_sql_trace: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("sql_trace", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _trace_before(conn, cursor, statement, parameters, context, executemany):
+    trace = _sql_trace.get()
+    if trace is not None:
+        trace.append({"statement": statement, "start": time.perf_counter()})
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _trace_after(conn, cursor, statement, parameters, context, executemany):
+    trace = _sql_trace.get()
+    if trace and "duration_ms" not in trace[-1]:
+        trace[-1]["duration_ms"] = round((time.perf_counter() - trace[-1]["start"]) * 1000, 3)
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval"""
+
+    def __init__(self, thread_id: int, interval: float):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> str:
+        """Stop sampling and return the collapsed-stack text"""
+        self._stop.set()
+        self._thread.join()
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Bounded ring of profiles on disk"""
+
+    def __init__(self, directory: str, max_profiles: int):
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    def _meta_path(self, profile_id: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.json")
+
+    def save(self, meta: dict, data: bytes):
+        """Write a profile and its metadata, evicting the oldest beyond the limit"""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, meta["file"]), "wb") as f:
+            f.write(data)
+        with open(self._meta_path(meta["id"]), "w") as f:
+            json.dump(meta, f)
+
+        entries = self.list()
+        for stale in entries[self.max_profiles:]:
+            self.delete(stale["id"])
+
+    def list(self) -> List[dict]:
+        """All stored profiles' metadata, newest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                try:
+                    with open(os.path.join(self.directory, name)) as f:
+                        entries.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return sorted(entries, key=lambda meta: meta["created_at"], reverse=True)
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        """Metadata of one profile, or None"""
+        if not profile_id.isalnum():
+            return None
+        try:
+            with open(self._meta_path(profile_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def data_path(self, meta: dict) -> str:
+        return os.path.join(self.directory, meta["file"])
+
+    def delete(self, profile_id: str):
+        meta = self.get(profile_id)
+        if meta:
+            for path in (self.data_path(meta), self._meta_path(profile_id)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+profile_store = ProfileStore(config.PROFILING_DIR, config.PROFILING_MAX_FILES)
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles selected requests"""
+
+    def __init__(self, app, store: ProfileStore = profile_store):
+        self.app = app
+        self.store = store
+        self._busy = False
+
+    def _should_profile(self, scope) -> bool:
+        if _header(scope, b"x-profile") == "1":
+            token = _header(scope, b"x-admin-token")
+            return bool(config.ADMIN_TOKEN and token and secrets.compare_digest(token, config.ADMIN_TOKEN))
+        return config.PROFILING_SAMPLE_RATE > 0 and random.random() < config.PROFILING_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not config.PROFILING_ENABLED
+            or self._busy
+            or not self._should_profile(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        self._busy = True
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        mode = config.PROFILING_MODE
+        trace: list = []
+        token = _sql_trace.set(trace)
+        if mode == "cprofile":
+            profiler = cProfile.Profile()
+            profiler.enable()
+        else:
+            sampler = StackSampler(threading.get_ident(), config.PROFILING_INTERVAL_MS / 1000)
+            sampler.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if mode == "cprofile":
+                profiler.disable()
+            else:
+                collapsed = sampler.stop()
+            _sql_trace.reset(token)
+            self._busy = False
+
+            profile_id = uuid.uuid4().hex[:16]
+            route = scope.get("route")
+            meta = {
+                "id": profile_id,
+                "created_at": datetime.now(UTC).isoformat(),
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(route, "path", None),
+                "status": status_code,
+                "duration_ms": round(duration_ms, 3),
+                "mode": mode,
+                "file": f"{profile_id}.{'pstats' if mode == 'cprofile' else 'collapsed'}",
+                "sql": [
+                    {"statement": q["statement"], "duration_ms": q.get("duration_ms")}
+                    for q in trace
+                ],
+            }
+            if mode == "cprofile":
+                data = _pstats_bytes(profiler)
+            else:
+                data = collapsed.encode()
+            try:
+                await asyncio.to_thread(self.store.save, meta, data)
+            except OSError:
+                pass
+
+
+def _pstats_bytes(profiler: cProfile.Profile) -> bytes:
+    """Serialise a profiler's stats in the marshal format pstats.Stats loads"""
+    profiler.create_stats()
+    return marshal.dumps(profiler.stats)
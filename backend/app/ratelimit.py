@@ -0,0 +1,129 @@
+"""
+Token-bucket rate limiting for write endpoints.
+
+Each rule (RATE_LIMIT_<RULE>_BURST, RATE_LIMIT_<RULE>_PER_MINUTE) gives every
+client IP a bucket of BURST tokens refilled at PER_MINUTE tokens a minute;
+a request takes one token and is rejected with 429 and Retry-After when the
+bucket is empty. Routes opt in with ``Depends(rate_limit("<rule>"))``.
+
+RATE_LIMIT_BACKEND selects where buckets live:
+
+- ``memory``: per worker process. With N workers a client gets up to N
+  times the configured rate.
+- ``database``: one row per bucket in rate_limit_buckets, updated by a
+  single UPSERT, shared by every worker and host.
+
+Behind a reverse proxy, set FORWARDED_ALLOW_IPS so uvicorn takes the client
+address from X-Forwarded-For.
+"""
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+from . import config
+from .database import db
+from .metrics import http_requests_rate_limited_total
+
+
+def rule_limits(rule: str) -> Tuple[int, float]:
+    """(burst capacity, refill tokens/second) configured for a rule"""
+    name = rule.upper()
+    burst = getattr(config, f"RATE_LIMIT_{name}_BURST")
+    per_minute = getattr(config, f"RATE_LIMIT_{name}_PER_MINUTE")
+    return burst, per_minute / 60
+
+
+class MemoryBuckets:
+    """Token buckets held in this process, bounded to max_keys clients"""
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        # key -> [tokens, updated_at]; dict order is least recently used first
+        self._buckets: Dict[str, List[float]] = {}
+
+    async def take(self, key: str, capacity: int, refill_rate: float, now: float) -> Tuple[bool, float]:
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            bucket = [float(capacity), now]
+            if len(self._buckets) >= self.max_keys:
+                # An evicted client starts again from a full bucket
+                del self._buckets[next(iter(self._buckets))]
+        tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        bucket[0], bucket[1] = tokens, now
+        self._buckets[key] = bucket
+        return allowed, tokens
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class DatabaseBuckets:
+    """Token buckets in the rate_limit_buckets table, shared by all workers"""
+
+    def __init__(self, prune_interval: float = 60, idle_after: float = 3600):
+        self.prune_interval = prune_interval
+        # Buckets untouched this long are deleted; by then they are full again
+        # unless a rule refills slower than BURST tokens per idle_after
+        self.idle_after = idle_after
+        self._last_prune = 0.0
+
+    async def take(self, key: str, capacity: int, refill_rate: float, now: float) -> Tuple[bool, float]:
+        if now - self._last_prune >= self.prune_interval:
+            self._last_prune = now
+            await db.prune_rate_limit_buckets(now - self.idle_after)
+        return await db.take_rate_limit_token(key, capacity, refill_rate, now)
+
+
+class RateLimiter:
+    """Checks requests against the configured rules"""
+
+    def __init__(self):
+        self.memory = MemoryBuckets()
+        self.database = DatabaseBuckets()
+
+    def reset(self):
+        """Forget the buckets held in this process"""
+        self.memory = MemoryBuckets(self.memory.max_keys)
+
+    def _buckets(self):
+        backend = config.RATE_LIMIT_BACKEND
+        if backend == "memory":
+            return self.memory
+        if backend == "database":
+            return self.database
+        raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
+
+    async def check(self, rule: str, client: str, now: Optional[float] = None) -> Optional[float]:
+        """None if the request may proceed, otherwise seconds until it may be retried"""
+        capacity, refill_rate = rule_limits(rule)
+        allowed, tokens = await self._buckets().take(
+            f"{rule}:{client}", capacity, refill_rate, time.time() if now is None else now
+        )
+        if allowed:
+            return None
+        return (1 - tokens) / refill_rate if refill_rate > 0 else float(60)
+
+
+rate_limiter = RateLimiter()
+
+
+def rate_limit(rule: str):
+    """FastAPI dependency enforcing a rule per client IP"""
+    async def dependency(request: Request):
+        if not config.RATE_LIMIT_ENABLED:
+            return
+        client = request.client.host if request.client else "unknown"
+        retry_after = await rate_limiter.check(rule, client)
+        if retry_after is not None:
+            http_requests_rate_limited_total.inc(rule)
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+            )
+    return dependency
@@ -0,0 +1,69 @@
+import secrets
+from fastapi import APIRouter, HTTPException, Header, Query, Depends
+from fastapi.responses import StreamingResponse, FileResponse
+from typing import Optional
+from .. import config
+from ..profiling import profile_store
+from ..export import (
+    EXPORT_TABLES, MEDIA_TYPES, DEFAULT_CHUNK_SIZE,
+    ExportFormatUnavailable, export_stream,
+)
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Guard admin routes with the shared ADMIN_TOKEN secret"""
+    if not config.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin routes are disabled")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, config.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    dependencies=[Depends(require_admin)]
+)
+
+@router.get("/export/{table}")
+async def export_table(
+    table: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv|parquet)$"),
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=50000),
+):
+    if table not in EXPORT_TABLES:
+        raise HTTPException(status_code=404, detail="Unknown export table")
+    try:
+        stream = export_stream(table, format, chunk_size)
+    except ExportFormatUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    return StreamingResponse(
+        stream,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{table}.{format}"'},
+    )
+
+@router.get("/profiles")
+async def list_profiles():
+    """Stored request profiles, newest first (SQL timings summarised)"""
+    profiles = []
+    for meta in profile_store.list():
+        sql = meta.pop("sql", [])
+        meta["sql_count"] = len(sql)
+        meta["sql_ms"] = round(sum(q["duration_ms"] or 0 for q in sql), 3)
+        profiles.append(meta)
+    return profiles
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str):
+    """Full metadata of one profile, including every SQL statement timing"""
+    meta = profile_store.get(profile_id)
+    if not meta:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return meta
+
+@router.get("/profiles/{profile_id}/download")
+async def download_profile(profile_id: str):
+    meta = profile_store.get(profile_id)
+    if not meta:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    media_type = "text/plain" if meta["mode"] == "sample" else "application/octet-stream"
+    return FileResponse(profile_store.data_path(meta), media_type=media_type, filename=meta["file"])
@@ -3,42 +3,46 @@ from pydantic import BaseModel
 from typing import Optional
 import uuid
 from ..models import UserLogin, UserCreate, AuthResponse, User
-from ..database import db
+from ..database import db, DuplicateUserError
+from ..ratelimit import rate_limit
+from ..responses import FastJSONRoute
 
 router = APIRouter(
     prefix="/auth",
-    tags=["auth"]
+    tags=["auth"],
+    route_class=FastJSONRoute,
 )
 
-@router.post("/login", response_model=AuthResponse)
+@router.post("/login", response_model=AuthResponse, dependencies=[Depends(rate_limit("auth"))])
 async def login(credentials: UserLogin):
-    user = await db.get_user_by_email(credentials.email)
-    if not user or not await db.verify_password(credentials.email, credentials.password):
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-    
     # Mock token generation
     token = str(uuid.uuid4())
-    await db.store_token(token, user.id)
+    user = await db.login_user(credentials.email, credentials.password, token)
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
     return AuthResponse(success=True, token=token, user=user)
 
-@router.post("/register", status_code=201, response_model=AuthResponse)
+@router.post("/register", status_code=201, response_model=AuthResponse, dependencies=[Depends(rate_limit("auth"))])
 async def register(user_data: UserCreate):
-    if await db.get_user_by_email(user_data.email):
-         raise HTTPException(status_code=400, detail="Email already registered")
-    if await db.get_user_by_username(user_data.username):
-         raise HTTPException(status_code=400, detail="Username already taken")
-    
-    new_user = await db.create_user(user_data.username, user_data.email, user_data.password)
     token = str(uuid.uuid4())
-    await db.store_token(token, new_user.id)
+    try:
+        new_user = await db.register_user(user_data.username, user_data.email, user_data.password, token)
+    except DuplicateUserError as e:
+        if e.field == "email":
+            raise HTTPException(status_code=400, detail="Email already registered")
+        raise HTTPException(status_code=400, detail="Username already taken")
     return AuthResponse(success=True, token=token, user=new_user)
 
-@router.post("/logout")
-async def logout():
-    return {"success": True}
-
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
+
+@router.post("/logout")
+async def logout(credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)):
+    # Idempotent: logging out without a token, or with an unknown one, succeeds
+    if credentials:
+        await db.revoke_token(credentials.credentials)
+    return {"success": True}
 
 @router.get("/me", response_model=User)
 async def get_me(credentials: HTTPAuthorizationCredentials = Depends(security)):
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Request
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"]
+)
+
+@router.get("/routes")
+async def list_routes(request: Request):
+    return [
+        {"path": route.path, "name": route.name, "methods": list(getattr(route, "methods", None) or [])}
+        for route in request.app.routes
+    ]
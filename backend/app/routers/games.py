@@ -1,16 +1,22 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
 from ..models import ActiveGame
 from ..database import db
+from ..responses import FastJSONRoute
 
 router = APIRouter(
     prefix="/games",
-    tags=["games"]
+    tags=["games"],
+    route_class=FastJSONRoute,
 )
 
 @router.get("/active", response_model=List[ActiveGame])
-async def get_active_games():
-    return await db.get_active_games()
+async def get_active_games(
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+):
+    games = await db.get_active_games()
+    return games[offset:offset + limit if limit else None]
 
 @router.get("/{game_id}", response_model=ActiveGame)
 async def get_game(game_id: str):
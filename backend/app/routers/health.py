@@ -0,0 +1,23 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from ..health import check_readiness
+
+router = APIRouter(
+    prefix="/health",
+    tags=["health"]
+)
+
+@router.get("")
+@router.get("/live")
+async def liveness_check():
+    """The process is up and serving requests"""
+    return {"status": "healthy"}
+
+@router.get("/ready")
+async def readiness_check():
+    """Database reachable, schema initialised and pool not saturated"""
+    ready, checks = await check_readiness()
+    return JSONResponse(
+        {"status": "ready" if ready else "not_ready", "checks": checks},
+        status_code=200 if ready else 503,
+    )
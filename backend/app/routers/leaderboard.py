@@ -1,20 +1,71 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
-from ..models import LeaderboardEntry, GameScore, ScoreResponse
+from ..models import DEFAULT_GRID_SIZE, GRID_SIZES, LeaderboardEntry, GameScore, ScoreResponse, AroundMeResponse, ScoreQuantile, ScoreDistributionResponse
 from ..database import db
+from ..ratelimit import rate_limit
+from ..score_distribution import score_distribution
+from ..responses import FastJSONRoute
 from .auth import security, get_me # Re-use auth dependency
 
 router = APIRouter(
     prefix="/leaderboard",
-    tags=["leaderboard"]
+    tags=["leaderboard"],
+    route_class=FastJSONRoute,
 )
 
+def grid_size_param(grid_size: int = Query(DEFAULT_GRID_SIZE, alias="gridSize")) -> int:
+    # Literal[...] query parameters do not coerce from strings, so check here
+    if grid_size not in GRID_SIZES:
+        raise HTTPException(status_code=422, detail=f"gridSize must be one of {', '.join(map(str, GRID_SIZES))}")
+    return grid_size
+
 @router.get("", response_model=List[LeaderboardEntry])
-async def get_leaderboard(mode: Optional[str] = Query(None, pattern="^(passthrough|walls)$")):
-    return await db.get_leaderboard(mode)
+async def get_leaderboard(
+    mode: Optional[str] = Query(None, pattern="^(passthrough|walls)$"),
+    grid_size: int = Depends(grid_size_param),
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+):
+    return await db.get_leaderboard(mode, grid_size, offset, limit)
+
+@router.get("/around-me", response_model=AroundMeResponse)
+async def get_leaderboard_around_me(
+    mode: Optional[str] = Query(None, pattern="^(passthrough|walls)$"),
+    radius: int = Query(5, ge=0, le=50),
+    grid_size: int = Depends(grid_size_param),
+    user=Depends(get_me),
+):
+    return await db.get_leaderboard_around_user(user.username, mode, radius, grid_size)
+
+QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 0.99)
+
+@router.get("/distribution", response_model=ScoreDistributionResponse)
+async def get_score_distribution(
+    mode: str = Query(..., pattern="^(passthrough|walls)$"),
+    window: str = Query("all", pattern="^(all|day|week)$"),
+    grid_size: int = Depends(grid_size_param),
+):
+    sketch = score_distribution.sketch(mode, window, grid_size=grid_size)
+    return ScoreDistributionResponse(
+        mode=mode,
+        gridSize=grid_size,
+        window=window,
+        count=sketch.count,
+        quantiles=[
+            ScoreQuantile(q=q, score=round(sketch.quantile(q), 1))
+            for q in QUANTILES
+        ] if sketch.count else [],
+        relativeAccuracy=sketch.relative_accuracy,
+    )
 
-@router.post("", response_model=ScoreResponse)
+@router.post("", response_model=ScoreResponse, dependencies=[Depends(rate_limit("scores"))])
 async def submit_score(score: GameScore, user=Depends(get_me)):
     rank = await db.submit_score(user.id, score)
-    return ScoreResponse(success=True, rank=rank)
+    score_distribution.add(score.mode, score.score, grid_size=score.gridSize)
+    percentile = score_distribution.percentile(score.mode, score.score, score.gridSize)
+    return ScoreResponse(
+        success=True,
+        rank=rank,
+        percentile=round(percentile, 1) if percentile is not None else None,
+    )
 
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, HTTPException, Depends
 from ..models import User, UserUpdate
 from ..database import db
+from ..responses import FastJSONRoute
 from .auth import security, get_me
 
 router = APIRouter(
     prefix="/users",
-    tags=["users"]
+    tags=["users"],
+    route_class=FastJSONRoute,
 )
 
 @router.patch("/me", response_model=dict)
@@ -0,0 +1,152 @@
+"""
+Score distributions per board, for "you beat N% of games" percentiles.
+
+Each worker keeps QuantileSketch views (see app/sketches.py) per board
+(mode and grid size) for all time and for every UTC day of the last
+SCORE_SKETCH_DAYS. A submitted score is added in O(1) to the views and to
+a local delta. Every
+SCORE_SKETCH_FLUSH_INTERVAL seconds the deltas are merged into the
+score_sketches table and the views reloaded from it, which also picks up
+the scores other workers recorded. Percentiles are therefore exact to the
+sketch's error bound for this worker's scores and at most one flush
+interval behind for the others'.
+
+The table is filled from the existing leaderboard by migration
+0005_score_sketches; 0006_grid_sizes keys it by grid size.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, UTC
+from typing import Dict, Optional, Tuple
+
+from . import config
+from .database import db
+from .models import DEFAULT_GRID_SIZE
+from .sketches import QuantileSketch
+
+logger = logging.getLogger("snake-game.scores")
+
+# Fixed so persisted sketches always merge; see app/sketches.py for the bounds
+RELATIVE_ACCURACY = 0.01
+
+ALL_TIME = "all"
+# Window name -> number of UTC days covered (None: all time)
+WINDOWS = {"all": None, "day": 1, "week": 7}
+
+# (mode, grid_size, period)
+Key = Tuple[str, int, str]
+
+
+def day_period(when: datetime) -> str:
+    """Period key of the UTC day containing when"""
+    return when.astimezone(UTC).strftime("%Y-%m-%d")
+
+
+class ScoreDistribution:
+    """Per-board score sketches, flushed to and reloaded from the database"""
+
+    def __init__(
+        self,
+        interval: float = config.SCORE_SKETCH_FLUSH_INTERVAL,
+        days: int = config.SCORE_SKETCH_DAYS,
+    ):
+        self.interval = interval
+        self.days = days
+        self._views: Dict[Key, QuantileSketch] = {}
+        self._deltas: Dict[Key, QuantileSketch] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def reset(self):
+        """Forget the sketches and deltas held in this process"""
+        self._views = {}
+        self._deltas = {}
+
+    @staticmethod
+    def _add(sketches: Dict[Key, QuantileSketch], key: Key, score: int):
+        sketch = sketches.get(key)
+        if sketch is None:
+            sketch = sketches[key] = QuantileSketch(RELATIVE_ACCURACY)
+        sketch.add(score)
+
+    def add(self, mode: str, score: int, when: Optional[datetime] = None, grid_size: int = DEFAULT_GRID_SIZE):
+        """Record a submitted score"""
+        period = day_period(when or datetime.now(UTC))
+        for key in ((mode, grid_size, ALL_TIME), (mode, grid_size, period)):
+            self._add(self._views, key, score)
+            self._add(self._deltas, key, score)
+
+    def sketch(
+        self, mode: str, window: str = "all", now: Optional[datetime] = None, grid_size: int = DEFAULT_GRID_SIZE
+    ) -> QuantileSketch:
+        """Merged sketch of a board over a window (see WINDOWS)"""
+        days = WINDOWS[window]
+        if days is None:
+            return self._views.get((mode, grid_size, ALL_TIME)) or QuantileSketch(RELATIVE_ACCURACY)
+        now = now or datetime.now(UTC)
+        merged = QuantileSketch(RELATIVE_ACCURACY)
+        for offset in range(min(days, self.days)):
+            daily = self._views.get((mode, grid_size, day_period(now - timedelta(days=offset))))
+            if daily is not None:
+                merged.merge(daily)
+        return merged
+
+    def percentile(self, mode: str, score: int, grid_size: int = DEFAULT_GRID_SIZE) -> Optional[float]:
+        """Percentage of all-time games on the board that scored below score"""
+        return self._views.get((mode, grid_size, ALL_TIME), QuantileSketch(RELATIVE_ACCURACY)).percentile(score)
+
+    async def load(self):
+        """Replace the views with the persisted sketches plus unflushed deltas"""
+        views = await db.load_score_sketches()
+        for key, delta in self._deltas.items():
+            views.setdefault(key, QuantileSketch(RELATIVE_ACCURACY)).merge(delta)
+        self._views = views
+
+    async def flush(self, now: Optional[datetime] = None):
+        """Persist the local deltas, drop expired days and reload the views"""
+        pending, self._deltas = self._deltas, {}
+        if pending:
+            try:
+                await db.merge_score_sketches(pending)
+            except Exception:
+                # Keep them for the next flush, with anything added meanwhile
+                for key, delta in self._deltas.items():
+                    pending.setdefault(key, QuantileSketch(RELATIVE_ACCURACY)).merge(delta)
+                self._deltas = pending
+                raise
+        oldest = day_period((now or datetime.now(UTC)) - timedelta(days=self.days - 1))
+        await db.delete_score_sketches_before(oldest)
+        await self.load()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Score sketch flush failed: {e}")
+
+    async def start(self):
+        """Load the persisted sketches and start the flush loop"""
+        try:
+            await self.load()
+        except Exception as e:
+            logger.error(f"Failed to load score sketches: {e}")
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and persist what is left"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Final score sketch flush failed: {e}")
+
+
+score_distribution = ScoreDistribution()
@@ -6,11 +6,11 @@ import asyncio
 from datetime import datetime, UTC
 from app.db.session import AsyncSessionLocal
 from app.db.models import UserModel, LeaderboardEntryModel, ActiveGameModel
-import hashlib
+from app.passwords import password_hasher
 
 def hash_password(password: str) -> str:
-    """Hash a password using SHA256"""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hash a password with the application's password hasher"""
+    return password_hasher.hash_sync(password)
 
 async def seed_database():
     """Seed the database with initial data"""
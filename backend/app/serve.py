@@ -0,0 +1,68 @@
+"""
+Production launcher.
+
+Starts uvicorn with WEB_CONCURRENCY worker processes sharing the listening
+socket. With several workers the database is initialised once up front
+rather than concurrently by every worker. Workers keep their caches
+coherent through the invalidation bus (see app/cache.py); the socket
+directory of the ipc bus is created here so all workers of this server
+share it.
+
+Run with: uv run python -m app.serve
+"""
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+
+import uvicorn
+
+from . import config
+
+logger = logging.getLogger("snake-game")
+
+
+async def _prepare():
+    # Done once here rather than concurrently in every worker's startup
+    from .db.session import engine, init_db
+    try:
+        await init_db()
+    finally:
+        await engine.dispose()
+
+
+def main():
+    # A single worker initialises the database in its own startup
+    if config.WEB_CONCURRENCY > 1:
+        try:
+            asyncio.run(_prepare())
+        except Exception as e:
+            # Workers try again at startup; readiness reports the schema until then
+            logger.error(f"Failed to initialize database: {e}")
+
+    bus_dir = None
+    if config.WEB_CONCURRENCY > 1 and not config.CACHE_BUS_DIR:
+        bus_dir = tempfile.mkdtemp(prefix="snake-cache-bus-")
+        # Inherited by the worker processes
+        os.environ["CACHE_BUS_DIR"] = bus_dir
+
+    try:
+        uvicorn.run(
+            "app.main:app",
+            host=config.HOST,
+            port=config.PORT,
+            workers=config.WEB_CONCURRENCY,
+            # Rate limits key on the client address behind the proxy
+            proxy_headers=True,
+            forwarded_allow_ips=config.FORWARDED_ALLOW_IPS,
+            access_log=False,
+            log_config=None,
+        )
+    finally:
+        if bus_dir:
+            shutil.rmtree(bus_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Mergeable quantile sketch for score distributions.
+
+QuantileSketch is a logarithmic histogram (the DDSketch layout): a positive
+value v falls in bucket k = ceil(log_gamma(v)), which covers
+(gamma^(k-1), gamma^k] with gamma = (1 + a) / (1 - a) for a relative
+accuracy a; zeros and negatives are counted separately. Adding a value is
+O(1), two sketches with the same accuracy merge by adding bucket counts, and
+the bucket count grows only with log(max score), not with the number of
+games.
+
+Error bounds, for relative accuracy a:
+
+- quantile(q) returns a value within a factor (1 ± a) of the exact q-quantile.
+- count_below(x) is at least the exact number of values below x / gamma and
+  at most the exact number below x. Scores that are close together (within
+  about 2a of each other) may be reported as ties.
+"""
+import math
+from typing import Dict, Optional
+
+
+class QuantileSketch:
+    """Log-bucketed histogram with relative-error quantiles"""
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value: float, count: int = 1):
+        """Record value count times"""
+        if value <= 0:
+            self.zero_count += count
+        else:
+            key = self._key(value)
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.count += count
+
+    def merge(self, other: "QuantileSketch"):
+        """Add every value recorded by other"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracies")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def count_below(self, value: float) -> int:
+        """Approximate number of recorded values strictly below value"""
+        if value <= 0:
+            return 0
+        key = self._key(value)
+        return self.zero_count + sum(count for k, count in self.bins.items() if k < key)
+
+    def percentile(self, value: float) -> Optional[float]:
+        """Percentage (0-100) of recorded values below value, or None if empty"""
+        if not self.count:
+            return None
+        return 100.0 * self.count_below(value) / self.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile (0 <= q <= 1), or None if empty"""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                # Midpoint of the bucket in relative terms
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.bins) / (self.gamma + 1)
+
+    def to_dict(self) -> dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "zero_count": self.zero_count,
+            "bins": {str(key): count for key, count in self.bins.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(data["relative_accuracy"])
+        sketch.zero_count = data["zero_count"]
+        sketch.bins = {int(key): count for key, count in data["bins"].items()}
+        sketch.count = sketch.zero_count + sum(sketch.bins.values())
+        return sketch
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,184 @@
+"""
+Cache-aware static file serving for the bundled SPA.
+
+The build directory is indexed once at startup into an in-memory manifest,
+so requests never touch the filesystem to resolve paths. For each file the
+manifest records:
+
+- pre-compressed variants (``file.br`` / ``file.gz``) chosen by Accept-Encoding
+- an ETag per variant, answered with 304 on If-None-Match
+- Cache-Control: immutable for content-hashed Vite assets under assets/,
+  revalidate otherwise (public/ files keep their names across builds)
+- the body itself for small files such as index.html
+
+Variants are produced at build time with:
+    python -m app.static_files compress static/
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import sys
+from typing import Dict, Optional
+
+from fastapi.responses import Response, FileResponse
+
+# Files up to this size are held in memory
+MEMORY_LIMIT = 256 * 1024
+# Vite emits assets into assets/ as name-<8 char hash>.ext; files copied from
+# public/ keep their names, however they look
+ASSETS_DIR = "assets/"
+HASHED_NAME_RE = re.compile(r"[.-][A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+COMPRESSIBLE_EXTENSIONS = {".html", ".js", ".mjs", ".css", ".json", ".svg", ".txt", ".xml", ".map", ".ico", ".webmanifest"}
+
+# Content-Encoding name -> file suffix, in order of preference
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+
+class _Variant:
+    """One stored representation of a file"""
+    __slots__ = ("path", "size", "etag", "body")
+
+    def __init__(self, path: str, encoding: str):
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.body: Optional[bytes] = None
+        if self.size <= MEMORY_LIMIT:
+            with open(path, "rb") as f:
+                self.body = f.read()
+            digest = hashlib.blake2b(self.body, digest_size=12).hexdigest()
+        else:
+            stat = os.stat(path)
+            digest = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+        suffix = f"-{encoding}" if encoding != "identity" else ""
+        self.etag = f'"{digest}{suffix}"'
+
+
+class _Entry:
+    """A file in the build directory with its encoded variants"""
+    __slots__ = ("media_type", "cache_control", "variants")
+
+    def __init__(self, rel_path: str, path: str):
+        self.media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        hashed = rel_path.startswith(ASSETS_DIR) and HASHED_NAME_RE.search(rel_path)
+        self.cache_control = IMMUTABLE_CACHE if hashed else REVALIDATE_CACHE
+        self.variants: Dict[str, _Variant] = {"identity": _Variant(path, "identity")}
+        for encoding, suffix in ENCODINGS.items():
+            if os.path.isfile(path + suffix):
+                self.variants[encoding] = _Variant(path + suffix, encoding)
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """Map each encoding named in Accept-Encoding to its q-value"""
+    accepted: Dict[str, float] = {}
+    if not header:
+        return accepted
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name:
+            accepted[name.strip().lower()] = q
+    return accepted
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+class StaticManifest:
+    """In-memory index of a static build directory"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.entries: Dict[str, _Entry] = {}
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if any(name.endswith(suffix) for suffix in ENCODINGS.values()):
+                    continue
+                path = os.path.join(root, name)
+                rel_path = os.path.relpath(path, directory).replace(os.sep, "/")
+                self.entries[rel_path] = _Entry(rel_path, path)
+
+    def __contains__(self, rel_path: str) -> bool:
+        return rel_path in self.entries
+
+    def response(self, rel_path: str, headers) -> Optional[Response]:
+        """Build the response for a file, or None if it is not in the build"""
+        entry = self.entries.get(rel_path)
+        if entry is None:
+            return None
+
+        accepted = parse_accept_encoding(headers.get("accept-encoding"))
+        encoding = "identity"
+        for candidate in ENCODINGS:
+            if candidate in entry.variants and accepted.get(candidate, 0) > 0:
+                encoding = candidate
+                break
+        variant = entry.variants[encoding]
+
+        response_headers = {
+            "Cache-Control": entry.cache_control,
+            "ETag": variant.etag,
+        }
+        if len(entry.variants) > 1:
+            response_headers["Vary"] = "Accept-Encoding"
+        if encoding != "identity":
+            response_headers["Content-Encoding"] = encoding
+
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, variant.etag):
+            return Response(status_code=304, headers=response_headers)
+
+        if variant.body is not None:
+            return Response(content=variant.body, media_type=entry.media_type, headers=response_headers)
+        return FileResponse(variant.path, media_type=entry.media_type, headers=response_headers)
+
+
+def compress_directory(directory: str, min_size: int = 256) -> int:
+    """Write .gz (and .br if brotli is installed) next to compressible files"""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    written = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.splitext(name)[1] not in COMPRESSIBLE_EXTENSIONS:
+                continue
+            with open(path, "rb") as f:
+                data = f.read()
+            if len(data) < min_size:
+                continue
+
+            outputs = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                outputs[".br"] = brotli.compress(data, quality=11)
+            for suffix, compressed in outputs.items():
+                # Skip variants that do not actually save bytes
+                if len(compressed) < len(data):
+                    with open(path + suffix, "wb") as f:
+                        f.write(compressed)
+                    written += 1
+    return written
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3 or sys.argv[1] != "compress":
+        print("usage: python -m app.static_files compress <directory>", file=sys.stderr)
+        sys.exit(2)
+    count = compress_directory(sys.argv[2])
+    print(f"Wrote {count} compressed variants in {sys.argv[2]}")
@@ -0,0 +1,65 @@
+"""
+Background sweeper for expired authentication tokens.
+Deletes them in small batches, each in its own short transaction, so the
+tokens table is never locked for long and logins continue during a sweep.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+
+from . import config
+from .database import db
+
+logger = logging.getLogger("snake-game.tokens")
+
+
+class TokenSweeper:
+    """Periodically deletes expired tokens"""
+
+    def __init__(
+        self,
+        interval: float = config.TOKEN_SWEEP_INTERVAL,
+        batch_size: int = config.TOKEN_SWEEP_BATCH_SIZE,
+    ):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self, now: Optional[datetime] = None) -> int:
+        """Delete every token expired at `now`; returns the number deleted"""
+        total = 0
+        while True:
+            deleted = await db.delete_expired_tokens(self.batch_size, now)
+            total += deleted
+            if deleted < self.batch_size:
+                break
+            # Let requests waiting on the table in between batches
+            await asyncio.sleep(0)
+        if total:
+            logger.info(f"Deleted {total} expired tokens")
+        return total
+
+    async def _run(self):
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Token sweep failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """Start the background loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the background loop and wait for it to finish"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,74 @@
+"""
+Bot decision throughput and lobby tick cost.
+
+Plays bots on every mode and grid size for a few seconds each and prints
+decisions per second and the p50/p99 cost of a single decision, then times
+BotLobby ticks and syncs (against an in-memory database) for a lobby of
+--bots bots.
+
+Run with: uv run python -m benchmarks.bench_bots
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from app.bot_lobby import MODES, BotLobby
+from app.bots import BotPlayer
+from app.models import GRID_SIZES
+from .common import bench_client, percentile, summarize, Timer
+
+
+def decisions(mode: str, grid_size: int, seconds: float, seed: int):
+    bot = BotPlayer(mode, grid_size, random.Random(seed))
+    samples_us = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        direction = bot.decide()
+        samples_us.append((time.perf_counter() - started) * 1e6)
+        bot.game.set_direction(direction)
+        if bot.game.step() == "gameover":
+            bot.restart()
+    total_s = sum(samples_us) / 1e6
+    print(
+        f"{mode:<12} {grid_size:>3}x{grid_size:<3} "
+        f"decisions/s={len(samples_us) / total_s:>9.0f} "
+        f"p50={percentile(samples_us, 50):6.1f}us "
+        f"p99={percentile(samples_us, 99):7.1f}us "
+        f"max={max(samples_us):8.1f}us "
+        f"games={bot.games_played}"
+    )
+
+
+async def lobby(bots: int, ticks: int, seed: int):
+    async with bench_client():
+        lobby = BotLobby(count=bots, seed=seed)
+        tick_ms, sync_ms = [], []
+        for _ in range(ticks):
+            with Timer() as t:
+                await lobby.tick()
+            tick_ms.append(t.elapsed_ms)
+            with Timer() as t:
+                await lobby.sync()
+            sync_ms.append(t.elapsed_ms)
+    print(summarize(f"tick ({bots} bots)", tick_ms))
+    print(summarize(f"sync ({bots} bots)", sync_ms))
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=2, help="per mode and grid size")
+    parser.add_argument("--bots", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for mode in MODES:
+        for grid_size in GRID_SIZES:
+            decisions(mode, grid_size, args.seconds, args.seed)
+    await lobby(args.bots, args.ticks, args.seed)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
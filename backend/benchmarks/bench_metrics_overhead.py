@@ -0,0 +1,57 @@
+"""
+Overhead of the metrics middleware and DB instrumentation.
+
+Runs the same request mix with METRICS_ENABLED on and off (alternating
+rounds to even out noise) and prints the latency for each.
+
+Run with: uv run python -m benchmarks.bench_metrics_overhead
+"""
+import argparse
+import asyncio
+from datetime import datetime, UTC
+
+from app import config
+from app.db.models import LeaderboardEntryModel
+from .common import bench_client, summarize, Timer
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=4)
+    args = parser.parse_args()
+
+    samples = {True: {"health": [], "leaderboard": []}, False: {"health": [], "leaderboard": []}}
+    enabled = config.METRICS_ENABLED
+
+    async with bench_client() as (client, session_factory):
+        async with session_factory() as session:
+            for i in range(50):
+                session.add(LeaderboardEntryModel(
+                    id=f"e{i}", username=f"p{i}", score=i * 10, mode="walls", date=datetime.now(UTC),
+                ))
+            await session.commit()
+
+        try:
+            per_round = args.requests // args.rounds
+            for _ in range(args.rounds):
+                for metrics_on in (True, False):
+                    config.METRICS_ENABLED = metrics_on
+                    for _ in range(per_round):
+                        with Timer() as t:
+                            await client.get("/api/health")
+                        samples[metrics_on]["health"].append(t.elapsed_ms)
+                        with Timer() as t:
+                            await client.get("/api/leaderboard")
+                        samples[metrics_on]["leaderboard"].append(t.elapsed_ms)
+        finally:
+            config.METRICS_ENABLED = enabled
+
+    for endpoint in ("health", "leaderboard"):
+        for metrics_on in (False, True):
+            label = f"{endpoint} metrics {'on' if metrics_on else 'off'}"
+            print(summarize(label, samples[metrics_on][endpoint]))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+Login bursts vs. concurrent leaderboard reads.
+
+Fires a burst of concurrent logins while a reader polls GET /api/leaderboard,
+once with the KDF inline on the event loop and once in the worker pool, and
+prints the read latencies for each.
+
+Run with: uv run python -m benchmarks.bench_password_hashing
+"""
+import argparse
+import asyncio
+from datetime import datetime, UTC
+
+from app.db.models import UserModel, LeaderboardEntryModel
+from app.passwords import password_hasher
+from .common import bench_client, summarize, Timer
+
+
+async def run(mode: str, logins: int, entries: int):
+    workers = password_hasher.workers
+    if mode == "inline":
+        password_hasher.workers = 0
+
+    try:
+        async with bench_client() as (client, session_factory):
+            async with session_factory() as session:
+                session.add(UserModel(
+                    id="bench-user", username="bench", email="bench@example.com",
+                    password_hash=password_hasher.hash_sync("password123"),
+                ))
+                for i in range(entries):
+                    session.add(LeaderboardEntryModel(
+                        id=f"e{i}", username=f"p{i}", score=i * 10, mode="walls",
+                        date=datetime.now(UTC),
+                    ))
+                await session.commit()
+
+            done = asyncio.Event()
+            reads = []
+
+            async def reader():
+                while not done.is_set():
+                    with Timer() as t:
+                        await client.get("/api/leaderboard")
+                    reads.append(t.elapsed_ms)
+
+            async def login():
+                response = await client.post(
+                    "/api/auth/login",
+                    json={"email": "bench@example.com", "password": "password123"},
+                )
+                assert response.status_code == 200
+
+            reader_task = asyncio.create_task(reader())
+            with Timer() as burst:
+                await asyncio.gather(*(login() for _ in range(logins)))
+            done.set()
+            await reader_task
+    finally:
+        password_hasher.workers = workers
+
+    print(summarize(f"reads during burst ({mode})", reads))
+    print(f"{'':<28} burst of {logins} logins took {burst.elapsed_ms:.0f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--entries", type=int, default=100)
+    args = parser.parse_args()
+
+    for mode in ("inline", "pool"):
+        await run(mode, args.logins, args.entries)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""
+Response serialisation: FastAPI's default path vs. FastJSONRoute.
+
+For each list size, serialises GET /api/leaderboard's entries both ways
+(in isolation, then end to end through the app against an in-memory
+database with FAST_JSON_RESPONSES on and off) and checks that the bytes
+are identical.
+
+Run with: uv run python -m benchmarks.bench_serialization
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta, UTC
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+
+from app import config
+from app.cache import clear_all_caches
+from app.db.models import LeaderboardEntryModel
+from app.main import app
+from app.models import LeaderboardEntry
+from app.responses import TypedJSONResponse
+from .common import bench_client, summarize, Timer
+
+
+def _route(path: str):
+    return next(route for route in app.routes if getattr(route, "path", None) == path and "GET" in route.methods)
+
+
+async def serialise(route, entries, repeat: int):
+    """(default samples, fast samples) in milliseconds"""
+    default, fast = [], []
+    TypedJSONResponse(entries, route.response_model)
+    for _ in range(repeat):
+        with Timer() as t:
+            content = await serialize_response(field=route.response_field, response_content=entries)
+            default_body = JSONResponse(content).body
+        default.append(t.elapsed_ms)
+        with Timer() as t:
+            fast_body = TypedJSONResponse(entries, route.response_model).body
+        fast.append(t.elapsed_ms)
+    assert fast_body == default_body
+    return default, fast
+
+
+async def end_to_end(size: int, repeat: int):
+    """{fast: samples} for GET /api/leaderboard with size entries"""
+    samples = {True: [], False: []}
+    enabled = config.FAST_JSON_RESPONSES
+    async with bench_client() as (client, session_factory):
+        async with session_factory() as session:
+            now = datetime.now(UTC)
+            session.add_all(
+                LeaderboardEntryModel(
+                    id=f"e{i}", username=f"p{i}", score=i * 10, mode="walls", date=now - timedelta(seconds=i),
+                )
+                for i in range(size)
+            )
+            await session.commit()
+
+        try:
+            # Warm the leaderboard cache so both paths serve the same cached list
+            await client.get("/api/leaderboard")
+            bodies = {}
+            for _ in range(repeat):
+                for fast in (True, False):
+                    config.FAST_JSON_RESPONSES = fast
+                    with Timer() as t:
+                        response = await client.get("/api/leaderboard")
+                    samples[fast].append(t.elapsed_ms)
+                    bodies[fast] = response.content
+            assert bodies[True] == bodies[False]
+        finally:
+            config.FAST_JSON_RESPONSES = enabled
+            clear_all_caches()
+    return samples
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    route = _route("/api/leaderboard")
+    now = datetime.now(UTC)
+    for size in args.sizes:
+        entries = [
+            LeaderboardEntry(id=f"e{i}", username=f"p{i}", score=i * 10, mode="walls", date=now)
+            for i in range(size)
+        ]
+        default, fast = await serialise(route, entries, args.repeat)
+        print(summarize(f"serialise {size} default", default))
+        print(summarize(f"serialise {size} fast", fast))
+
+        samples = await end_to_end(size, args.repeat)
+        print(summarize(f"GET {size} default", samples[False]))
+        print(summarize(f"GET {size} fast", samples[True]))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
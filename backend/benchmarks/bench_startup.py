@@ -0,0 +1,112 @@
+"""
+Cold start: import time profile and time-to-first-response.
+
+1. Imports app.main under `python -X importtime` and reports the total
+   import time, the heaviest top-level packages and the app's own modules.
+2. Starts `python -m app.serve` repeatedly and measures the time from
+   process start to the first successful /api/health/live and
+   /api/leaderboard responses, on a fresh database ("first boot") and on one
+   whose schema is already current ("warm boot").
+
+Run with: uv run python -m benchmarks.bench_startup
+"""
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import httpx
+
+from .common import summarize, free_port, wait_until_ready
+
+
+def import_profile() -> Tuple[float, List[Tuple[str, float]]]:
+    """Return (total ms, [(module, self ms)]) for importing app.main"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True, env={**os.environ, "LOG_LEVEL": "WARNING"},
+    )
+    modules = []
+    total_ms = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        modules.append((name, int(self_us) / 1000))
+        if name == "app.main":
+            total_ms = int(cumulative_us) / 1000
+    return total_ms, modules
+
+
+def report_imports(top: int):
+    total_ms, modules = import_profile()
+    by_package: Dict[str, float] = defaultdict(float)
+    for name, self_ms in modules:
+        by_package[name.split(".")[0]] += self_ms
+
+    print(f"import app.main: {total_ms:.1f}ms")
+    print("  heaviest packages (self time):")
+    for package, ms in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"    {package:<24} {ms:8.1f}ms")
+    print("  app modules (self time):")
+    for name, ms in sorted((m for m in modules if m[0].startswith("app.")), key=lambda m: -m[1]):
+        print(f"    {name:<24} {ms:8.1f}ms")
+
+
+def time_to_first_response(database_url: str) -> Tuple[float, float]:
+    """Start a server and return ms until the first live and leaderboard responses"""
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "PORT": str(port),
+        "HOST": "127.0.0.1",
+        "WEB_CONCURRENCY": "1",
+        "LOG_LEVEL": "WARNING",
+    }
+    start = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "app.serve"], env=env)
+    try:
+        wait_until_ready(f"{base_url}/api/health/live", poll=0.02)
+        live_ms = (time.perf_counter() - start) * 1000
+        httpx.get(f"{base_url}/api/leaderboard").raise_for_status()
+        first_query_ms = (time.perf_counter() - start) * 1000
+        return live_ms, first_query_ms
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    report_imports(args.top)
+
+    samples = {"first boot": ([], []), "warm boot": ([], [])}
+    with tempfile.TemporaryDirectory() as tmp:
+        for run in range(args.runs):
+            fresh_url = f"sqlite+aiosqlite:///{tmp}/fresh-{run}.db"
+            for label, url in (("first boot", fresh_url), ("warm boot", fresh_url)):
+                live_ms, query_ms = time_to_first_response(url)
+                samples[label][0].append(live_ms)
+                samples[label][1].append(query_ms)
+
+    print("time to first response:")
+    for label, (live, query) in samples.items():
+        print(summarize(f"{label} /health/live", live))
+        print(summarize(f"{label} /leaderboard", query))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Throughput scaling with the number of worker processes.
+
+Starts `python -m app.serve` with each requested worker count against a
+seeded SQLite file, drives it from several client processes and prints
+requests/sec and latency per worker count. Scaling is bounded by the cores
+of the machine, which the client processes share with the server.
+
+Run with: uv run python -m benchmarks.bench_workers --workers 1 2 4
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, UTC
+
+import httpx
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.base import Base
+from app.db.models import LeaderboardEntryModel
+from .common import summarize, free_port, wait_until_ready
+
+
+async def _seed(url: str, entries: int):
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(LeaderboardEntryModel), [
+            {"id": f"e{i}", "username": f"player{i}", "score": i * 10,
+             "mode": "walls" if i % 2 else "passthrough", "date": datetime.now(UTC)}
+            for i in range(entries)
+        ])
+    await engine.dispose()
+
+
+def _client(base_url: str, path: str, concurrency: int, duration: float, results):
+    """Client process: keep `concurrency` requests in flight for `duration` seconds"""
+    async def run():
+        latencies = []
+        deadline = time.perf_counter() + duration
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits) as client:
+            async def loop():
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    response = await client.get(path)
+                    response.raise_for_status()
+                    latencies.append((time.perf_counter() - start) * 1000)
+            await asyncio.gather(*(loop() for _ in range(concurrency)))
+        return latencies
+    results.put(asyncio.run(run()))
+
+
+def bench(workers: int, database_url: str, args) -> list:
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "WEB_CONCURRENCY": str(workers),
+        "PORT": str(port),
+        "HOST": "127.0.0.1",
+        "LOG_LEVEL": "WARNING",
+        # Measure raw capacity, not load shedding
+        "ADMISSION_ENABLED": "0",
+    }
+    server = subprocess.Popen([sys.executable, "-m", "app.serve"], env=env)
+    try:
+        wait_until_ready(f"{base_url}/api/health/live")
+        # Warm every worker's cache
+        for _ in range(workers * 20):
+            httpx.get(f"{base_url}{args.path}")
+
+        results = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(target=_client, args=(base_url, args.path, args.concurrency, args.duration, results))
+            for _ in range(args.clients)
+        ]
+        for client in clients:
+            client.start()
+        latencies = []
+        for _ in clients:
+            latencies.extend(results.get())
+        for client in clients:
+            client.join()
+        return latencies
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=2, help="Client processes")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight per client process")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--path", default="/api/leaderboard")
+    parser.add_argument("--entries", type=int, default=100)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite+aiosqlite:///{tmp}/bench.db"
+        asyncio.run(_seed(database_url, args.entries))
+
+        print(f"{os.cpu_count()} CPUs, GET {args.path}, {args.clients}x{args.concurrency} concurrent clients")
+        for workers in args.workers:
+            latencies = bench(workers, database_url, args)
+            label = f"{workers} worker{'s' if workers > 1 else ''}"
+            print(f"{summarize(label, latencies)} {len(latencies) / args.duration:8.0f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Shared helpers for the backend benchmarks.
+Benchmarks run the ASGI app in-process against an in-memory SQLite database,
+the same way the test suite does.
+"""
+import logging
+import socket
+import statistics
+import time
+from contextlib import asynccontextmanager, ExitStack
+from typing import List
+from unittest.mock import patch
+
+import httpx
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import StaticPool
+
+from app.main import app
+from app.db.base import Base
+from app import config, database
+from app.cache import clear_all_caches
+from app.ratelimit import rate_limiter
+from app.db import session as db_session_module
+
+
+@asynccontextmanager
+async def bench_client(app=app):
+    """Yield (client, session_factory) for a fresh in-memory database, without rate limits"""
+    logging.getLogger().setLevel(logging.WARNING)
+    clear_all_caches()
+    rate_limiter.reset()
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    with ExitStack() as stack:
+        stack.enter_context(patch.object(db_session_module, "engine", engine))
+        stack.enter_context(patch.object(db_session_module, "AsyncSessionLocal", session_factory))
+        stack.enter_context(patch.object(database, "AsyncSessionLocal", session_factory))
+        # Benchmarks fire bursts from one client address
+        stack.enter_context(patch.object(config, "RATE_LIMIT_ENABLED", False))
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            yield client, session_factory
+
+    await engine.dispose()
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(label: str, samples_ms: List[float]) -> str:
+    """One-line latency summary in milliseconds"""
+    return (
+        f"{label:<28} n={len(samples_ms):<6} "
+        f"p50={percentile(samples_ms, 50):7.2f}ms "
+        f"p99={percentile(samples_ms, 99):7.2f}ms "
+        f"max={max(samples_ms, default=0):7.2f}ms "
+        f"mean={statistics.fmean(samples_ms) if samples_ms else 0:7.2f}ms"
+    )
+
+
+class Timer:
+    """Context manager measuring elapsed wall time in milliseconds"""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed_ms = (time.perf_counter() - self.start) * 1000
+
+
+def free_port() -> int:
+    """An unused local TCP port"""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until_ready(url: str, timeout: float = 30, poll: float = 0.1):
+    """Poll url until it answers 200"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(poll)
+    raise RuntimeError(f"{url} did not become ready")
@@ -0,0 +1,68 @@
+"""
+Alembic environment.
+
+Migrations run on a connection handed in by app.migrate (config attribute
+"connection"); when invoked through the plain alembic CLI a connection is
+opened on the application's async engine instead. Each migration runs in
+its own transaction so that autocommit blocks (CREATE INDEX CONCURRENTLY,
+batched backfills) only commit the work of their own script.
+"""
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.db.base import Base
+from app.db import models  # noqa: F401
+
+config = context.config
+target_metadata = Base.metadata
+
+
+def run_migrations_offline():
+    """Emit the migration SQL without connecting (--sql)"""
+    from app.db.session import DATABASE_URL
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        transaction_per_migration=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        transaction_per_migration=True,
+        # SQLite cannot ALTER most things in place; batch mode recreates the table
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations():
+    from app.db.session import engine
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+def run_migrations_online():
+    connection = config.attributes.get("connection")
+    if connection is None:
+        if config.config_file_name is not None:
+            fileConfig(config.config_file_name)
+        asyncio.run(run_async_migrations())
+    else:
+        do_run_migrations(connection)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,88 @@
+"""Baseline: the schema previously created by create_all
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-19 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "0001_baseline"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+GAME_MODES = ("PASSTHROUGH", "WALLS")
+# Shared by two tables: created once, explicitly, on PostgreSQL
+game_mode = sa.Enum(*GAME_MODES, name="gamemode").with_variant(
+    postgresql.ENUM(*GAME_MODES, name="gamemode", create_type=False), "postgresql"
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        postgresql.ENUM(*GAME_MODES, name="gamemode").create(bind, checkfirst=True)
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password_hash", sa.String(), nullable=False),
+        sa.Column("high_score", sa.Integer(), nullable=False),
+        sa.Column("games_played", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "leaderboard_entries",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("score", sa.Integer(), nullable=False),
+        sa.Column("mode", game_mode, nullable=False),
+        sa.Column("date", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id", "date"),
+        postgresql_partition_by="RANGE (date)",
+    )
+    op.create_index("ix_leaderboard_entries_username", "leaderboard_entries", ["username"])
+    op.create_index("ix_leaderboard_entries_score", "leaderboard_entries", ["score"])
+    op.create_index("ix_leaderboard_entries_mode", "leaderboard_entries", ["mode"])
+    op.create_index("ix_leaderboard_entries_date", "leaderboard_entries", ["date"])
+
+    op.create_table(
+        "active_games",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("score", sa.Integer(), nullable=False),
+        sa.Column("mode", game_mode, nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_active_games_username", "active_games", ["username"])
+
+    op.create_table(
+        "tokens",
+        sa.Column("token", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("token"),
+    )
+    op.create_index("ix_tokens_token", "tokens", ["token"])
+    op.create_index("ix_tokens_user_id", "tokens", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("tokens")
+    op.drop_table("active_games")
+    op.drop_table("leaderboard_entries")
+    op.drop_table("users")
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        postgresql.ENUM(*GAME_MODES, name="gamemode").drop(bind, checkfirst=True)
@@ -0,0 +1,32 @@
+"""Composite indexes for per-mode leaderboard reads and per-user token lookups
+
+Both are built online (CREATE INDEX CONCURRENTLY on PostgreSQL), so the
+migration can run while the previous release is serving traffic.
+
+Revision ID: 0002_performance_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-19 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa  # noqa: F401
+
+from app.db.migration_ops import create_index_online, drop_index_online
+
+revision: str = "0002_performance_indexes"
+down_revision: Union[str, None] = "0001_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Left behind by the schema fingerprint check that migrations replace
+    op.execute("DROP TABLE IF EXISTS schema_version")
+    create_index_online("ix_leaderboard_entries_mode_score", "leaderboard_entries", ["mode", "score"])
+    create_index_online("ix_tokens_user_id_created_at", "tokens", ["user_id", "created_at"])
+
+
+def downgrade() -> None:
+    drop_index_online("ix_tokens_user_id_created_at", "tokens")
+    drop_index_online("ix_leaderboard_entries_mode_score", "leaderboard_entries")
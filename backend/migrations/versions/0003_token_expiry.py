@@ -0,0 +1,43 @@
+"""Token expiry: tokens.expires_at, backfilled from created_at + TOKEN_TTL
+
+The column stays nullable: workers of the previous release keep inserting
+tokens without it during a rolling deploy, and the application treats NULL
+as created_at + TOKEN_TTL.
+
+Revision ID: 0003_token_expiry
+Revises: 0002_performance_indexes
+Create Date: 2026-10-19 00:00:00
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app import config
+from app.db.migration_ops import create_index_online, drop_index_online, backfill_in_batches
+
+revision: str = "0003_token_expiry"
+down_revision: Union[str, None] = "0002_performance_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("tokens", sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True))
+
+    if op.get_bind().dialect.name == "postgresql":
+        expires_sql = "expires_at = created_at + make_interval(secs => :ttl)"
+    else:
+        expires_sql = "expires_at = datetime(created_at, '+' || :ttl || ' seconds')"
+    backfill_in_batches(
+        "tokens", expires_sql, "expires_at IS NULL", key="token", params={"ttl": config.TOKEN_TTL}
+    )
+
+    # Used by the expired token sweeper
+    create_index_online("ix_tokens_expires_at", "tokens", ["expires_at"])
+
+
+def downgrade() -> None:
+    drop_index_online("ix_tokens_expires_at", "tokens")
+    with op.batch_alter_table("tokens") as batch_op:
+        batch_op.drop_column("expires_at")
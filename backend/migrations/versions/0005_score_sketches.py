@@ -0,0 +1,87 @@
+"""Persisted score distribution sketches, built from the existing leaderboard
+
+Revision ID: 0005_score_sketches
+Revises: 0004_rate_limit_buckets
+Create Date: 2026-10-19 00:00:00
+"""
+import json
+import math
+import os
+from datetime import datetime, timedelta, UTC
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "0005_score_sketches"
+down_revision: Union[str, None] = "0004_rate_limit_buckets"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copies of the sketch layout of this revision (app/sketches.py and
+# app/score_distribution.py), so later changes to the app do not alter it
+RELATIVE_ACCURACY = 0.01
+LOG_GAMMA = math.log((1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY))
+ALL_TIME = "all"
+
+
+def day_period(when: datetime) -> str:
+    return when.astimezone(UTC).strftime("%Y-%m-%d")
+
+
+def new_sketch() -> dict:
+    """QuantileSketch.to_dict() of an empty sketch"""
+    return {"relative_accuracy": RELATIVE_ACCURACY, "zero_count": 0, "bins": {}}
+
+
+def add_to_sketch(sketch: dict, score: int):
+    if score <= 0:
+        sketch["zero_count"] += 1
+        return
+    key = str(math.ceil(math.log(score) / LOG_GAMMA))
+    sketch["bins"][key] = sketch["bins"].get(key, 0) + 1
+
+
+def upgrade() -> None:
+    sketches = op.create_table(
+        "score_sketches",
+        sa.Column("mode", sa.String(), nullable=False),
+        sa.Column("period", sa.String(), nullable=False),
+        sa.Column("data", sa.Text(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("mode", "period"),
+    )
+
+    # One pass over the leaderboard, streamed with a server-side cursor on
+    # PostgreSQL; memory is bounded by the sketches, not the number of entries
+    now = datetime.now(UTC)
+    days = int(os.getenv("SCORE_SKETCH_DAYS") or 7)
+    oldest = day_period(now - timedelta(days=days - 1))
+    built = {}
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        bind = bind.execution_options(stream_results=True, yield_per=1000)
+    result = bind.execute(sa.text("SELECT mode, score, date FROM leaderboard_entries"))
+    for mode, score, date in result:
+        # Enum names are stored; the application uses the lowercase values
+        mode = mode.lower()
+        keys = [(mode, ALL_TIME)]
+        if isinstance(date, str):
+            date = datetime.fromisoformat(date)
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=UTC)
+        period = day_period(date)
+        if period >= oldest:
+            keys.append((mode, period))
+        for key in keys:
+            add_to_sketch(built.setdefault(key, new_sketch()), score)
+
+    if built:
+        op.bulk_insert(sketches, [
+            {"mode": mode, "period": period, "data": json.dumps(sketch), "updated_at": now}
+            for (mode, period), sketch in built.items()
+        ])
+
+
+def downgrade() -> None:
+    op.drop_table("score_sketches")
@@ -0,0 +1,81 @@
+"""Grid size per game: leaderboard and sketches partitioned by board size
+
+Existing games were all played on the classic 20x20 board, which is the
+column default. The leaderboard indexes gain grid_size as their leading
+column and are built online before the (mode, score) index is dropped.
+Score sketches are re-keyed by grid size, keeping their contents.
+
+Revision ID: 0006_grid_sizes
+Revises: 0005_score_sketches
+Create Date: 2026-10-19 00:00:00
+"""
+from datetime import datetime, UTC
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_ops import create_index_online, drop_index_online
+
+revision: str = "0006_grid_sizes"
+down_revision: Union[str, None] = "0005_score_sketches"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CLASSIC_GRID_SIZE = 20
+
+
+def _recreate_score_sketches(with_grid_size: bool):
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT mode, period, data FROM score_sketches")).all()
+    op.drop_table("score_sketches")
+
+    columns = [sa.Column("mode", sa.String(), nullable=False)]
+    key = ["mode"]
+    if with_grid_size:
+        columns.append(sa.Column("grid_size", sa.Integer(), nullable=False))
+        key.append("grid_size")
+    columns += [
+        sa.Column("period", sa.String(), nullable=False),
+        sa.Column("data", sa.Text(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint(*key, "period"),
+    ]
+    sketches = op.create_table("score_sketches", *columns)
+
+    if rows:
+        now = datetime.now(UTC)
+        extra = {"grid_size": CLASSIC_GRID_SIZE} if with_grid_size else {}
+        op.bulk_insert(sketches, [
+            {"mode": row.mode, "period": row.period, "data": row.data, "updated_at": now, **extra}
+            for row in rows
+        ])
+
+
+def upgrade() -> None:
+    # A constant default: no table rewrite on PostgreSQL 11+
+    for table in ("leaderboard_entries", "active_games"):
+        op.add_column(table, sa.Column(
+            "grid_size", sa.Integer(), nullable=False, server_default=str(CLASSIC_GRID_SIZE)
+        ))
+    _recreate_score_sketches(with_grid_size=True)
+
+    create_index_online(
+        "ix_leaderboard_entries_grid_size_mode_score", "leaderboard_entries", ["grid_size", "mode", "score"]
+    )
+    create_index_online("ix_leaderboard_entries_grid_size_score", "leaderboard_entries", ["grid_size", "score"])
+    drop_index_online("ix_leaderboard_entries_mode_score", "leaderboard_entries")
+
+
+def downgrade() -> None:
+    create_index_online("ix_leaderboard_entries_mode_score", "leaderboard_entries", ["mode", "score"])
+    drop_index_online("ix_leaderboard_entries_grid_size_score", "leaderboard_entries")
+    drop_index_online("ix_leaderboard_entries_grid_size_mode_score", "leaderboard_entries")
+
+    # Only the classic board's sketches and games fit the old schema
+    op.execute(f"DELETE FROM score_sketches WHERE grid_size != {CLASSIC_GRID_SIZE}")
+    _recreate_score_sketches(with_grid_size=False)
+    for table in ("active_games", "leaderboard_entries"):
+        op.execute(f"DELETE FROM {table} WHERE grid_size != {CLASSIC_GRID_SIZE}")
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("grid_size")
@@ -0,0 +1,81 @@
+"""Convert a plain leaderboard_entries table to the monthly partitioned layout
+
+Databases created with create_all before partitioning kept a plain table
+when they were adopted at the baseline. On PostgreSQL this builds the
+partitioned table next to it, with a partition for every month that has
+rows (so no history lands in the DEFAULT partition), copies the rows over
+and swaps the names. Writes to the leaderboard wait for the copy, so run
+this in a quiet period on large tables. Already partitioned tables and
+SQLite are left alone.
+
+Revision ID: 0007_partition_leaderboard
+Revises: 0006_grid_sizes
+Create Date: 2026-10-19 00:00:00
+"""
+from datetime import datetime, UTC
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app import config
+from app.db.partitions import DEFAULT_PARTITION, add_months, month_start, partition_name
+
+revision: str = "0007_partition_leaderboard"
+down_revision: Union[str, None] = "0006_grid_sizes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = "leaderboard_entries"
+NEW_TABLE = f"{TABLE}_partitioned"
+COLUMNS = "id, username, score, mode, grid_size, date"
+INDEXES = {
+    "ix_leaderboard_entries_username": ["username"],
+    "ix_leaderboard_entries_score": ["score"],
+    "ix_leaderboard_entries_mode": ["mode"],
+    "ix_leaderboard_entries_date": ["date"],
+    "ix_leaderboard_entries_grid_size_mode_score": ["grid_size", "mode", "score"],
+    "ix_leaderboard_entries_grid_size_score": ["grid_size", "score"],
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    relkind = bind.execute(
+        sa.text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"), {"name": TABLE}
+    ).scalar()
+    if relkind != "r":
+        return
+
+    op.execute(f"LOCK TABLE {TABLE} IN SHARE MODE")
+    op.execute(
+        f"CREATE TABLE {NEW_TABLE} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (date)"
+    )
+    op.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {NEW_TABLE} DEFAULT")
+    now = month_start(datetime.now(UTC))
+    oldest = bind.execute(sa.text(f"SELECT min(date) FROM {TABLE}")).scalar()
+    lower = month_start(oldest) if oldest is not None and oldest < now else now
+    last = add_months(now, config.LEADERBOARD_PARTITIONS_AHEAD)
+    while lower <= last:
+        upper = add_months(lower, 1)
+        op.execute(
+            f"CREATE TABLE {partition_name(lower)} PARTITION OF {NEW_TABLE} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        lower = upper
+
+    op.execute(f"INSERT INTO {NEW_TABLE} ({COLUMNS}) SELECT {COLUMNS} FROM {TABLE}")
+    op.drop_table(TABLE)
+    op.rename_table(NEW_TABLE, TABLE)
+    op.create_primary_key(f"{TABLE}_pkey", TABLE, ["id", "date"])
+    # Built inside this transaction: the table is new and not yet visible
+    for name, columns in INDEXES.items():
+        op.create_index(name, TABLE, columns)
+
+
+def downgrade() -> None:
+    # The partitioned layout is what 0001_baseline creates, so it is kept
+    pass
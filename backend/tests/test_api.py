@@ -9,6 +9,9 @@ from app.main import app
 from app.db.base import Base
 from app.db.models import UserModel, LeaderboardEntryModel, ActiveGameModel
 from app import database
+from app.cache import clear_all_caches
+from app.ratelimit import rate_limiter
+from app.score_distribution import score_distribution
 
 from sqlalchemy.pool import StaticPool
 from app.db import session as db_session_module
@@ -42,6 +45,9 @@ async def cleanup_engine():
 @pytest_asyncio.fixture
 async def db_session():
     """Create a fresh database for each test"""
+    clear_all_caches()
+    rate_limiter.reset()
+    score_distribution.reset()
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from app.bots import BotPlayer, hamiltonian_cycle, neighbour_table
+
+
+@pytest.mark.parametrize("grid_size,mode", [(6, "walls"), (20, "walls"), (5, "passthrough"), (20, "passthrough")])
+def test_hamiltonian_cycle_visits_every_cell(grid_size, mode):
+    cycle = hamiltonian_cycle(grid_size, mode)
+    neighbours = neighbour_table(grid_size, mode)
+    cell, seen = 0, set()
+    for _ in range(grid_size * grid_size):
+        seen.add(cell)
+        assert cycle[cell] in {nxt for _, nxt in neighbours[cell]}
+        cell = cycle[cell]
+    assert cell == 0
+    assert len(seen) == grid_size * grid_size
+
+
+def test_no_cycle_on_odd_walled_grid():
+    assert hamiltonian_cycle(5, "walls") is None
+
+
+def test_bot_takes_a_shortest_path_searching_once(monkeypatch):
+    bot = BotPlayer("walls", 20, random.Random(0))
+    bot.game.food = (14, 6)
+    searches = []
+    find_path = bot.find_path
+    monkeypatch.setattr(bot, "find_path", lambda start, goal: searches.append(goal) or find_path(start, goal))
+
+    moves = 0
+    while bot.game.score == 0:
+        assert bot.step() == "playing"
+        moves += 1
+    assert moves == 8
+    assert len(searches) == 1
+
+
+def test_bot_avoids_its_body_when_the_food_is_behind_it():
+    bot = BotPlayer("walls", 20, random.Random(0))
+    bot.game.food = (7, 10)
+    for _ in range(10):
+        assert bot.step() == "playing"
+    assert bot.game.score == 10
+
+
+def test_bot_follows_the_cycle_when_food_is_unreachable():
+    bot = BotPlayer("passthrough", 6, random.Random(0))
+    game = bot.game
+    # Wall the food off behind a ring of body segments the bot cannot reach
+    game.food = (0, 0)
+    for cell in ((1, 0), (0, 1), (5, 0), (0, 5)):
+        game.board.occupy(cell)
+    head = bot._cell(game.head)
+    direction = bot.decide()
+    assert bot._direction_to(head, bot.cycle[head]) == direction
@@ -0,0 +1,131 @@
+import asyncio
+import pytest
+
+from app import cache, config
+from app.cache import LocalCache, CacheBus, IpcCacheBus, SingleFlight, create_bus
+
+
+def test_local_cache_ttl_and_eviction(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    local = LocalCache("test", ttl=10, max_entries=2)
+
+    local.set("a", 1)
+    local.set("b", 2)
+    local.set("c", 3)
+    assert local.get("a") is None  # evicted, oldest first
+    assert local.get("b") == 2
+
+    now[0] += 11
+    assert local.get("b") is None
+    assert len(local) == 1  # "c" is only dropped when looked up
+
+
+def test_local_cache_skips_stale_set():
+    local = LocalCache("test", ttl=10)
+    generation = local.generation
+    local.discard("user-1")  # a write lands while the value is being loaded
+    local.set("user-1", "old", generation)
+    assert local.get("user-1") is None
+
+    local.set("user-1", "new", local.generation)
+    assert local.get("user-1") == "new"
+
+
+def test_local_cache_disabled(monkeypatch):
+    monkeypatch.setattr(config, "CACHE_ENABLED", False)
+    local = LocalCache("test", ttl=10)
+    local.set("a", 1)
+    assert local.get("a") is None
+
+
+def test_deliver_ignores_own_messages():
+    local = cache.register_cache(LocalCache("deliver-test", ttl=10))
+    bus = CacheBus()
+    local.set("k", "v")
+
+    bus.deliver(bus._encode("deliver-test", "k"))
+    assert local.get("k") == "v"
+
+    CacheBus().deliver(bus._encode("deliver-test", "k"))
+    assert local.get("k") is None
+
+
+@pytest.mark.asyncio
+async def test_ipc_bus_fans_out_invalidations(tmp_path):
+    local = cache.register_cache(LocalCache("ipc-test", ttl=10))
+    sender = IpcCacheBus(str(tmp_path))
+    receiver = IpcCacheBus(str(tmp_path))
+    await sender.start()
+    await receiver.start()
+    try:
+        # A socket left behind by a dead worker is cleaned up on publish
+        stale = tmp_path / "dead.sock"
+        stale.touch()
+
+        local.set("k", "v")
+        local.set("other", "v")
+        sender.publish("ipc-test", "k")
+        for _ in range(100):
+            if local.get("k") is None:
+                break
+            await asyncio.sleep(0.01)
+        assert local.get("k") is None
+        assert local.get("other") == "v"
+        assert not stale.exists()
+    finally:
+        await sender.stop()
+        await receiver.stop()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_create_bus_auto(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "CACHE_BUS_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "WEB_CONCURRENCY", 1)
+    assert create_bus("auto").kind == "local"
+    monkeypatch.setattr(config, "WEB_CONCURRENCY", 4)
+    assert create_bus("auto").kind == "ipc"
+    with pytest.raises(ValueError):
+        create_bus("postgres")  # tests run on SQLite
+
+
+@pytest.mark.asyncio
+async def test_single_flight_shares_one_call():
+    flight = SingleFlight("test")
+    calls = []
+    release = asyncio.Event()
+
+    async def load(value):
+        calls.append(value)
+        await release.wait()
+        return value
+
+    waiters = [asyncio.create_task(flight.do("k", lambda: load("first"))) for _ in range(5)]
+    other = asyncio.create_task(flight.do("other", lambda: load("other")))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == ["first"] * 5
+    assert await other == "other"
+    assert calls == ["first", "other"]
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_errors_and_cancellation():
+    flight = SingleFlight("test")
+    release = asyncio.Event()
+
+    async def fail():
+        await release.wait()
+        raise RuntimeError("boom")
+
+    first = asyncio.create_task(flight.do("k", fail))
+    second = asyncio.create_task(flight.do("k", fail))
+    await asyncio.sleep(0)
+    # A caller giving up does not cancel the call the others wait on
+    first.cancel()
+    release.set()
+    with pytest.raises(RuntimeError, match="boom"):
+        await second
+    assert first.cancelled()
@@ -0,0 +1,46 @@
+import pytest
+
+from app import compression
+from app.compression import CompressedBodyCache, choose_encoding, is_compressible
+
+
+def test_choose_encoding(monkeypatch):
+    monkeypatch.setattr(compression, "ENCODINGS", {"zstd": None, "br": None, "gzip": None})
+    assert choose_encoding("gzip, deflate, br, zstd") == "zstd"
+    assert choose_encoding("gzip, br;q=0.5") == "gzip"
+    assert choose_encoding("zstd;q=0, br") == "br"
+    assert choose_encoding("*") == "zstd"
+    assert choose_encoding("deflate") is None
+    assert choose_encoding(None) is None
+
+    # Optional codecs missing: only gzip is offered
+    monkeypatch.setattr(compression, "ENCODINGS", {"gzip": None})
+    assert choose_encoding("br, zstd") is None
+    assert choose_encoding("br, zstd, gzip;q=0.1") == "gzip"
+
+
+@pytest.mark.parametrize("content_type, expected", [
+    ("application/json", True),
+    ("text/plain; version=0.0.4", True),
+    ("application/problem+json", True),
+    ("application/x-ndjson", True),
+    ("image/png", False),
+    ("application/octet-stream", False),
+    (None, False),
+])
+def test_is_compressible(content_type, expected):
+    assert is_compressible(content_type) is expected
+
+
+def test_cache_evicts_least_recently_used():
+    cache = CompressedBodyCache(max_entries=2)
+    cache.set(("gzip", b"a"), b"A")
+    cache.set(("gzip", b"b"), b"B")
+    assert cache.get(("gzip", b"a")) == b"A"
+    cache.set(("gzip", b"c"), b"C")
+    assert cache.get(("gzip", b"b")) is None
+    assert len(cache) == 2
+
+    disabled = CompressedBodyCache(max_entries=0)
+    disabled.set(("gzip", b"a"), b"A")
+    assert len(disabled) == 0
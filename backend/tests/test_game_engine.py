@@ -0,0 +1,104 @@
+import random
+
+from app.game_engine import FreeCells, SnakeGame, INITIAL_SNAKE
+
+
+def test_free_cells_fill_and_release():
+    board = FreeCells(6, 4)
+    rng = random.Random(1)
+    placed = set()
+    while len(board):
+        cell = board.random_free(rng)
+        assert board.is_free(cell)
+        board.occupy(cell)
+        placed.add(cell)
+    assert len(placed) == 24
+    assert board.random_free(rng) is None
+
+    board.release((5, 3))
+    board.release((5, 3))
+    assert len(board) == 1
+    assert board.random_free(rng) == (5, 3)
+
+
+def test_free_cells_match_snake_while_playing():
+    game = SnakeGame("passthrough", rng=random.Random(7))
+    rng = random.Random(3)
+    for _ in range(2000):
+        if game.status != "playing":
+            game.reset()
+        game.set_direction(rng.choice(["UP", "DOWN", "LEFT", "RIGHT"]))
+        game.step()
+        occupied = {
+            (x, y) for x in range(game.grid_size) for y in range(game.grid_size) if not game.is_free((x, y))
+        }
+        assert occupied == set(game.snake)
+        assert game.food is None or game.food not in occupied
+
+
+def test_eating_grows_and_scores():
+    game = SnakeGame("walls", rng=random.Random(0))
+    game.food = (11, 10)
+    game.step()
+    assert game.score == 10
+    assert list(game.snake) == [(11, 10)] + INITIAL_SNAKE
+    assert game.food not in game.snake
+
+
+def test_walls_end_the_game_and_passthrough_wraps():
+    walls = SnakeGame("walls", rng=random.Random(0))
+    walls.food = (0, 0)
+    while walls.step() == "playing":
+        pass
+    assert walls.head == (19, 10)
+
+    wrap = SnakeGame("passthrough", rng=random.Random(0))
+    wrap.food = (0, 0)
+    for _ in range(10):
+        wrap.step()
+    assert wrap.head == (0, 10)
+    assert wrap.status == "playing"
+
+
+def test_reversing_is_ignored_and_self_collision_ends():
+    game = SnakeGame("walls", rng=random.Random(0))
+    game.food = (0, 0)
+    game.set_direction("LEFT")
+    assert game.direction == "RIGHT"
+
+    # Grow to five segments, then turn back into the body
+    game.food = (11, 10)
+    game.step()
+    game.food = (12, 10)
+    game.step()
+    game.food = (0, 0)
+    for direction in ("DOWN", "LEFT", "UP"):
+        game.set_direction(direction)
+        game.step()
+    assert game.status == "gameover"
+
+
+def test_full_board_ends_the_game():
+    game = SnakeGame("walls", rng=random.Random(0))
+    game.food = (11, 10)
+    # Everything but the food is taken
+    for x in range(game.grid_size):
+        for y in range(game.grid_size):
+            if (x, y) != game.food:
+                game.board.occupy((x, y))
+
+    assert game.step() == "gameover"
+    assert game.score == 10
+    assert game.food is None
+
+
+def test_occupancy_bitset_on_arena_board():
+    game = SnakeGame("passthrough", grid_size=200, rng=random.Random(5))
+    assert game.head == (100, 100)
+    bits = game.board.occupancy()
+    assert len(bits) == 200 * 200 // 8
+    occupied = {
+        (index % 200, index // 200) for index in range(200 * 200) if bits[index >> 3] & (1 << (index & 7))
+    }
+    assert occupied == set(game.snake)
+    assert len(game.board) == 200 * 200 - 3
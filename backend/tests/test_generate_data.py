@@ -0,0 +1,124 @@
+import json
+import pytest
+import pytest_asyncio
+from datetime import datetime, UTC
+from sqlalchemy import insert, select, func
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models import GRID_SIZES
+from app.db.models import UserModel, LeaderboardEntryModel, ActiveGameModel, TokenModel, ScoreSketchModel
+from app.sketches import QuantileSketch
+from app.generate_data import SyntheticDataGenerator, generate, copy_records, TABLES, MAX_SCORE
+
+ANCHOR = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+def test_generator_is_deterministic():
+    first = list(SyntheticDataGenerator(seed=7, anchor=ANCHOR).users(50, 5, 1, 20))
+    second = list(SyntheticDataGenerator(seed=7, anchor=ANCHOR).users(50, 5, 1, 20))
+    other = list(SyntheticDataGenerator(seed=8, anchor=ANCHOR).users(50, 5, 1, 20))
+
+    assert first == second
+    assert first != other
+    assert [len(batch["users"]) for batch in first] == [20, 20, 10]
+
+
+def test_scores_follow_mode_distributions():
+    generator = SyntheticDataGenerator(seed=1, anchor=ANCHOR)
+    walls = sorted(generator.score("walls") for _ in range(2000))
+    passthrough = sorted(generator.score("passthrough") for _ in range(2000))
+
+    assert all(s % 10 == 0 and 0 <= s <= MAX_SCORE for s in walls + passthrough)
+    # Pass-through games last longer, so the median score is higher
+    assert walls[1000] < passthrough[1000]
+
+
+def test_copy_records_match_table_columns():
+    generator = SyntheticDataGenerator(seed=2, anchor=ANCHOR)
+    batch = next(generator.users(20, 5, 1, 20))
+    batch["active_games"] = next(generator.active_games(5, 20, 5))
+
+    for name, rows in batch.items():
+        columns, records = copy_records(rows)
+        assert set(columns) <= {c.name for c in TABLES[name].columns}
+        # Every non-nullable column without a server default is filled in
+        required = {c.name for c in TABLES[name].columns if not c.nullable and c.server_default is None}
+        assert required <= set(columns)
+        assert all(len(record) == len(columns) for record in records)
+        if "mode" in columns:
+            modes = {record[columns.index("mode")] for record in records}
+            assert modes <= {"WALLS", "PASSTHROUGH"}
+            assert "grid_size" in columns
+
+
+@pytest.mark.asyncio
+async def test_generate_inserts_consistent_rows(engine):
+    counts = await generate(
+        engine, users=120, scores_per_user=4, tokens_per_user=2,
+        active_games=15, batch_size=50, seed=3, anchor=ANCHOR,
+    )
+
+    async with engine.connect() as conn:
+        async def count(model):
+            return (await conn.execute(select(func.count()).select_from(model))).scalar()
+
+        assert await count(UserModel) == counts["users"] == 120
+        assert await count(TokenModel) == counts["tokens"] == 240
+        assert await count(ActiveGameModel) == counts["active_games"] == 15
+        assert await count(LeaderboardEntryModel) == counts["leaderboard"]
+
+        # User stats agree with the generated leaderboard history
+        games = await conn.execute(select(func.sum(UserModel.games_played)))
+        assert games.scalar() == counts["leaderboard"]
+        best = await conn.execute(
+            select(UserModel.high_score, func.max(LeaderboardEntryModel.score))
+            .join(LeaderboardEntryModel, LeaderboardEntryModel.username == UserModel.username)
+            .group_by(UserModel.id)
+        )
+        assert all(high == top for high, top in best)
+
+        sizes = await conn.execute(select(LeaderboardEntryModel.grid_size).distinct())
+        assert set(sizes.scalars()) <= set(GRID_SIZES)
+
+
+@pytest.mark.asyncio
+async def test_generate_fills_score_sketches(engine):
+    # Generated scores are added to the sketches already recorded
+    recorded = QuantileSketch(0.01)
+    recorded.add(500)
+    async with engine.begin() as conn:
+        await conn.execute(insert(ScoreSketchModel).values(
+            mode="walls", grid_size=20, period="all", data=json.dumps(recorded.to_dict()), updated_at=ANCHOR,
+        ))
+    await generate(engine, users=60, scores_per_user=4, active_games=0, batch_size=25, seed=4, anchor=ANCHOR)
+
+    async with engine.connect() as conn:
+        games = await conn.execute(
+            select(LeaderboardEntryModel.mode, LeaderboardEntryModel.grid_size, func.count())
+            .group_by(LeaderboardEntryModel.mode, LeaderboardEntryModel.grid_size)
+        )
+        sketches = await conn.execute(
+            select(ScoreSketchModel.mode, ScoreSketchModel.grid_size, ScoreSketchModel.data)
+            .where(ScoreSketchModel.period == "all")
+        )
+        sketch_counts = {
+            (mode, grid_size): QuantileSketch.from_dict(json.loads(data)).count for mode, grid_size, data in sketches
+        }
+        expected = {(mode.value, grid_size): count for mode, grid_size, count in games}
+        expected[("walls", 20)] += 1
+        assert sketch_counts == expected
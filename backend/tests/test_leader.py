@@ -0,0 +1,47 @@
+import pytest
+
+from app.leader import FileLeaderLock, MaintenanceLeader
+
+
+class Service:
+    def __init__(self):
+        self.running = False
+
+    def start(self):
+        self.running = True
+
+    async def stop(self):
+        self.running = False
+
+
+@pytest.mark.asyncio
+async def test_file_lock_is_exclusive(tmp_path):
+    path = str(tmp_path / "maintenance.lock")
+    first, second = FileLeaderLock(path), FileLeaderLock(path)
+
+    assert await first.try_acquire()
+    assert not await second.try_acquire()
+    await first.release()
+    assert await second.try_acquire()
+    await second.release()
+
+
+@pytest.mark.asyncio
+async def test_only_the_leader_runs_services_and_a_follower_takes_over(tmp_path):
+    path = str(tmp_path / "maintenance.lock")
+    first_service, second_service = Service(), Service()
+    first = MaintenanceLeader([first_service], FileLeaderLock(path), interval=60)
+    second = MaintenanceLeader([second_service], FileLeaderLock(path), interval=60)
+
+    for leader in (first, second):
+        await leader.run_once()
+    assert first.is_leader and first_service.running
+    assert not second.is_leader and not second_service.running
+
+    await first.stop()
+    assert not first_service.running
+    await second.run_once()
+    assert second.is_leader and second_service.running
+
+    await second.stop()
+    assert not second_service.running
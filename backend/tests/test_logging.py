@@ -0,0 +1,46 @@
+import json
+import logging
+import pytest
+from httpx import AsyncClient, ASGITransport
+
+from app import config
+from app.main import app
+from app.logging_config import JsonFormatter, should_log_request
+
+
+def test_json_formatter_includes_extra_fields():
+    record = logging.LogRecord("snake-game", logging.INFO, __file__, 1, "request", (), None)
+    record.status = 200
+    record.duration_ms = 1.5
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["msg"] == "request"
+    assert entry["level"] == "INFO"
+    assert entry["status"] == 200
+    assert entry["duration_ms"] == 1.5
+    assert "ts" in entry
+
+
+def test_should_log_request():
+    assert should_log_request(500, 1, sample_rate=0, slow_ms=100) == "error"
+    assert should_log_request(404, 1, sample_rate=0, slow_ms=100) == "error"
+    assert should_log_request(200, 150, sample_rate=0, slow_ms=100) == "slow"
+    assert should_log_request(200, 1, sample_rate=0, slow_ms=100) is None
+    assert should_log_request(200, 1, sample_rate=1, slow_ms=100) == "sampled"
+
+
+@pytest.mark.asyncio
+async def test_middleware_samples_successes_but_logs_errors(monkeypatch, caplog):
+    monkeypatch.setattr(config, "LOG_SAMPLE_RATE", 0.0)
+    caplog.set_level(logging.INFO, logger="snake-game")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.get("/api/health")
+        await client.get("/api/auth/me")
+
+    records = [r for r in caplog.records if r.getMessage() == "request"]
+    assert len(records) == 1
+    assert records[0].status == 401
+    assert records[0].route == "/api/auth/me"
+    assert records[0].reason == "error"
@@ -0,0 +1,63 @@
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from app import config
+from app.main import app
+from app.metrics import Counter, Histogram, Registry, record_cache, REGISTRY, http_requests_total
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.register(Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0)))
+    histogram.observe(0.05, "/a")
+    histogram.observe(0.5, "/a")
+    histogram.observe(5, "/a")
+
+    text = registry.render()
+
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+
+
+def test_counter_escapes_label_values():
+    registry = Registry()
+    counter = registry.register(Counter("things_total", "Things", ("name",)))
+    counter.inc('a "quoted"\nname')
+
+    assert 'things_total{name="a \\"quoted\\"\\nname"} 1' in registry.render()
+
+
+def test_failed_statement_does_not_leave_a_start_time(monkeypatch):
+    monkeypatch.setattr(config, "METRICS_ENABLED", True)
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info["_query_start"] == []
+    engine.dispose()
+
+
+def test_cache_hit_ratio():
+    record_cache("test-cache", hit=True)
+    record_cache("test-cache", hit=True)
+    record_cache("test-cache", hit=False)
+    record_cache("test-cache", hit=True)
+
+    assert 'cache_hit_ratio{cache="test-cache"} 0.75' in REGISTRY.render()
+
+
+@pytest.mark.asyncio
+async def test_metrics_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(config, "METRICS_ENABLED", False)
+    before = http_requests_total.get("GET", "/api", "200")
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        await client.get("/api")
+
+    assert http_requests_total.get("GET", "/api", "200") == before
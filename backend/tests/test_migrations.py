@@ -0,0 +1,221 @@
+import json
+import os
+from datetime import datetime, timedelta, UTC
+
+import pytest
+from unittest.mock import patch
+from alembic.autogenerate import compare_metadata
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app import config, migrate
+from app.db import session as db_session_module
+from app.db.base import Base
+from app.db.migration_ops import backfill_in_batches
+from app.sketches import QuantileSketch
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    with patch.object(db_session_module, "engine", engine):
+        yield engine
+    await engine.dispose()
+
+
+async def _schema_diff(engine):
+    async with engine.connect() as conn:
+        return await conn.run_sync(
+            lambda sync_conn: compare_metadata(MigrationContext.configure(sync_conn), Base.metadata)
+        )
+
+
+async def _indexes(engine, table):
+    async with engine.connect() as conn:
+        indexes = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_indexes(table))
+    return {index["name"] for index in indexes}
+
+
+def test_schema_revision_is_head():
+    assert db_session_module.SCHEMA_REVISION == migrate.head_revision()
+
+
+@pytest.mark.asyncio
+async def test_migrations_match_models(engine):
+    assert await db_session_module.init_db() is True
+
+    assert await migrate.current(engine) == db_session_module.SCHEMA_REVISION
+    assert await _schema_diff(engine) == []
+    # Second boot only reads alembic_version
+    assert await db_session_module.init_db() is False
+
+
+@pytest.mark.asyncio
+async def test_downgrade_and_upgrade_again(engine):
+    await migrate.upgrade(engine)
+    await migrate.downgrade(engine, migrate.BASELINE_REVISION)
+    assert "ix_tokens_user_id_created_at" not in await _indexes(engine, "tokens")
+
+    await migrate.downgrade(engine, "base")
+    async with engine.connect() as conn:
+        tables = await conn.run_sync(lambda sync_conn: inspect(sync_conn).get_table_names())
+    assert "users" not in tables
+
+    await migrate.upgrade(engine)
+    assert await _schema_diff(engine) == []
+
+
+@pytest.mark.asyncio
+async def test_create_all_database_is_adopted_at_head(engine):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    assert await db_session_module.init_db() is True
+    assert await migrate.current(engine) == db_session_module.SCHEMA_REVISION
+
+
+@pytest.mark.asyncio
+async def test_baseline_database_is_upgraded(engine):
+    """A database created before migrations gets the later ones applied on boot"""
+    await migrate.upgrade(engine, migrate.BASELINE_REVISION)
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP TABLE alembic_version"))
+        await conn.execute(text("CREATE TABLE schema_version (id INTEGER PRIMARY KEY, fingerprint VARCHAR)"))
+        await conn.execute(text(
+            "INSERT INTO tokens (token, user_id, created_at) VALUES ('t1', 'u1', '2026-01-01 00:00:00.000000')"
+        ))
+
+    assert await db_session_module.init_db() is True
+
+    async with engine.connect() as conn:
+        expires_at = (await conn.execute(text("SELECT expires_at FROM tokens"))).scalar()
+    # Backfilled from created_at + TOKEN_TTL
+    assert expires_at == (datetime(2026, 1, 1) + timedelta(seconds=config.TOKEN_TTL)).strftime("%Y-%m-%d %H:%M:%S")
+
+    assert "ix_leaderboard_entries_grid_size_mode_score" in await _indexes(engine, "leaderboard_entries")
+    assert "ix_tokens_user_id_created_at" in await _indexes(engine, "tokens")
+    assert await _schema_diff(engine) == []
+
+
+@pytest.mark.asyncio
+async def test_score_sketches_built_from_leaderboard(engine):
+    await migrate.upgrade(engine, "0004_rate_limit_buckets")
+    today = datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S.%f")
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "INSERT INTO leaderboard_entries (id, username, score, mode, date) VALUES "
+            f"('e1', 'a', 10, 'WALLS', '{today}'), ('e2', 'b', 20, 'WALLS', '{today}'), "
+            "('e3', 'c', 30, 'WALLS', '2020-01-01 00:00:00.000000'), "
+            f"('e4', 'd', 40, 'PASSTHROUGH', '{today}')"
+        ))
+
+    await migrate.upgrade(engine)
+
+    async with engine.connect() as conn:
+        rows = (await conn.execute(text("SELECT mode, period, data FROM score_sketches"))).all()
+    sketches = {(mode, period): QuantileSketch.from_dict(json.loads(data)) for mode, period, data in rows}
+    assert len(sketches[("walls", "all")]) == 3
+    # The migration's frozen bucketing agrees with QuantileSketch
+    expected = QuantileSketch(sketches[("walls", "all")].relative_accuracy)
+    for score in (10, 20, 30):
+        expected.add(score)
+    assert sketches[("walls", "all")].to_dict() == expected.to_dict()
+    assert len(sketches[("walls", today[:10])]) == 2
+    assert len(sketches[("passthrough", "all")]) == 1
+    # Days outside SCORE_SKETCH_DAYS only count towards all time
+    assert ("walls", "2020-01-01") not in sketches
+
+
+@pytest.mark.asyncio
+async def test_pending_migrations_refused_when_disabled(engine, monkeypatch):
+    monkeypatch.setattr(config, "DB_MIGRATE_ON_STARTUP", False)
+    with pytest.raises(RuntimeError, match="app.migrate upgrade"):
+        await db_session_module.init_db()
+
+
+@pytest.mark.asyncio
+async def test_backfill_in_batches(engine):
+    await migrate.upgrade(engine)
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "INSERT INTO users (id, username, email, password_hash, high_score, games_played, created_at) "
+            "VALUES " + ", ".join(
+                f"('u{i}', 'user{i}', 'user{i}@example.com', 'x', {i}, -1, '2026-01-01')" for i in range(25)
+            )
+        ))
+
+    def backfill(sync_conn):
+        with Operations.context(MigrationContext.configure(sync_conn)):
+            return backfill_in_batches("users", "games_played = 0", "games_played < 0", batch_size=10)
+
+    async with engine.connect() as conn:
+        assert await conn.run_sync(backfill) == 25
+        remaining = (await conn.execute(text("SELECT COUNT(*) FROM users WHERE games_played < 0"))).scalar()
+    assert remaining == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set")
+async def test_postgres_online_indexes():
+    """Partitioned leaderboard: the composite index is valid and on every partition"""
+    engine = create_async_engine(os.environ["TEST_POSTGRES_URL"])
+    try:
+        await migrate.downgrade(engine, "base")
+        await migrate.upgrade(engine)
+        async with engine.connect() as conn:
+            valid = (await conn.execute(text(
+                "SELECT indisvalid FROM pg_index WHERE indexrelid = 'ix_leaderboard_entries_grid_size_mode_score'::regclass"
+            ))).scalar()
+            partitions = (await conn.execute(text(
+                "SELECT COUNT(*) FROM pg_inherits WHERE inhparent = 'leaderboard_entries'::regclass"
+            ))).scalar()
+            attached = (await conn.execute(text(
+                "SELECT COUNT(*) FROM pg_inherits WHERE inhparent = 'ix_leaderboard_entries_grid_size_mode_score'::regclass"
+            ))).scalar()
+        assert valid is True
+        assert attached == partitions > 0
+        assert await _schema_diff(engine) == []
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set")
+async def test_postgres_plain_leaderboard_is_partitioned():
+    """A leaderboard table created before partitioning is converted, keeping its rows"""
+    engine = create_async_engine(os.environ["TEST_POSTGRES_URL"])
+    try:
+        await migrate.downgrade(engine, "base")
+        await migrate.upgrade(engine, "0006_grid_sizes")
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                "CREATE TABLE plain (LIKE leaderboard_entries INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            ))
+            await conn.execute(text("DROP TABLE leaderboard_entries"))
+            await conn.execute(text("ALTER TABLE plain RENAME TO leaderboard_entries"))
+            await conn.execute(text("ALTER TABLE leaderboard_entries ADD PRIMARY KEY (id, date)"))
+            await conn.execute(text(
+                "INSERT INTO leaderboard_entries (id, username, score, mode, date) VALUES "
+                "('a', 'u', 10, 'WALLS', '2024-01-05'), ('b', 'u', 20, 'WALLS', '2024-03-05')"
+            ))
+
+        await migrate.upgrade(engine)
+        async with engine.connect() as conn:
+            relkind = (await conn.execute(text(
+                "SELECT relkind FROM pg_class WHERE oid = 'leaderboard_entries'::regclass"
+            ))).scalar()
+            count = (await conn.execute(text("SELECT COUNT(*) FROM leaderboard_entries"))).scalar()
+            in_default = (await conn.execute(text("SELECT COUNT(*) FROM leaderboard_entries_default"))).scalar()
+        assert relkind == "p"
+        assert count == 2
+        assert in_default == 0
+        assert await _schema_diff(engine) == []
+    finally:
+        await engine.dispose()
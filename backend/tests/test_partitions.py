@@ -0,0 +1,142 @@
+import gzip
+import json
+import pytest
+import pytest_asyncio
+from datetime import datetime, UTC
+from sqlalchemy import event, select, func, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.models import LeaderboardEntryModel
+from app.db.partitions import archive_before, add_months, month_start, partition_name
+from app.archiver import LeaderboardArchiver
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+async def _insert(engine, rows):
+    async with engine.begin() as conn:
+        await conn.execute(LeaderboardEntryModel.__table__.insert(), rows)
+
+
+def _entry(id, date, score=10):
+    return {"id": id, "username": f"user-{id}", "score": score, "mode": "walls", "date": date}
+
+
+def test_month_helpers():
+    start = month_start(datetime(2024, 12, 28, 13, 5, tzinfo=UTC))
+    assert start == datetime(2024, 12, 1, tzinfo=UTC)
+    assert add_months(start, 1) == datetime(2025, 1, 1, tzinfo=UTC)
+    assert add_months(start, -12) == datetime(2023, 12, 1, tzinfo=UTC)
+    assert partition_name(start) == "leaderboard_entries_y2024m12"
+
+
+@pytest.mark.asyncio
+async def test_archive_rotates_sqlite_table(engine, tmp_path):
+    await _insert(engine, [
+        _entry("old-1", datetime(2024, 1, 5, tzinfo=UTC)),
+        _entry("old-2", datetime(2024, 1, 20, tzinfo=UTC)),
+        _entry("old-3", datetime(2024, 2, 3, tzinfo=UTC)),
+        _entry("new-1", datetime(2024, 3, 1, tzinfo=UTC)),
+        _entry("new-2", datetime(2024, 3, 15, tzinfo=UTC)),
+    ])
+
+    written = await archive_before(engine, datetime(2024, 3, 1, tzinfo=UTC), str(tmp_path), chunk_size=2)
+
+    assert sorted(p.rsplit("/", 1)[-1] for p in written) == [
+        "leaderboard_entries_2024_01.ndjson.gz",
+        "leaderboard_entries_2024_02.ndjson.gz",
+    ]
+    with gzip.open(tmp_path / "leaderboard_entries_2024_01.ndjson.gz", "rt") as f:
+        january = [json.loads(line) for line in f]
+    assert [row["id"] for row in january] == ["old-1", "old-2"]
+    assert january[0]["mode"] == "walls"
+    assert january[0]["grid_size"] == 20
+
+    async with engine.connect() as conn:
+        remaining = (await conn.execute(select(LeaderboardEntryModel.id).order_by(LeaderboardEntryModel.id))).scalars().all()
+        leftovers = (await conn.execute(text(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'table' AND name LIKE 'leaderboard_entries_rotated_%'"
+        ))).scalar()
+        indexes = (await conn.execute(text(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = 'leaderboard_entries' AND name LIKE 'ix_%'"
+        ))).scalar()
+    assert remaining == ["new-1", "new-2"]
+    assert leftovers == 0
+    assert indexes == len(LeaderboardEntryModel.__table__.indexes)
+
+
+@pytest.mark.asyncio
+async def test_interrupted_archive_is_not_duplicated(engine, tmp_path):
+    """A run stopped between archiving and dropping a rotated table is redone, not repeated"""
+    await _insert(engine, [_entry("done", datetime(2024, 1, 2, tzinfo=UTC))])
+    await archive_before(engine, datetime(2024, 2, 1, tzinfo=UTC), str(tmp_path))
+    await _insert(engine, [
+        _entry("old-1", datetime(2024, 1, 5, tzinfo=UTC)),
+        _entry("old-2", datetime(2024, 2, 3, tzinfo=UTC)),
+        _entry("new-1", datetime(2024, 3, 1, tzinfo=UTC)),
+    ])
+
+    def interrupt(conn, cursor, statement, *args):
+        if statement.startswith("DROP TABLE leaderboard_entries_rotated_"):
+            raise RuntimeError("interrupted")
+    event.listen(engine.sync_engine, "before_cursor_execute", interrupt)
+    try:
+        with pytest.raises(Exception):
+            await archive_before(engine, datetime(2024, 3, 1, tzinfo=UTC), str(tmp_path))
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", interrupt)
+
+    await archive_before(engine, datetime(2024, 3, 1, tzinfo=UTC), str(tmp_path))
+
+    archived = []
+    for month in ("01", "02"):
+        with gzip.open(tmp_path / f"leaderboard_entries_2024_{month}.ndjson.gz", "rt") as f:
+            archived += [json.loads(line)["id"] for line in f]
+    assert archived == ["done", "old-1", "old-2"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "leaderboard_entries_2024_01.ndjson.gz", "leaderboard_entries_2024_02.ndjson.gz",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_archive_without_stale_rows_is_noop(engine, tmp_path):
+    await _insert(engine, [_entry("new-1", datetime(2024, 3, 2, tzinfo=UTC))])
+
+    written = await archive_before(engine, datetime(2024, 3, 1, tzinfo=UTC), str(tmp_path))
+
+    assert written == []
+    async with engine.connect() as conn:
+        count = (await conn.execute(select(func.count()).select_from(LeaderboardEntryModel))).scalar()
+    assert count == 1
+
+
+@pytest.mark.asyncio
+async def test_archiver_respects_retention(engine, tmp_path):
+    await _insert(engine, [
+        _entry("a", datetime(2024, 4, 30, tzinfo=UTC)),
+        _entry("b", datetime(2024, 5, 1, tzinfo=UTC)),
+    ])
+    archiver = LeaderboardArchiver(engine, retention_months=1, archive_dir=str(tmp_path))
+
+    written = await archiver.run_once(now=datetime(2024, 6, 10, tzinfo=UTC))
+
+    assert len(written) == 1
+    async with engine.connect() as conn:
+        remaining = (await conn.execute(select(LeaderboardEntryModel.id))).scalars().all()
+    assert remaining == ["b"]
+
+    disabled = LeaderboardArchiver(engine, retention_months=0, archive_dir=str(tmp_path))
+    assert await disabled.run_once(now=datetime(2030, 1, 1, tzinfo=UTC)) == []
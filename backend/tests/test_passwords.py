@@ -0,0 +1,68 @@
+import asyncio
+import hashlib
+import pytest
+
+from app.passwords import PasswordHasher
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(log_n=10, workers=2, concurrency=2)
+    yield hasher
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify(hasher):
+    stored = await hasher.hash("password123")
+
+    assert stored.startswith("scrypt$10$8$1$")
+    assert await hasher.verify("password123", stored)
+    assert not await hasher.verify("wrongpassword", stored)
+    # Salted: the same password hashes differently each time
+    assert stored != await hasher.hash("password123")
+
+
+@pytest.mark.asyncio
+async def test_legacy_sha256_hashes_verify_and_need_rehash(hasher):
+    legacy = hashlib.sha256("password123".encode()).hexdigest()
+
+    assert await hasher.verify("password123", legacy)
+    assert not await hasher.verify("nope", legacy)
+    assert hasher.needs_rehash(legacy)
+
+
+def test_needs_rehash_on_cost_change(hasher):
+    stored = hasher.hash_sync("password123")
+    stronger = PasswordHasher(log_n=11, workers=0)
+
+    assert not hasher.needs_rehash(stored)
+    assert stronger.needs_rehash(stored)
+    # The cost is stored with the hash, so older hashes still verify
+    assert stronger.verify_sync("password123", stored)
+
+
+def test_malformed_hash_is_rejected(hasher):
+    assert not hasher.verify_sync("password123", "scrypt$broken")
+    assert not hasher.verify_sync("password123", "bcrypt$1$2$3$4$5")
+
+
+@pytest.mark.asyncio
+async def test_hashing_does_not_block_event_loop():
+    hasher = PasswordHasher(log_n=14, workers=2, concurrency=2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.001)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    try:
+        await asyncio.gather(*(hasher.hash("password123") for _ in range(4)))
+    finally:
+        task.cancel()
+        hasher.shutdown()
+    # The loop kept running while four KDF runs were in progress
+    assert ticks > 5
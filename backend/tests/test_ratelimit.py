@@ -0,0 +1,84 @@
+import pytest
+from unittest.mock import patch
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import StaticPool
+
+from app import config, database
+from app.db.base import Base
+from app.db.models import RateLimitBucketModel
+from app.ratelimit import MemoryBuckets, DatabaseBuckets, RateLimiter
+
+
+@pytest.fixture
+async def session_factory():
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    with patch.object(database, "AsyncSessionLocal", factory):
+        yield factory
+    await engine.dispose()
+
+
+async def _drain(buckets, now):
+    """Outcomes of 4 requests at `now` against a bucket of 3 refilling 1/s"""
+    return [(await buckets.take("auth:1.2.3.4", 3, 1.0, now))[0] for _ in range(4)]
+
+
+@pytest.mark.asyncio
+async def test_memory_bucket_burst_and_refill():
+    buckets = MemoryBuckets()
+    assert await _drain(buckets, 1000.0) == [True, True, True, False]
+    # Half a token back: still empty
+    assert (await buckets.take("auth:1.2.3.4", 3, 1.0, 1000.5))[0] is False
+    # Refilled one token
+    assert (await buckets.take("auth:1.2.3.4", 3, 1.0, 1001.5))[0] is True
+    # Other clients have their own bucket
+    assert (await buckets.take("auth:5.6.7.8", 3, 1.0, 1001.5))[0] is True
+
+
+@pytest.mark.asyncio
+async def test_memory_buckets_bounded():
+    buckets = MemoryBuckets(max_keys=2)
+    for client in ("a", "b", "c"):
+        await buckets.take(client, 3, 1.0, 0.0)
+    assert len(buckets) == 2
+
+
+@pytest.mark.asyncio
+async def test_database_bucket_burst_and_refill(session_factory):
+    buckets = DatabaseBuckets()
+    assert await _drain(buckets, 1000.0) == [True, True, True, False]
+    assert (await buckets.take("auth:1.2.3.4", 3, 1.0, 1000.5))[0] is False
+    allowed, tokens = await buckets.take("auth:1.2.3.4", 3, 1.0, 1001.5)
+    assert allowed is True
+    # 0.5 left at 1000.5, plus 1 refilled, minus the one taken
+    assert tokens == pytest.approx(0.5)
+    # Capped at capacity after a long idle period
+    assert await _drain(buckets, 5000.0) == [True, True, True, False]
+
+
+@pytest.mark.asyncio
+async def test_database_buckets_pruned(session_factory):
+    buckets = DatabaseBuckets(prune_interval=10, idle_after=100)
+    await buckets.take("auth:old", 3, 1.0, 1000.0)
+    # Prunes buckets idle since 1100 before taking
+    await buckets.take("auth:new", 3, 1.0, 1200.0)
+    async with session_factory() as session:
+        keys = (await session.execute(select(RateLimitBucketModel.key))).scalars().all()
+    assert keys == ["auth:new"]
+
+
+@pytest.mark.asyncio
+async def test_retry_after(monkeypatch):
+    monkeypatch.setattr(config, "RATE_LIMIT_BACKEND", "memory")
+    monkeypatch.setattr(config, "RATE_LIMIT_AUTH_BURST", 1)
+    monkeypatch.setattr(config, "RATE_LIMIT_AUTH_PER_MINUTE", 6)
+    limiter = RateLimiter()
+    assert await limiter.check("auth", "1.2.3.4", now=0.0) is None
+    assert await limiter.check("auth", "1.2.3.4", now=1.0) == pytest.approx(9.0)
@@ -0,0 +1,69 @@
+import bisect
+import random
+
+import pytest
+
+from app.sketches import QuantileSketch
+
+
+def _values(n=5000, seed=42):
+    rng = random.Random(seed)
+    # Long-tailed like real scores, with some zeros
+    return [0 if rng.random() < 0.05 else int(rng.lognormvariate(4, 1.2)) for _ in range(n)]
+
+
+def test_quantile_within_relative_accuracy():
+    values = _values()
+    sketch = QuantileSketch(0.01)
+    for value in values:
+        sketch.add(value)
+    exact = sorted(values)
+
+    for q in (0.0, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0):
+        expected = exact[int(q * (len(exact) - 1))]
+        assert abs(sketch.quantile(q) - expected) <= 0.01 * expected
+
+
+def test_count_below_bounds():
+    values = _values()
+    sketch = QuantileSketch(0.01)
+    for value in values:
+        sketch.add(value)
+    exact = sorted(values)
+
+    for x in (1, 2, 10, 50, 54.5, 100, 1000, 10 ** 6):
+        lower = bisect.bisect_left(exact, x / sketch.gamma)
+        upper = bisect.bisect_left(exact, x)
+        assert lower <= sketch.count_below(x) <= upper
+
+
+def test_merge_equals_single_sketch():
+    values = _values()
+    whole = QuantileSketch(0.01)
+    parts = [QuantileSketch(0.01) for _ in range(3)]
+    for i, value in enumerate(values):
+        whole.add(value)
+        parts[i % 3].add(value)
+
+    merged = QuantileSketch(0.01)
+    for part in parts:
+        merged.merge(part)
+    assert merged.bins == whole.bins
+    assert merged.zero_count == whole.zero_count
+    assert len(merged) == len(values)
+
+    with pytest.raises(ValueError):
+        merged.merge(QuantileSketch(0.02))
+
+
+def test_round_trip_and_empty():
+    sketch = QuantileSketch(0.01)
+    assert sketch.quantile(0.5) is None
+    assert sketch.percentile(10) is None
+
+    for value in (0, 5, 5, 120):
+        sketch.add(value)
+    restored = QuantileSketch.from_dict(sketch.to_dict())
+    assert restored.bins == sketch.bins
+    assert restored.count == 4
+    assert restored.percentile(100) == 75.0
@@ -0,0 +1,83 @@
+import gzip
+import pytest
+
+from app.static_files import StaticManifest, compress_directory, parse_accept_encoding, IMMUTABLE_CACHE, REVALIDATE_CACHE
+
+INDEX_HTML = b"<!doctype html><html><body><div id='root'></div>" + b" " * 1024 + b"</body></html>"
+APP_JS = b"console.log('snake');" * 200
+
+
+@pytest.fixture
+def build_dir(tmp_path):
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "index.html").write_bytes(INDEX_HTML)
+    (tmp_path / "assets" / "index-Bx3_k9Qa.js").write_bytes(APP_JS)
+    (tmp_path / "favicon.ico").write_bytes(b"\x00" * 10)
+    # From public/: looks hashed but keeps its name across builds
+    (tmp_path / "snake-gameplay.png").write_bytes(b"\x89PNG" * 10)
+    compress_directory(str(tmp_path))
+    return tmp_path
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("gzip, br;q=0.5, identity;q=0") == {"gzip": 1.0, "br": 0.5, "identity": 0.0}
+    assert parse_accept_encoding(None) == {}
+
+
+def test_manifest_indexes_files_but_not_variants(build_dir):
+    manifest = StaticManifest(str(build_dir))
+
+    assert set(manifest.entries) == {"index.html", "assets/index-Bx3_k9Qa.js", "favicon.ico", "snake-gameplay.png"}
+    assert (build_dir / "index.html.gz").exists()
+    # Tiny files are not worth compressing
+    assert not (build_dir / "favicon.ico.gz").exists()
+
+
+def test_serves_gzip_variant_when_accepted(build_dir):
+    manifest = StaticManifest(str(build_dir))
+
+    response = manifest.response("assets/index-Bx3_k9Qa.js", {"accept-encoding": "gzip, deflate"})
+
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE
+    assert gzip.decompress(response.body) == APP_JS
+
+
+def test_serves_identity_without_accept_encoding(build_dir):
+    manifest = StaticManifest(str(build_dir))
+
+    response = manifest.response("index.html", {})
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.headers["cache-control"] == REVALIDATE_CACHE
+    assert response.headers["content-type"].startswith("text/html")
+    assert response.body == INDEX_HTML
+
+
+def test_only_vite_assets_are_immutable(build_dir):
+    manifest = StaticManifest(str(build_dir))
+
+    assert manifest.response("assets/index-Bx3_k9Qa.js", {}).headers["cache-control"] == IMMUTABLE_CACHE
+    assert manifest.response("snake-gameplay.png", {}).headers["cache-control"] == REVALIDATE_CACHE
+
+
+def test_conditional_request_returns_304(build_dir):
+    manifest = StaticManifest(str(build_dir))
+    first = manifest.response("index.html", {"accept-encoding": "gzip"})
+    etag = first.headers["etag"]
+
+    second = manifest.response("index.html", {"accept-encoding": "gzip", "if-none-match": etag})
+    assert second.status_code == 304
+    assert second.body == b""
+
+    # The identity representation has a different ETag
+    third = manifest.response("index.html", {"if-none-match": etag})
+    assert third.status_code == 200
+
+
+def test_unknown_path(build_dir):
+    manifest = StaticManifest(str(build_dir))
+    assert manifest.response("missing.js", {}) is None
@@ -0,0 +1,92 @@
+"""Integration tests for admin endpoints"""
+import csv
+import io
+import json
+import pytest
+from datetime import datetime, UTC
+from app import config
+from app.db.models import LeaderboardEntryModel
+
+ADMIN_HEADERS = {"X-Admin-Token": "admin-secret"}
+
+@pytest.fixture
+def admin_token(monkeypatch):
+    """Enable admin routes with a known token"""
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "admin-secret")
+
+@pytest.fixture
+async def many_entries(db_session):
+    """Add enough leaderboard entries to span several export chunks"""
+    for i in range(25):
+        db_session.add(LeaderboardEntryModel(
+            id=f"entry-{i:02d}",
+            username=f"player{i}",
+            score=i * 10,
+            mode="walls" if i % 2 else "passthrough",
+            date=datetime(2024, 12, 1 + i, tzinfo=UTC),
+        ))
+    await db_session.commit()
+
+@pytest.mark.asyncio
+async def test_admin_disabled_without_token(client, monkeypatch):
+    """Admin routes are closed when ADMIN_TOKEN is not configured"""
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "")
+    response = await client.get("/api/admin/export/users", headers=ADMIN_HEADERS)
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_admin_rejects_wrong_token(client, admin_token):
+    """Test admin routes with an invalid token"""
+    response = await client.get("/api/admin/export/users", headers={"X-Admin-Token": "nope"})
+    assert response.status_code == 403
+
+@pytest.mark.asyncio
+async def test_export_leaderboard_ndjson(client, admin_token, many_entries):
+    """Test streaming the leaderboard as NDJSON in small chunks"""
+    response = await client.get(
+        "/api/admin/export/leaderboard?format=ndjson&chunk_size=4",
+        headers=ADMIN_HEADERS,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "content-length" not in response.headers
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 25
+    assert rows[0]["id"] == "entry-00"
+    assert rows[3]["mode"] == "walls"
+    assert rows[3]["gridSize"] == 20
+
+@pytest.mark.asyncio
+async def test_export_users_csv_excludes_password(client, admin_token, test_user):
+    """Test exporting users as CSV without password hashes"""
+    response = await client.get("/api/admin/export/users?format=csv", headers=ADMIN_HEADERS)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["email"] == "test@example.com"
+    assert "password_hash" not in rows[0]
+    assert test_user.password_hash not in response.text
+
+@pytest.mark.asyncio
+async def test_export_unknown_table(client, admin_token):
+    """Test exporting a table that is not exportable"""
+    response = await client.get("/api/admin/export/tokens", headers=ADMIN_HEADERS)
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_export_leaderboard_parquet(client, admin_token, many_entries):
+    """Test exporting the leaderboard as Parquet, one row group per chunk"""
+    pq = pytest.importorskip("pyarrow.parquet")
+    response = await client.get(
+        "/api/admin/export/leaderboard?format=parquet&chunk_size=10",
+        headers=ADMIN_HEADERS,
+    )
+
+    assert response.status_code == 200
+    parquet_file = pq.ParquetFile(io.BytesIO(response.content))
+    assert parquet_file.metadata.num_rows == 25
+    assert parquet_file.metadata.num_row_groups == 3
+    assert parquet_file.schema_arrow.names == ["id", "username", "score", "mode", "gridSize", "date"]
@@ -138,3 +138,63 @@ async def test_logout(client):
     data = response.json()
     assert data["success"] is True
 
+
+@pytest.mark.asyncio
+async def test_login_upgrades_legacy_password_hash(client, test_user, db_session):
+    """Test that a successful login re-hashes a legacy SHA-256 password"""
+    legacy_hash = test_user.password_hash
+
+    response = await client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "password123"}
+    )
+    assert response.status_code == 200
+
+    await db_session.refresh(test_user)
+    assert test_user.password_hash != legacy_hash
+    assert test_user.password_hash.startswith("scrypt$")
+
+    # The upgraded hash keeps working
+    response = await client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "password123"}
+    )
+    assert response.status_code == 200
+
+@pytest.mark.asyncio
+async def test_register_duplicate_leaves_no_partial_rows(client, test_user, db_session):
+    """Test that a rejected registration writes neither user nor token"""
+    from sqlalchemy import select, func
+    from app.db.models import UserModel, TokenModel
+
+    response = await client.post(
+        "/api/auth/register",
+        json={
+            "username": "testuser",
+            "email": "test@example.com",
+            "password": "password123"
+        }
+    )
+    assert response.status_code == 400
+
+    users = await db_session.execute(select(func.count()).select_from(UserModel))
+    tokens = await db_session.execute(select(func.count()).select_from(TokenModel))
+    assert users.scalar() == 1
+    assert tokens.scalar() == 0
+
+@pytest.mark.asyncio
+async def test_register_token_is_usable(client):
+    """Test that the token issued at registration authenticates immediately"""
+    response = await client.post(
+        "/api/auth/register",
+        json={
+            "username": "freshuser",
+            "email": "fresh@example.com",
+            "password": "password123"
+        }
+    )
+    token = response.json()["token"]
+
+    response = await client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert response.json()["username"] == "freshuser"
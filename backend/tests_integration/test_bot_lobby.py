@@ -0,0 +1,59 @@
+"""Integration tests for server-hosted bot games"""
+import pytest
+
+from app.bot_lobby import BotLobby
+from app.cache import clear_all_caches
+from app.database import db
+
+
+async def _active_games(client):
+    clear_all_caches()
+    response = await client.get("/api/games/active")
+    assert response.status_code == 200
+    return {game["id"]: game for game in response.json()}
+
+
+@pytest.mark.asyncio
+async def test_bots_appear_in_active_games(client):
+    lobby = BotLobby(count=4, seed=1)
+    await lobby.sync()
+
+    games = await _active_games(client)
+    assert set(games) == {game.id for game in lobby.games}
+    assert {(game["mode"], game["gridSize"]) for game in games.values()} == {
+        ("walls", 20), ("passthrough", 20), ("walls", 50), ("passthrough", 50)
+    }
+    assert all(game["username"].startswith("bot-") for game in games.values())
+
+
+@pytest.mark.asyncio
+async def test_sync_updates_scores_and_replaces_finished_games(client):
+    lobby = BotLobby(count=2, seed=1)
+    await lobby.sync()
+    first_ids = [game.id for game in lobby.games]
+
+    # Walls games on a 20x20 grid end within a few thousand moves
+    while lobby.games[0].id == first_ids[0] or lobby.games[0].score == 0:
+        await lobby.tick()
+    await lobby.sync()
+
+    games = await _active_games(client)
+    assert first_ids[0] not in games
+    assert set(games) == {game.id for game in lobby.games}
+    assert games[lobby.games[0].id]["score"] == lobby.games[0].score
+    assert games[lobby.games[1].id]["score"] == lobby.bots[1].game.score
+
+
+@pytest.mark.asyncio
+async def test_lobbies_sync_in_batches_without_sharing_usernames(client):
+    lobbies = [BotLobby(count=5, seed=1), BotLobby(count=5, seed=1)]
+    for lobby in lobbies:
+        await lobby.sync()
+    await db.save_active_games(lobbies[0].games, batch_size=2)
+
+    games = await _active_games(client)
+    assert len(games) == 10
+    assert len({game["username"] for game in games.values()}) == 10
+
+    assert await db.delete_active_games(list(games), batch_size=3) == 10
+    assert await _active_games(client) == {}
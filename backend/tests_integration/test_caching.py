@@ -0,0 +1,59 @@
+"""Integration tests for cache coherence on writes"""
+import pytest
+from app.cache import user_cache, token_cache, leaderboard_cache
+
+@pytest.mark.asyncio
+async def test_profile_update_invalidates_user_cache(client, auth_token, test_user):
+    """Cached users are refreshed after an update"""
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    assert (await client.get("/api/auth/me", headers=headers)).json()["username"] == "testuser"
+    assert token_cache.get(auth_token)[0] == test_user.id
+    assert user_cache.get(test_user.id) is not None
+
+    await client.patch("/api/users/me", json={"username": "renamed"}, headers=headers)
+
+    assert (await client.get("/api/auth/me", headers=headers)).json()["username"] == "renamed"
+
+@pytest.mark.asyncio
+async def test_score_submission_invalidates_leaderboard(client, auth_token):
+    """A new score is visible on the next leaderboard read"""
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    games_played = (await client.get("/api/auth/me", headers=headers)).json()["gamesPlayed"]
+    assert (await client.get("/api/leaderboard")).json() == []
+    assert leaderboard_cache.get("all:20:0:all") == []
+
+    response = await client.post(
+        "/api/leaderboard",
+        json={"score": 250, "mode": "walls"},
+        headers=headers,
+    )
+    assert response.status_code == 200
+
+    entries = (await client.get("/api/leaderboard")).json()
+    assert [e["score"] for e in entries] == [250]
+    me = (await client.get("/api/auth/me", headers=headers)).json()
+    assert me["gamesPlayed"] == games_played + 1
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_share_one_query(client, db_session, monkeypatch):
+    """A burst of identical reads runs one query"""
+    import asyncio
+    from sqlalchemy import event
+    from app import config
+    from app.db import session as db_session_module
+
+    monkeypatch.setattr(config, "CACHE_ENABLED", False)
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session_module.engine.sync_engine
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        responses = await asyncio.gather(*(client.get("/api/games/active") for _ in range(10)))
+        assert all(r.status_code == 200 for r in responses)
+        queries = [s for s in statements if "FROM active_games" in s]
+        assert 1 <= len(queries) < 10
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
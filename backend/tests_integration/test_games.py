@@ -75,3 +75,16 @@ async def test_get_game_not_found(client):
     assert response.status_code == 404
     assert "Game not found" in response.json()["detail"]
 
+
+@pytest.mark.asyncio
+async def test_get_active_games_pages(client, db_session):
+    """Pages of active games follow a stable order"""
+    for i in range(5):
+        db_session.add(ActiveGameModel(
+            id=f"game{i}", username=f"player{i}", score=i, mode="walls", started_at=datetime.now(UTC)
+        ))
+    await db_session.commit()
+
+    first = (await client.get("/api/games/active?limit=2")).json()
+    rest = (await client.get("/api/games/active?offset=2&limit=10")).json()
+    assert [game["id"] for game in first + rest] == [f"game{i}" for i in range(5)]
@@ -0,0 +1,140 @@
+"""Integration tests for liveness, readiness and admission control"""
+import pytest
+from app import config
+from app.database import db
+from app.db import session as db_session_module
+from app.health import load_monitor, readiness, LoadMonitor
+
+@pytest.fixture
+def monitor():
+    """Reset the shared load monitor and readiness state around a test"""
+    load_monitor.sample(0.0, saturated=False)
+    load_monitor.loop_lag_ms = 0.0
+    yield load_monitor
+    load_monitor.sample(0.0, saturated=False)
+    load_monitor.loop_lag_ms = 0.0
+    readiness.init_error = None
+    readiness.db_latencies_ms.clear()
+
+@pytest.mark.asyncio
+async def test_liveness(client):
+    """Liveness does not touch the database"""
+    for path in ("/api/health", "/api/health/live"):
+        response = await client.get(path)
+        assert response.status_code == 200
+        assert response.json() == {"status": "healthy"}
+
+@pytest.mark.asyncio
+async def test_readiness_ok(client, monitor):
+    """Readiness pings the database and reports recent latencies"""
+    await client.get("/api/health/ready")
+    response = await client.get("/api/health/ready")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ready"
+    checks = data["checks"]
+    assert checks["database"]["status"] == "ok"
+    assert checks["database"]["recent_latency_ms"]["samples"] == 2
+    assert checks["pool"]["status"] == "ok"
+    assert checks["event_loop"]["status"] == "ok"
+
+@pytest.mark.asyncio
+async def test_readiness_database_unreachable(client, monitor, monkeypatch):
+    """A failing database ping makes the instance not ready"""
+    async def failing_ping():
+        raise ConnectionError("connection refused")
+    monkeypatch.setattr(db, "ping", failing_ping)
+
+    response = await client.get("/api/health/ready")
+    assert response.status_code == 503
+    data = response.json()
+    assert data["status"] == "not_ready"
+    assert data["checks"]["database"] == {
+        "status": "unreachable", "error": "connection refused", "recent_latency_ms": None,
+    }
+
+@pytest.mark.asyncio
+async def test_readiness_recovers_once_schema_is_current(client, monitor, monkeypatch):
+    """After a failed startup, readiness clears once the schema is at the current revision"""
+    async def fail_init_db():
+        raise AssertionError("readiness must not run migrations")
+
+    monkeypatch.setattr(db_session_module, "init_db", fail_init_db)
+    readiness.init_error = "database unavailable"
+
+    async def behind():
+        return "0001_baseline"
+
+    monkeypatch.setattr(db_session_module, "current_revision", behind)
+    response = await client.get("/api/health/ready")
+    assert response.status_code == 503
+    assert response.json()["checks"]["schema"] == {"status": "failed", "error": "database unavailable"}
+
+    async def current():
+        return db_session_module.SCHEMA_REVISION
+
+    monkeypatch.setattr(db_session_module, "current_revision", current)
+    response = await client.get("/api/health/ready")
+    assert response.status_code == 200
+    assert response.json()["checks"]["schema"] == {"status": "ok"}
+    assert readiness.init_error is None
+
+@pytest.mark.asyncio
+async def test_readiness_pool_saturated(client, monitor):
+    """A pool saturated for longer than the threshold fails readiness"""
+    monitor.sample(0.0, saturated=True, now=0.0)
+    monitor.sample(0.0, saturated=True, now=(config.ADMISSION_MAX_POOL_WAIT_MS + 100) / 1000)
+    response = await client.get("/api/health/ready")
+    assert response.status_code == 503
+    assert response.json()["checks"]["pool"]["status"] == "saturated"
+
+@pytest.mark.asyncio
+async def test_sheds_low_priority_under_loop_lag(client, monitor, auth_token):
+    """Leaderboard polling is shed while the loop lags; score submission is not"""
+    monitor.sample(config.ADMISSION_MAX_LOOP_LAG_MS * 2, saturated=False)
+
+    for path in ("/api/leaderboard", "/api/games/active"):
+        response = await client.get(path)
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == str(config.ADMISSION_RETRY_AFTER)
+
+    response = await client.post(
+        "/api/leaderboard",
+        json={"score": 100, "mode": "walls"},
+        headers={"Authorization": f"Bearer {auth_token}"},
+    )
+    assert response.status_code == 200
+
+    metrics = (await client.get("/api/metrics")).text
+    assert 'http_requests_shed_total{route="/api/leaderboard",reason="loop_lag"}' in metrics
+
+@pytest.mark.asyncio
+async def test_shed_response_has_cors_headers(client, monitor):
+    """A browser can read a shed response and honour its Retry-After"""
+    monitor.sample(config.ADMISSION_MAX_LOOP_LAG_MS * 2, saturated=False)
+
+    response = await client.get("/api/leaderboard", headers={"Origin": "https://example.com"})
+    assert response.status_code == 503
+    assert "access-control-allow-origin" in response.headers
+
+@pytest.mark.asyncio
+async def test_admission_disabled(client, monitor, monkeypatch):
+    """No requests are shed when admission control is off"""
+    monkeypatch.setattr(config, "ADMISSION_ENABLED", False)
+    monitor.sample(config.ADMISSION_MAX_LOOP_LAG_MS * 2, saturated=False)
+    response = await client.get("/api/leaderboard")
+    assert response.status_code == 200
+
+def test_monitor_signals_recover():
+    """Lag decays after the spike and pool wait resets once the pool frees up"""
+    monitor = LoadMonitor(interval=0.1)
+    monitor.sample(1000.0, saturated=True, now=10.0)
+    monitor.sample(0.0, saturated=True, now=11.0)
+    assert monitor.loop_lag_ms == 500.0
+    assert monitor.pool_wait_ms == 1000.0
+    assert monitor.overloaded() == "loop_lag"
+
+    for _ in range(10):
+        monitor.sample(0.0, saturated=False, now=12.0)
+    assert monitor.pool_wait_ms == 0.0
+    assert monitor.overloaded() is None
@@ -1,6 +1,7 @@
 """Integration tests for leaderboard endpoints"""
 import pytest
 from datetime import datetime, UTC
+from sqlalchemy import event
 from app.db.models import LeaderboardEntryModel
 
 @pytest.mark.asyncio
@@ -185,3 +186,148 @@ async def test_submit_score_rank_calculation(client, auth_token, db_session):
     data = response.json()
     assert data["rank"] == 2
 
+
+async def _seed_board(db_session):
+    """20 walls entries scoring 1000, 950, ... 50; testuser holds 600 and 300"""
+    for i in range(20):
+        db_session.add(LeaderboardEntryModel(
+            id=f"w{i:02d}",
+            username=f"player{i}",
+            score=1000 - i * 50,
+            mode="walls",
+            date=datetime.now(UTC)
+        ))
+    db_session.add(LeaderboardEntryModel(id="mine-best", username="testuser", score=600, mode="walls", date=datetime.now(UTC)))
+    db_session.add(LeaderboardEntryModel(id="mine-old", username="testuser", score=300, mode="walls", date=datetime.now(UTC)))
+    db_session.add(LeaderboardEntryModel(id="p0", username="player0", score=5000, mode="passthrough", date=datetime.now(UTC)))
+    await db_session.commit()
+
+@pytest.mark.asyncio
+async def test_leaderboard_around_me(client, db_session, auth_token):
+    """The caller's best entry with its neighbours and ranks"""
+    await _seed_board(db_session)
+    
+    response = await client.get(
+        "/api/leaderboard/around-me",
+        params={"mode": "walls", "radius": 2},
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    # Eight entries score above 600; the tie with w08 is broken by id
+    assert data["rank"] == 9
+    assert [(e["rank"], e["id"], e["score"]) for e in data["entries"]] == [
+        (7, "w06", 700),
+        (8, "w07", 650),
+        (9, "mine-best", 600),
+        (10, "w08", 600),
+        (11, "w09", 550),
+    ]
+    
+    # Ranks agree with the full board
+    board = (await client.get("/api/leaderboard", params={"mode": "walls"})).json()
+    assert [e["id"] for e in board[6:11]] == [e["id"] for e in data["entries"]]
+
+@pytest.mark.asyncio
+async def test_leaderboard_around_me_all_modes_and_edges(client, db_session, auth_token):
+    await _seed_board(db_session)
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    
+    # All modes: the passthrough 5000 ranks first
+    data = (await client.get("/api/leaderboard/around-me", params={"radius": 0}, headers=headers)).json()
+    assert data["rank"] == 10
+    assert [e["id"] for e in data["entries"]] == ["mine-best"]
+    
+    # No score in this mode
+    data = (await client.get("/api/leaderboard/around-me", params={"mode": "passthrough"}, headers=headers)).json()
+    assert data == {"rank": None, "entries": []}
+
+@pytest.mark.asyncio
+async def test_leaderboard_around_me_top_of_board(client, db_session, auth_token):
+    """Fewer neighbours are returned at the top of the board"""
+    db_session.add(LeaderboardEntryModel(id="top", username="testuser", score=9999, mode="walls", date=datetime.now(UTC)))
+    db_session.add(LeaderboardEntryModel(id="next", username="other", score=10, mode="walls", date=datetime.now(UTC)))
+    await db_session.commit()
+    
+    data = (await client.get(
+        "/api/leaderboard/around-me",
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )).json()
+    assert data["rank"] == 1
+    assert [(e["rank"], e["id"]) for e in data["entries"]] == [(1, "top"), (2, "next")]
+
+@pytest.mark.asyncio
+async def test_leaderboard_around_me_requires_auth(client):
+    response = await client.get("/api/leaderboard/around-me")
+    assert response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_leaderboards_partitioned_by_grid_size(client, auth_token):
+    """Each grid size has its own leaderboard, rank and percentile"""
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    for score, grid_size in ((500, 20), (100, 200), (50, 200)):
+        response = await client.post(
+            "/api/leaderboard", json={"score": score, "mode": "walls", "gridSize": grid_size}, headers=headers
+        )
+        assert response.status_code == 200
+    # Ranked among arena games only
+    assert response.json()["rank"] == 2
+    assert response.json()["percentile"] == 0.0
+
+    classic = (await client.get("/api/leaderboard")).json()
+    assert [(entry["score"], entry["gridSize"]) for entry in classic] == [(500, 20)]
+    arena = (await client.get("/api/leaderboard?mode=walls&gridSize=200")).json()
+    assert [entry["score"] for entry in arena] == [100, 50]
+
+    around = (await client.get("/api/leaderboard/around-me?gridSize=200", headers=headers)).json()
+    assert around["rank"] == 1
+    assert [entry["gridSize"] for entry in around["entries"]] == [200, 200]
+
+    distribution = (await client.get("/api/leaderboard/distribution?mode=walls&gridSize=200")).json()
+    assert distribution["count"] == 2
+
+    assert (await client.get("/api/leaderboard?gridSize=30")).status_code == 422
+    response = await client.post(
+        "/api/leaderboard", json={"score": 10, "mode": "walls", "gridSize": 30}, headers=headers
+    )
+    assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_get_leaderboard_pages(client, db_session):
+    """Pages are consecutive slices of the board"""
+    for i in range(7):
+        db_session.add(LeaderboardEntryModel(
+            id=f"entry{i}", username=f"player{i}", score=100 - i, mode="walls", date=datetime.now(UTC)
+        ))
+    await db_session.commit()
+
+    pages = [
+        (await client.get(f"/api/leaderboard?offset={offset}&limit=3")).json()
+        for offset in (0, 3, 6)
+    ]
+    assert [[entry["id"] for entry in page] for page in pages] == [
+        ["entry0", "entry1", "entry2"], ["entry3", "entry4", "entry5"], ["entry6"]
+    ]
+    assert (await client.get("/api/leaderboard?limit=0")).status_code == 422
+
+@pytest.mark.asyncio
+async def test_leaderboard_page_loads_only_its_rows(client, db_session):
+    """A page is limited in SQL rather than sliced from the whole board"""
+    for i in range(20):
+        db_session.add(LeaderboardEntryModel(
+            id=f"entry{i:02d}", username=f"player{i}", score=100 - i, mode="walls", date=datetime.now(UTC)
+        ))
+    await db_session.commit()
+
+    loaded = []
+    def on_load(entry, context):
+        loaded.append(entry.id)
+    event.listen(LeaderboardEntryModel, "load", on_load)
+    try:
+        response = await client.get("/api/leaderboard?offset=5&limit=3")
+    finally:
+        event.remove(LeaderboardEntryModel, "load", on_load)
+
+    assert [entry["id"] for entry in response.json()] == ["entry05", "entry06", "entry07"]
+    assert loaded == ["entry05", "entry06", "entry07"]
@@ -0,0 +1,36 @@
+"""Integration tests for the metrics endpoint"""
+import pytest
+from datetime import datetime, UTC
+from app.db.models import LeaderboardEntryModel
+from app.metrics import http_requests_total
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_records_route_templates(client, db_session):
+    """Test that requests and DB calls show up in /api/metrics"""
+    db_session.add(LeaderboardEntryModel(
+        id="entry1", username="player1", score=150, mode="walls", date=datetime.now(UTC)
+    ))
+    await db_session.commit()
+    before = http_requests_total.get("GET", "/api/leaderboard", "200")
+
+    await client.get("/api/leaderboard")
+    await client.get("/api/leaderboard?mode=walls")
+    response = await client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert http_requests_total.get("GET", "/api/leaderboard", "200") == before + 2
+    text = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/leaderboard"}' in text
+    assert 'db_calls_total{method="get_leaderboard"}' in text
+    assert 'db_statements_total{method="get_leaderboard"}' in text
+
+@pytest.mark.asyncio
+async def test_metrics_group_unmatched_paths(client):
+    """Test that unknown paths do not create a series per path"""
+    await client.get("/api/does-not-exist-1")
+    await client.get("/api/does-not-exist-2")
+    response = await client.get("/api/metrics")
+
+    assert "does-not-exist" not in response.text
+    assert 'route="unmatched"' in response.text
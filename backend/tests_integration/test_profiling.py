@@ -0,0 +1,83 @@
+"""Integration tests for opt-in request profiling"""
+import marshal
+import pytest
+from app import config
+from app.profiling import profile_store
+
+ADMIN_HEADERS = {"X-Admin-Token": "admin-secret"}
+PROFILE_HEADERS = {**ADMIN_HEADERS, "X-Profile": "1"}
+
+@pytest.fixture
+def profiling(monkeypatch, tmp_path):
+    """Enable profiling into a temporary directory"""
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "admin-secret")
+    monkeypatch.setattr(config, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(config, "PROFILING_SAMPLE_RATE", 0.0)
+    monkeypatch.setattr(profile_store, "directory", str(tmp_path))
+    monkeypatch.setattr(profile_store, "max_profiles", 3)
+    return tmp_path
+
+@pytest.mark.asyncio
+async def test_profile_requires_admin_token(client, profiling):
+    """X-Profile without a valid admin token is ignored"""
+    response = await client.get("/api/leaderboard", headers={"X-Profile": "1", "X-Admin-Token": "nope"})
+    assert response.status_code == 200
+    assert profile_store.list() == []
+
+@pytest.mark.asyncio
+async def test_profiling_disabled(client, profiling, monkeypatch):
+    """Nothing is recorded when PROFILING_ENABLED is off"""
+    monkeypatch.setattr(config, "PROFILING_ENABLED", False)
+    await client.get("/api/leaderboard", headers=PROFILE_HEADERS)
+    assert profile_store.list() == []
+
+@pytest.mark.asyncio
+async def test_sample_profile_records_sql(client, profiling, monkeypatch):
+    """A sampled profile is stored with its SQL timings and can be downloaded"""
+    monkeypatch.setattr(config, "PROFILING_MODE", "sample")
+    response = await client.get("/api/leaderboard", headers=PROFILE_HEADERS)
+    assert response.status_code == 200
+
+    listing = await client.get("/api/admin/profiles", headers=ADMIN_HEADERS)
+    assert listing.status_code == 200
+    profiles = listing.json()
+    assert len(profiles) == 1
+    summary = profiles[0]
+    assert summary["route"] == "/api/leaderboard"
+    assert summary["status"] == 200
+    assert summary["sql_count"] >= 1
+
+    meta = (await client.get(f"/api/admin/profiles/{summary['id']}", headers=ADMIN_HEADERS)).json()
+    assert any("leaderboard_entries" in q["statement"] for q in meta["sql"])
+    assert all(q["duration_ms"] is not None for q in meta["sql"])
+
+    download = await client.get(f"/api/admin/profiles/{summary['id']}/download", headers=ADMIN_HEADERS)
+    assert download.status_code == 200
+    assert download.headers["content-type"].startswith("text/plain")
+
+@pytest.mark.asyncio
+async def test_cprofile_profile_is_pstats(client, profiling, monkeypatch):
+    """cProfile mode stores marshalled pstats data"""
+    monkeypatch.setattr(config, "PROFILING_MODE", "cprofile")
+    await client.get("/api/health", headers=PROFILE_HEADERS)
+
+    [meta] = profile_store.list()
+    assert meta["file"].endswith(".pstats")
+    with open(profile_store.data_path(meta), "rb") as f:
+        stats = marshal.load(f)
+    assert isinstance(stats, dict) and stats
+
+@pytest.mark.asyncio
+async def test_profile_ring_is_bounded(client, profiling):
+    """Only the newest PROFILING_MAX_FILES profiles are kept"""
+    for _ in range(5):
+        await client.get("/api/health", headers=PROFILE_HEADERS)
+    assert len(profile_store.list()) == 3
+    assert len(list(profiling.iterdir())) == 6
+
+@pytest.mark.asyncio
+async def test_unknown_profile(client, profiling):
+    """Unknown or malformed profile ids return 404"""
+    for profile_id in ("0123456789abcdef", "..%2Fsecret"):
+        response = await client.get(f"/api/admin/profiles/{profile_id}", headers=ADMIN_HEADERS)
+        assert response.status_code == 404
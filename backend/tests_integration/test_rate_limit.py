@@ -0,0 +1,65 @@
+"""Integration tests for rate limiting of write endpoints"""
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app import config
+from app.main import app
+
+
+async def _login(client):
+    return await client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "password123"}
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("backend", ["memory", "database"])
+async def test_login_rate_limited(client, test_user, monkeypatch, backend):
+    monkeypatch.setattr(config, "RATE_LIMIT_BACKEND", backend)
+    monkeypatch.setattr(config, "RATE_LIMIT_AUTH_BURST", 2)
+
+    assert (await _login(client)).status_code == 200
+    assert (await _login(client)).status_code == 200
+
+    response = await _login(client)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+    metrics = (await client.get("/api/metrics")).text
+    assert 'http_requests_rate_limited_total{rule="auth"}' in metrics
+
+
+@pytest.mark.asyncio
+async def test_score_submission_rate_limited(client, auth_token, monkeypatch):
+    monkeypatch.setattr(config, "RATE_LIMIT_SCORES_BURST", 1)
+    headers = {"Authorization": f"Bearer {auth_token}"}
+    score = {"score": 10, "mode": "walls"}
+
+    assert (await client.post("/api/leaderboard", json=score, headers=headers)).status_code == 200
+    assert (await client.post("/api/leaderboard", json=score, headers=headers)).status_code == 429
+    # Reads are not limited
+    assert (await client.get("/api/leaderboard")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_disabled(client, test_user, monkeypatch):
+    monkeypatch.setattr(config, "RATE_LIMIT_ENABLED", False)
+    monkeypatch.setattr(config, "RATE_LIMIT_AUTH_BURST", 1)
+    for _ in range(3):
+        assert (await _login(client)).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_clients_rate_limited_separately(client, test_user, monkeypatch):
+    monkeypatch.setattr(config, "RATE_LIMIT_AUTH_BURST", 1)
+
+    # The database patches of the client fixture stay active for these clients
+    async with AsyncClient(
+        transport=ASGITransport(app=app, client=("203.0.113.1", 1234)), base_url="http://test"
+    ) as first, AsyncClient(
+        transport=ASGITransport(app=app, client=("203.0.113.2", 1234)), base_url="http://test"
+    ) as second:
+        assert (await _login(first)).status_code == 200
+        assert (await _login(first)).status_code == 429
+        assert (await _login(second)).status_code == 200
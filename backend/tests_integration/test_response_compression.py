@@ -0,0 +1,89 @@
+"""Integration tests for negotiated response compression"""
+import gzip
+import json
+
+import pytest
+from datetime import datetime, UTC
+
+from app import config
+from app.compression import compressed_bodies
+from app.db.models import LeaderboardEntryModel
+from app.metrics import http_responses_compressed_total
+
+
+@pytest.fixture
+async def entries(db_session):
+    now = datetime.now(UTC)
+    for i in range(100):
+        db_session.add(LeaderboardEntryModel(id=f"e{i}", username=f"p{i}", score=i, mode="walls", date=now))
+    await db_session.commit()
+    compressed_bodies.clear()
+
+
+async def _raw(client, url, encoding, **kwargs):
+    """(response, undecoded body)"""
+    headers = {"Accept-Encoding": encoding, **kwargs.pop("headers", {})}
+    async with client.stream("GET", url, headers=headers, **kwargs) as response:
+        body = b"".join([chunk async for chunk in response.aiter_raw()])
+    return response, body
+
+
+@pytest.mark.asyncio
+async def test_large_json_is_gzipped(client, entries):
+    response, body = await _raw(client, "/api/leaderboard", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(body)
+    assert len(json.loads(gzip.decompress(body))) == 100
+
+
+@pytest.mark.asyncio
+async def test_identity_when_not_accepted_or_small(client, entries):
+    response, body = await _raw(client, "/api/leaderboard", "identity")
+    assert "content-encoding" not in response.headers
+    assert len(json.loads(body)) == 100
+
+    response, _ = await _raw(client, "/api/leaderboard", "gzip;q=0, br;q=0")
+    assert "content-encoding" not in response.headers
+
+    # Below COMPRESSION_MIN_SIZE
+    response, body = await _raw(client, "/api/health", "gzip")
+    assert "content-encoding" not in response.headers
+    assert json.loads(body) == {"status": "healthy"}
+
+
+@pytest.mark.asyncio
+async def test_identical_bodies_compressed_once(client, entries):
+    hits = http_responses_compressed_total.get("gzip", "hit")
+    first, first_body = await _raw(client, "/api/leaderboard", "gzip")
+    second, second_body = await _raw(client, "/api/leaderboard", "gzip")
+    assert first_body == second_body
+    assert len(compressed_bodies) == 1
+    assert http_responses_compressed_total.get("gzip", "hit") == hits + 1
+
+
+@pytest.mark.asyncio
+async def test_large_bodies_compressed_in_thread(client, entries, monkeypatch):
+    monkeypatch.setattr(config, "COMPRESSION_THREAD_MIN_SIZE", 0)
+    response, body = await _raw(client, "/api/leaderboard", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(json.loads(gzip.decompress(body))) == 100
+
+
+@pytest.mark.asyncio
+async def test_streaming_export_not_compressed(client, entries, monkeypatch):
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "admin-secret")
+    response, body = await _raw(
+        client, "/api/admin/export/leaderboard?format=ndjson&chunk_size=10", "gzip",
+        headers={"X-Admin-Token": "admin-secret"},
+    )
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert len(body.splitlines()) == 100
+
+
+@pytest.mark.asyncio
+async def test_disabled(client, entries, monkeypatch):
+    monkeypatch.setattr(config, "COMPRESSION_ENABLED", False)
+    response, _ = await _raw(client, "/api/leaderboard", "gzip")
+    assert "content-encoding" not in response.headers
@@ -0,0 +1,84 @@
+"""The fast JSON path produces the same bytes as FastAPI's default path"""
+import json
+import warnings
+
+import pytest
+from datetime import datetime, timedelta, UTC
+
+from app import config
+from app.cache import clear_all_caches
+from app.db.models import LeaderboardEntryModel, ActiveGameModel
+
+
+def _compact(data):
+    """Bytes of Starlette's JSONResponse for data"""
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+async def _both(client, method, url, monkeypatch, **kwargs):
+    responses = []
+    for fast in (True, False):
+        monkeypatch.setattr(config, "FAST_JSON_RESPONSES", fast)
+        clear_all_caches()
+        with warnings.catch_warnings():
+            # pydantic warns instead of failing when a value does not match its type
+            warnings.simplefilter("error")
+            responses.append(await client.request(method, url, **kwargs))
+    fast, default = responses
+    assert fast.status_code == default.status_code
+    assert fast.headers["content-type"] == default.headers["content-type"]
+    assert fast.content == default.content
+    return fast
+
+
+@pytest.mark.asyncio
+async def test_read_endpoints_match_default(client, auth_token, db_session, monkeypatch):
+    now = datetime.now(UTC)
+    for i in range(20):
+        db_session.add(LeaderboardEntryModel(
+            id=f"e{i}", username=f"plåyer{i} 🐍", score=i * 7, mode="walls" if i % 2 else "passthrough",
+            date=now - timedelta(minutes=i, microseconds=i),
+        ))
+        db_session.add(ActiveGameModel(
+            id=f"g{i}", username=f"p{i}", score=i, mode="walls", started_at=now - timedelta(seconds=i),
+        ))
+    await db_session.commit()
+    headers = {"Authorization": f"Bearer {auth_token}"}
+
+    response = await _both(client, "GET", "/api/leaderboard", monkeypatch)
+    assert len(response.json()) == 20
+    await _both(client, "GET", "/api/leaderboard?mode=walls", monkeypatch)
+    await _both(client, "GET", "/api/games/active", monkeypatch)
+    await _both(client, "GET", "/api/games/g3", monkeypatch)
+    await _both(client, "GET", "/api/games/missing", monkeypatch)
+    await _both(client, "GET", "/api/auth/me", monkeypatch, headers=headers)
+    await _both(client, "GET", "/api/leaderboard/around-me?radius=2", monkeypatch, headers=headers)
+    await _both(client, "GET", "/api/leaderboard/distribution?mode=walls", monkeypatch)
+
+
+@pytest.mark.asyncio
+async def test_write_endpoints_match_default(client, auth_token, monkeypatch):
+    headers = {"Authorization": f"Bearer {auth_token}"}
+
+    responses = []
+    for fast, score in ((True, 20), (False, 10)):
+        monkeypatch.setattr(config, "FAST_JSON_RESPONSES", fast)
+        responses.append(await client.post("/api/leaderboard", json={"score": score, "mode": "walls"}, headers=headers))
+    assert [r.json()["rank"] for r in responses] == [1, 2]
+    assert responses[0].content == _compact(responses[0].json())
+
+    response = await _both(
+        client, "PATCH", "/api/users/me", monkeypatch, json={"username": "renamed"}, headers=headers
+    )
+    assert response.json()["user"]["username"] == "renamed"
+
+    responses = []
+    for fast in (True, False):
+        monkeypatch.setattr(config, "FAST_JSON_RESPONSES", fast)
+        responses.append(await client.post("/api/auth/register", json={
+            "username": f"new{fast}", "email": f"new{fast}@example.com", "password": "password123",
+        }))
+    # Status codes declared on the route are kept
+    assert [r.status_code for r in responses] == [201, 201]
+    assert responses[0].json().keys() == responses[1].json().keys()
+    assert responses[0].content == _compact(responses[0].json())
@@ -0,0 +1,89 @@
+"""Integration tests for score percentiles and distributions"""
+import pytest
+from datetime import datetime, timedelta, UTC
+
+from app import config
+from app.score_distribution import ScoreDistribution, score_distribution
+
+
+async def _submit(client, auth_token, score, mode="walls"):
+    response = await client.post(
+        "/api/leaderboard",
+        json={"score": score, "mode": mode},
+        headers={"Authorization": f"Bearer {auth_token}"}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_submit_returns_percentile(client, auth_token):
+    for score in (10, 20, 30, 40):
+        await _submit(client, auth_token, score)
+
+    data = await _submit(client, auth_token, 35)
+    # 3 of the 5 walls games scored lower
+    assert data["percentile"] == 60.0
+    # Other modes are tracked separately
+    assert (await _submit(client, auth_token, 35, "passthrough"))["percentile"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_distribution_endpoint(client, auth_token, monkeypatch):
+    monkeypatch.setattr(config, "RATE_LIMIT_ENABLED", False)
+    response = await client.get("/api/leaderboard/distribution?mode=walls")
+    assert response.status_code == 200
+    assert response.json()["count"] == 0
+    assert response.json()["quantiles"] == []
+
+    for score in range(1, 101):
+        await _submit(client, auth_token, score)
+
+    data = (await client.get("/api/leaderboard/distribution?mode=walls&window=week")).json()
+    assert data["count"] == 100
+    median = next(item["score"] for item in data["quantiles"] if item["q"] == 0.5)
+    assert median == pytest.approx(50, rel=data["relativeAccuracy"])
+
+    response = await client.get("/api/leaderboard/distribution?mode=walls&window=year")
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_flush_persists_and_other_workers_load(client, db_session):
+    now = datetime.now(UTC)
+    worker = ScoreDistribution(days=7)
+    worker.add("walls", 100, now)
+    worker.add("walls", 200, now - timedelta(days=3))
+    worker.add("walls", 300, now - timedelta(days=10))
+    await worker.flush(now)
+
+    other = ScoreDistribution(days=7)
+    await other.load()
+    assert len(other.sketch("walls", "all")) == 3
+    assert len(other.sketch("walls", "week", now)) == 2
+    assert len(other.sketch("walls", "day", now)) == 1
+
+    # A second flush merges into the persisted rows rather than replacing them
+    other.add("walls", 400, now)
+    await other.flush(now)
+    await worker.load()
+    assert len(worker.sketch("walls", "all")) == 4
+    assert worker.percentile("walls", 250) == 50.0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_deltas(client, db_session, monkeypatch):
+    from app.database import db
+
+    async def fail(deltas):
+        raise RuntimeError("database down")
+
+    score_distribution.add("walls", 10)
+    monkeypatch.setattr(db, "merge_score_sketches", fail)
+    with pytest.raises(RuntimeError):
+        await score_distribution.flush()
+    monkeypatch.undo()
+
+    await score_distribution.flush()
+    await score_distribution.load()
+    assert len(score_distribution.sketch("walls")) == 1
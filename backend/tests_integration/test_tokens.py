@@ -0,0 +1,103 @@
+"""Integration tests for token expiry, revocation and pruning"""
+import pytest
+from datetime import datetime, timedelta, UTC
+from sqlalchemy import select, update
+
+from app import config
+from app.db.models import TokenModel
+from app.token_sweeper import TokenSweeper
+
+
+async def _login(client):
+    response = await client.post(
+        "/api/auth/login",
+        json={"email": "test@example.com", "password": "password123"}
+    )
+    assert response.status_code == 200
+    return response.json()["token"]
+
+
+async def _me(client, token):
+    return await client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+
+@pytest.mark.asyncio
+async def test_login_sets_expiry(client, auth_token, db_session):
+    token = (await db_session.execute(select(TokenModel).where(TokenModel.token == auth_token))).scalar_one()
+    assert token.expires_at - token.created_at == timedelta(seconds=config.TOKEN_TTL)
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_token(client, auth_token):
+    assert (await _me(client, auth_token)).status_code == 200
+
+    response = await client.post("/api/auth/logout", headers={"Authorization": f"Bearer {auth_token}"})
+    assert response.status_code == 200
+
+    assert (await _me(client, auth_token)).status_code == 401
+    # Logging out again is harmless
+    response = await client.post("/api/auth/logout", headers={"Authorization": f"Bearer {auth_token}"})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_expired_token_rejected(client, auth_token, db_session):
+    await db_session.execute(
+        update(TokenModel).where(TokenModel.token == auth_token)
+        .values(expires_at=datetime.now(UTC) - timedelta(seconds=1))
+    )
+    await db_session.commit()
+
+    assert (await _me(client, auth_token)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_token_without_expiry_uses_ttl(client, auth_token, db_session, monkeypatch):
+    """Tokens issued before expiry existed expire TOKEN_TTL after creation"""
+    await db_session.execute(
+        update(TokenModel).where(TokenModel.token == auth_token)
+        .values(expires_at=None, created_at=datetime.now(UTC) - timedelta(hours=2))
+    )
+    await db_session.commit()
+
+    monkeypatch.setattr(config, "TOKEN_TTL", 3 * 3600)
+    assert (await _me(client, auth_token)).status_code == 200
+
+    monkeypatch.setattr(config, "TOKEN_TTL", 3600)
+    from app.cache import token_cache
+    token_cache.discard()
+    assert (await _me(client, auth_token)).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_live_tokens_capped_per_user(client, test_user, monkeypatch):
+    monkeypatch.setattr(config, "TOKEN_MAX_PER_USER", 2)
+    first = await _login(client)
+    assert (await _me(client, first)).status_code == 200
+
+    second = await _login(client)
+    third = await _login(client)
+
+    assert (await _me(client, first)).status_code == 401
+    assert (await _me(client, second)).status_code == 200
+    assert (await _me(client, third)).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_sweeper_deletes_expired_tokens_in_batches(client, test_user, db_session):
+    now = datetime.now(UTC)
+    db_session.add_all(
+        [TokenModel(token=f"expired-{i}", user_id=test_user.id, created_at=now - timedelta(days=1),
+                    expires_at=now - timedelta(minutes=1)) for i in range(7)]
+        + [TokenModel(token="legacy", user_id=test_user.id,
+                      created_at=now - timedelta(seconds=config.TOKEN_TTL + 60), expires_at=None)]
+        + [TokenModel(token="live", user_id=test_user.id, created_at=now,
+                      expires_at=now + timedelta(hours=1))]
+    )
+    await db_session.commit()
+
+    assert await TokenSweeper(batch_size=3).run_once(now) == 8
+
+    remaining = (await db_session.execute(select(TokenModel.token))).scalars().all()
+    assert remaining == ["live"]
+    assert await TokenSweeper(batch_size=3).run_once(now) == 0
@@ -20,6 +20,7 @@ export interface LeaderboardEntry {
   username: string;
   score: number;
   mode: 'passthrough' | 'walls';
+  gridSize: number;
   date: Date;
 }
 
@@ -28,12 +29,15 @@ export interface ActiveGame {
   username: string;
   score: number;
   mode: 'passthrough' | 'walls';
+  gridSize: number;
   startedAt: Date;
 }
 
 export interface GameScore {
   score: number;
   mode: 'passthrough' | 'walls';
+  // One of 20, 50, 100, 200; the server assumes 20 when omitted
+  gridSize?: number;
 }
 
 // Helper for authorized requests
@@ -122,7 +126,7 @@ export const authApi = {
 
   async logout(): Promise<void> {
     try {
-        await fetch(`${API_BASE_URL}/auth/logout`, { method: 'POST' });
+        await fetch(`${API_BASE_URL}/auth/logout`, { method: 'POST', headers: getAuthHeaders() });
     } catch (e) {
         // Ignore errors on logout
     }
@@ -150,11 +154,22 @@ export const authApi = {
 };
 
 export const leaderboardApi = {
-  async getLeaderboard(mode?: 'passthrough' | 'walls'): Promise<LeaderboardEntry[]> {
-    const query = mode ? `?mode=${mode}` : '';
+  async getLeaderboard(
+    mode?: 'passthrough' | 'walls',
+    gridSize?: number,
+    page?: { offset: number; limit: number },
+  ): Promise<LeaderboardEntry[]> {
+    const params = new URLSearchParams();
+    if (mode) params.set('mode', mode);
+    if (gridSize) params.set('gridSize', String(gridSize));
+    if (page) {
+      params.set('offset', String(page.offset));
+      params.set('limit', String(page.limit));
+    }
+    const query = params.toString() ? `?${params}` : '';
+    // Rejects on failure, so the list keeps what it has loaded
     const response = await fetch(`${API_BASE_URL}/leaderboard${query}`);
-    if (!response.ok) return [];
-    return response.json();
+    return handleResponse(response);
   },
 
   async submitScore(score: GameScore): Promise<{ success: boolean; rank?: number }> {
@@ -174,18 +189,15 @@ export const leaderboardApi = {
 };
 
 export const liveGamesApi = {
-  async getActiveGames(): Promise<ActiveGame[]> {
-    try {
-        const response = await fetch(`${API_BASE_URL}/games/active`);
-        if (!response.ok) return [];
-        const data = await response.json();
-        return data.map((game: any) => ({
-            ...game,
-            startedAt: new Date(game.startedAt)
-        }));
-    } catch {
-        return [];
-    }
+  // Rejects on failure, so the list keeps what it has loaded
+  async getActiveGames(page?: { offset: number; limit: number }): Promise<ActiveGame[]> {
+    const query = page ? `?offset=${page.offset}&limit=${page.limit}` : '';
+    const response = await fetch(`${API_BASE_URL}/games/active${query}`);
+    const data = await handleResponse(response);
+    return data.map((game: any) => ({
+        ...game,
+        startedAt: new Date(game.startedAt)
+    }));
   },
 
   async getGameStream(gameId: string): Promise<ActiveGame | null> {
@@ -1,33 +1,42 @@
-import React, { useEffect, useState } from 'react';
+import React, { useCallback, useState } from 'react';
 import { LeaderboardEntry, leaderboardApi } from '@/api/mockApi';
-import { GameMode } from '@/hooks/useSnakeGame';
+import { DEFAULT_GRID_SIZE, GameMode, GridSize } from '@/hooks/useSnakeGame';
+import { GridSizeSelector } from '@/components/game/GridSizeSelector';
+import { VirtualList } from '@/components/VirtualList';
+import { usePagedList } from '@/hooks/usePagedList';
 import { cn } from '@/lib/utils';
 import { Trophy, Medal, Award, Repeat, Square } from 'lucide-react';
 
+const PAGE_SIZE = 50;
+const ROW_HEIGHT = 56;
+const VIEWPORT_HEIGHT = 560;
+const POLL_INTERVAL = 30000;
+
 interface LeaderboardProps {
   filterMode?: GameMode;
+  // Most entries to show; the whole board by default
   limit?: number;
   className?: string;
 }
 
 export const Leaderboard: React.FC<LeaderboardProps> = ({
   filterMode,
-  limit = 10,
+  limit,
   className,
 }) => {
-  const [entries, setEntries] = useState<LeaderboardEntry[]>([]);
-  const [loading, setLoading] = useState(true);
   const [selectedMode, setSelectedMode] = useState<GameMode | undefined>(filterMode);
+  const [gridSize, setGridSize] = useState<GridSize>(DEFAULT_GRID_SIZE);
 
-  useEffect(() => {
-    const fetchLeaderboard = async () => {
-      setLoading(true);
-      const data = await leaderboardApi.getLeaderboard(selectedMode);
-      setEntries(data.slice(0, limit));
-      setLoading(false);
-    };
-    fetchLeaderboard();
-  }, [selectedMode, limit]);
+  const fetchPage = useCallback(
+    (offset: number, pageLimit: number) =>
+      leaderboardApi.getLeaderboard(selectedMode, gridSize, { offset, limit: pageLimit }),
+    [selectedMode, gridSize],
+  );
+  const { items: entries, loading, loadMore } = usePagedList<LeaderboardEntry>(fetchPage, {
+    pageSize: PAGE_SIZE,
+    maxItems: limit,
+    pollInterval: POLL_INTERVAL,
+  });
 
   const getRankIcon = (rank: number) => {
     switch (rank) {
@@ -91,6 +100,9 @@ export const Leaderboard: React.FC<LeaderboardProps> = ({
         </div>
       )}
 
+      {/* Grid size filter: each board size has its own leaderboard */}
+      <GridSizeSelector gridSize={gridSize} onGridSizeChange={setGridSize} />
+
       {/* Leaderboard Table */}
       <div className="rounded-lg border-2 border-border overflow-hidden">
         <div className="grid grid-cols-[auto_1fr_auto_auto] gap-4 p-4 bg-muted/50 border-b border-border font-display text-sm uppercase tracking-wider text-muted-foreground">
@@ -109,12 +121,16 @@ export const Leaderboard: React.FC<LeaderboardProps> = ({
             No scores yet. Be the first!
           </div>
         ) : (
-          <div className="divide-y divide-border">
-            {entries.map((entry, index) => (
+          <VirtualList
+            items={entries}
+            rowHeight={ROW_HEIGHT}
+            height={VIEWPORT_HEIGHT}
+            getKey={entry => entry.id}
+            onEndReached={loadMore}
+            renderRow={(entry, index) => (
               <div
-                key={entry.id}
                 className={cn(
-                  "grid grid-cols-[auto_1fr_auto_auto] gap-4 p-4 items-center transition-colors hover:bg-muted/30",
+                  "grid grid-cols-[auto_1fr_auto_auto] gap-4 px-4 h-full items-center border-b border-border transition-colors hover:bg-muted/30",
                   index < 3 && "bg-muted/20"
                 )}
               >
@@ -139,8 +155,8 @@ export const Leaderboard: React.FC<LeaderboardProps> = ({
                   {entry.score}
                 </span>
               </div>
-            ))}
-          </div>
+            )}
+          />
         )}
       </div>
     </div>
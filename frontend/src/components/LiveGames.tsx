@@ -1,11 +1,21 @@
-import React, { useEffect, useState } from 'react';
+import React from 'react';
 import { ActiveGame, liveGamesApi } from '@/api/mockApi';
 import { cn } from '@/lib/utils';
 import { Eye, Users, Repeat, Square } from 'lucide-react';
 import { Button } from '@/components/ui/button';
+import { VirtualList } from '@/components/VirtualList';
+import { usePagedList } from '@/hooks/usePagedList';
+
+const PAGE_SIZE = 50;
+// An 80px card and the 16px gap below it
+const ROW_HEIGHT = 96;
+const VIEWPORT_HEIGHT = 576;
+const POLL_INTERVAL = 5000;
+
+const fetchPage = (offset: number, limit: number) => liveGamesApi.getActiveGames({ offset, limit });
 
 interface LiveGamesProps {
-  onWatchGame: (gameId: string) => void;
+  onWatchGame: (game: ActiveGame) => void;
   className?: string;
 }
 
@@ -13,27 +23,11 @@ export const LiveGames: React.FC<LiveGamesProps> = ({
   onWatchGame,
   className,
 }) => {
-  const [games, setGames] = useState<ActiveGame[]>([]);
-  const [loading, setLoading] = useState(true);
-
-  useEffect(() => {
-    const fetchGames = async () => {
-      const data = await liveGamesApi.getActiveGames();
-      setGames(data);
-      setLoading(false);
-    };
-    fetchGames();
-
-    // Simulate live updates
-    const interval = setInterval(() => {
-      setGames(prev => prev.map(game => ({
-        ...game,
-        score: game.score + Math.floor(Math.random() * 5),
-      })));
-    }, 2000);
-
-    return () => clearInterval(interval);
-  }, []);
+  // Polled while the tab is visible, so scores stay live
+  const { items: games, loading, hasMore, loadMore } = usePagedList<ActiveGame>(fetchPage, {
+    pageSize: PAGE_SIZE,
+    pollInterval: POLL_INTERVAL,
+  });
 
   const getModeIcon = (mode: 'passthrough' | 'walls') => {
     return mode === 'passthrough' 
@@ -46,7 +40,7 @@ export const LiveGames: React.FC<LiveGamesProps> = ({
       <div className="flex items-center gap-2 text-muted-foreground">
         <Users className="h-5 w-5" />
         <span className="font-display uppercase tracking-wider text-sm">
-          {games.length} Players Online
+          {games.length}{hasMore && '+'} Players Online
         </span>
         <span className="relative flex h-3 w-3">
           <span className="animate-ping absolute inline-flex h-full w-full rounded-full bg-primary opacity-75"></span>
@@ -63,13 +57,15 @@ export const LiveGames: React.FC<LiveGamesProps> = ({
           No games currently being played
         </div>
       ) : (
-        <div className="grid gap-4">
-          {games.map((game) => (
-            <div
-              key={game.id}
-              className="p-4 rounded-lg border-2 border-border bg-card hover:border-primary/50 transition-all"
-            >
-              <div className="flex items-center justify-between">
+        <VirtualList
+          items={games}
+          rowHeight={ROW_HEIGHT}
+          height={VIEWPORT_HEIGHT}
+          getKey={game => game.id}
+          onEndReached={loadMore}
+          renderRow={game => (
+            <div className="h-20 px-4 flex items-center rounded-lg border-2 border-border bg-card hover:border-primary/50 transition-all">
+              <div className="flex flex-1 items-center justify-between">
                 <div className="space-y-1">
                   <div className="flex items-center gap-2">
                     <span className="font-medium text-foreground">
@@ -89,15 +85,15 @@ export const LiveGames: React.FC<LiveGamesProps> = ({
                 <Button
                   variant="outline"
                   size="sm"
-                  onClick={() => onWatchGame(game.id)}
+                  onClick={() => onWatchGame(game)}
                 >
                   <Eye className="mr-2 h-4 w-4" />
                   Watch
                 </Button>
               </div>
             </div>
-          ))}
-        </div>
+          )}
+        />
       )}
     </div>
   );
@@ -0,0 +1,39 @@
+import { render, screen, fireEvent } from '@testing-library/react';
+import { VirtualList } from './VirtualList';
+import { describe, it, expect, vi } from 'vitest';
+
+describe('VirtualList', () => {
+  const items = Array.from({ length: 1000 }, (_, i) => `Row ${i}`);
+  const renderList = (onEndReached = vi.fn()) => render(
+    <VirtualList
+      items={items}
+      rowHeight={50}
+      height={500}
+      overscan={2}
+      endThreshold={10}
+      getKey={item => item}
+      renderRow={item => <span>{item}</span>}
+      onEndReached={onEndReached}
+    />
+  );
+
+  it('should only mount the visible rows', () => {
+    renderList();
+
+    expect(screen.getByText('Row 0')).toBeInTheDocument();
+    expect(screen.getByText('Row 11')).toBeInTheDocument();
+    expect(screen.queryByText('Row 12')).not.toBeInTheDocument();
+  });
+
+  it('should mount the rows scrolled into view and ask for more near the end', () => {
+    const onEndReached = vi.fn();
+    const { container } = renderList(onEndReached);
+    expect(onEndReached).not.toHaveBeenCalled();
+
+    fireEvent.scroll(container.firstElementChild!, { target: { scrollTop: 49500 } });
+
+    expect(screen.getByText('Row 999')).toBeInTheDocument();
+    expect(screen.queryByText('Row 0')).not.toBeInTheDocument();
+    expect(onEndReached).toHaveBeenCalled();
+  });
+});
@@ -0,0 +1,73 @@
+import React, { useEffect, useState } from 'react';
+import { cn } from '@/lib/utils';
+
+interface VirtualListProps<T> {
+  items: T[];
+  // Every row is this many pixels tall
+  rowHeight: number;
+  // Viewport height in pixels; shorter when the items do not fill it
+  height: number;
+  renderRow: (item: T, index: number) => React.ReactNode;
+  getKey: (item: T, index: number) => React.Key;
+  // Rows mounted above and below the visible ones, for smooth scrolling
+  overscan?: number;
+  // Called when the last mounted row is within endThreshold rows of the
+  // end of items, to fetch the next page before it is scrolled into view
+  onEndReached?: () => void;
+  endThreshold?: number;
+  className?: string;
+}
+
+/**
+ * Windowed list: only the rows in (and just around) the viewport are
+ * mounted, positioned inside a spacer as tall as the whole list, so mount
+ * and scroll cost depend on the viewport rather than the number of items.
+ */
+export function VirtualList<T>({
+  items,
+  rowHeight,
+  height,
+  renderRow,
+  getKey,
+  overscan = 5,
+  onEndReached,
+  endThreshold = 20,
+  className,
+}: VirtualListProps<T>) {
+  const [scrollTop, setScrollTop] = useState(0);
+  const viewport = Math.min(height, items.length * rowHeight);
+  const start = Math.max(0, Math.floor(scrollTop / rowHeight) - overscan);
+  const end = Math.min(items.length, Math.ceil((scrollTop + height) / rowHeight) + overscan);
+
+  useEffect(() => {
+    if (onEndReached && items.length - end <= endThreshold) {
+      onEndReached();
+    }
+  }, [end, items.length, endThreshold, onEndReached]);
+
+  const rows: React.ReactNode[] = [];
+  for (let index = start; index < end; index++) {
+    const item = items[index];
+    rows.push(
+      <div
+        key={getKey(item, index)}
+        className="absolute inset-x-0"
+        style={{ top: index * rowHeight, height: rowHeight }}
+      >
+        {renderRow(item, index)}
+      </div>
+    );
+  }
+
+  return (
+    <div
+      className={cn("overflow-y-auto", className)}
+      style={{ height: viewport }}
+      onScroll={event => setScrollTop(event.currentTarget.scrollTop)}
+    >
+      <div className="relative" style={{ height: items.length * rowHeight }}>
+        {rows}
+      </div>
+    </div>
+  );
+}
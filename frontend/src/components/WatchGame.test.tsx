@@ -0,0 +1,12 @@
+import { render, screen } from '@testing-library/react';
+import { WatchGame } from './WatchGame';
+import { describe, it, expect, vi } from 'vitest';
+
+describe('WatchGame', () => {
+  it('should show the watched game on its own grid size', () => {
+    render(<WatchGame playerName="bot-a1b2c3-4" mode="walls" gridSize={50} onBack={vi.fn()} />);
+
+    expect(screen.getByText('Watching bot-a1b2c3-4')).toBeInTheDocument();
+    expect(screen.getByText('· 50×50')).toBeInTheDocument();
+  });
+});
@@ -1,6 +1,7 @@
 import React from 'react';
 import { GameBoard } from '@/components/game/GameBoard';
-import { useSimulatedGame, GameMode } from '@/hooks/useSnakeGame';
+import { useSimulatedGame, GameMode, GridSize } from '@/hooks/useSnakeGame';
+import { gridSizeLabel } from '@/components/game/GridSizeSelector';
 import { Button } from '@/components/ui/button';
 import { ArrowLeft, Repeat, Square } from 'lucide-react';
 import { cn } from '@/lib/utils';
@@ -8,15 +9,17 @@ import { cn } from '@/lib/utils';
 interface WatchGameProps {
   playerName: string;
   mode: GameMode;
+  gridSize: GridSize;
   onBack: () => void;
 }
 
 export const WatchGame: React.FC<WatchGameProps> = ({
   playerName,
   mode,
+  gridSize,
   onBack,
 }) => {
-  const gameState = useSimulatedGame(mode);
+  const gameState = useSimulatedGame(mode, gridSize);
 
   return (
     <div className="space-y-6">
@@ -54,6 +57,7 @@ export const WatchGame: React.FC<WatchGameProps> = ({
               <span>Walls Mode</span>
             </>
           )}
+          <span>· {gridSizeLabel(gridSize)}</span>
         </div>
       </div>
 
@@ -65,7 +69,7 @@ export const WatchGame: React.FC<WatchGameProps> = ({
 
       {/* Game Board */}
       <div className="flex justify-center">
-        <GameBoard gameState={gameState} isSpectating />
+        <GameBoard gameState={gameState} isSpectating renderer="offscreen" />
       </div>
 
       {/* Info */}
@@ -0,0 +1,119 @@
+import React, { useEffect, useRef } from 'react';
+import { Position } from '@/hooks/useSnakeGame';
+import {
+  BoardPalette,
+  BoardRenderer,
+  BoardWorkerMessage,
+  DEFAULT_PALETTE,
+  toCellIndices,
+} from '@/lib/boardRenderer';
+
+interface BoardCanvasProps {
+  snake: Position[];
+  food: Position;
+  gridSize: number;
+  // Draw from a worker through an OffscreenCanvas where the browser supports it
+  offscreen?: boolean;
+}
+
+interface BoardSink {
+  resize: (width: number, height: number) => void;
+  draw: (snake: readonly Position[], food: Position) => void;
+  dispose: () => void;
+}
+
+const supportsOffscreen = () =>
+  typeof Worker !== 'undefined' &&
+  typeof OffscreenCanvas !== 'undefined' &&
+  typeof HTMLCanvasElement.prototype.transferControlToOffscreen === 'function';
+
+const readPalette = (): BoardPalette => {
+  const style = getComputedStyle(document.documentElement);
+  const color = (name: string, fallback: string) => {
+    const value = style.getPropertyValue(name).trim();
+    return value ? `hsl(${value})` : fallback;
+  };
+  return {
+    head: color('--snake-head', DEFAULT_PALETTE.head),
+    body: color('--snake-body', DEFAULT_PALETTE.body),
+    food: color('--food', DEFAULT_PALETTE.food),
+  };
+};
+
+const createMainThreadSink = (canvas: HTMLCanvasElement, gridSize: number, palette: BoardPalette): BoardSink | null => {
+  const ctx = canvas.getContext('2d');
+  if (!ctx) return null;
+  const renderer = new BoardRenderer(ctx, gridSize, palette);
+  return {
+    resize: (width, height) => renderer.resize(width, height),
+    draw: (snake, food) => renderer.render(snake, food),
+    dispose: () => {},
+  };
+};
+
+const createWorkerSink = (canvas: HTMLCanvasElement, gridSize: number, palette: BoardPalette): BoardSink => {
+  const worker = new Worker(new URL('../../workers/boardRenderer.worker.ts', import.meta.url), { type: 'module' });
+  const offscreen = canvas.transferControlToOffscreen();
+  const post = (message: BoardWorkerMessage, transfer: Transferable[] = []) => worker.postMessage(message, transfer);
+  post({ type: 'init', canvas: offscreen, gridSize, palette }, [offscreen]);
+  return {
+    resize: (width, height) => post({ type: 'resize', width, height }),
+    draw: (snake, food) => {
+      // A fresh buffer each frame, transferred rather than copied
+      const cells = toCellIndices(snake, gridSize);
+      post({ type: 'render', cells, food: food.y * gridSize + food.x }, [cells.buffer]);
+    },
+    dispose: () => worker.terminate(),
+  };
+};
+
+/**
+ * Canvas layer of a GameBoard. The canvas is created by the effect rather
+ * than rendered by React: control of a canvas can be transferred to a worker
+ * only once, so each setup (grid size change, StrictMode re-run) gets its own.
+ */
+export const BoardCanvas: React.FC<BoardCanvasProps> = ({ snake, food, gridSize, offscreen = false }) => {
+  const hostRef = useRef<HTMLDivElement>(null);
+  const sinkRef = useRef<BoardSink | null>(null);
+  const frameRef = useRef({ snake, food });
+  frameRef.current = { snake, food };
+
+  useEffect(() => {
+    const host = hostRef.current;
+    if (!host) return;
+    const canvas = document.createElement('canvas');
+    canvas.style.width = '100%';
+    canvas.style.height = '100%';
+    canvas.style.display = 'block';
+    host.appendChild(canvas);
+
+    const palette = readPalette();
+    const sink = offscreen && supportsOffscreen()
+      ? createWorkerSink(canvas, gridSize, palette)
+      : createMainThreadSink(canvas, gridSize, palette);
+
+    const fit = () => {
+      if (!sink) return;
+      const ratio = window.devicePixelRatio || 1;
+      sink.resize(Math.max(1, Math.round(host.clientWidth * ratio)), Math.max(1, Math.round(host.clientHeight * ratio)));
+      sink.draw(frameRef.current.snake, frameRef.current.food);
+    };
+    fit();
+    const observer = typeof ResizeObserver !== 'undefined' ? new ResizeObserver(fit) : null;
+    observer?.observe(host);
+    sinkRef.current = sink;
+
+    return () => {
+      observer?.disconnect();
+      sink?.dispose();
+      sinkRef.current = null;
+      canvas.remove();
+    };
+  }, [gridSize, offscreen]);
+
+  useEffect(() => {
+    sinkRef.current?.draw(snake, food);
+  }, [snake, food]);
+
+  return <div ref={hostRef} className="absolute inset-0" data-testid="board-canvas" />;
+};
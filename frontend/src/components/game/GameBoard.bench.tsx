@@ -0,0 +1,57 @@
+// Render time per tick of a moving snake: DOM renderer vs canvas renderer.
+// Run with `npm run bench`. jsdom does not rasterise, so the canvas side
+// measures the renderer's own work against a context that draws
+// nothing, and the DOM side React's reconciliation and style updates.
+import { render } from '@testing-library/react';
+import { bench, describe } from 'vitest';
+import { GameBoard } from './GameBoard';
+import { BoardRenderer } from '@/lib/boardRenderer';
+import { GameState, Position } from '@/hooks/useSnakeGame';
+
+const noopContext = (size: number) => ({
+  canvas: { width: size, height: size },
+  fillStyle: '',
+  clearRect: () => {},
+  fillRect: () => {},
+}) as unknown as CanvasRenderingContext2D;
+
+// A snake of the given length snaking across rows, advanced one cell per tick
+const movingSnake = (gridSize: number, length: number) => {
+  const path: Position[] = [];
+  for (let y = 0; y < gridSize; y++) {
+    for (let i = 0; i < gridSize; i++) {
+      path.push({ x: y % 2 ? gridSize - 1 - i : i, y });
+    }
+  }
+  let tick = 0;
+  return (): Position[] => {
+    tick = (tick + 1) % (path.length - length);
+    return path.slice(tick, tick + length).reverse();
+  };
+};
+
+const state = (snake: Position[], gridSize: number): GameState => ({
+  snake,
+  food: { x: 0, y: gridSize - 1 },
+  direction: 'RIGHT',
+  score: 0,
+  status: 'playing',
+  mode: 'walls',
+  gridSize,
+});
+
+for (const [gridSize, length] of [[20, 60], [100, 1000], [200, 4000]] as const) {
+  describe(`${gridSize}x${gridSize} board, snake of ${length}`, () => {
+    const domNext = movingSnake(gridSize, length);
+    const view = render(<GameBoard gameState={state(domNext(), gridSize)} />);
+    bench('dom', () => {
+      view.rerender(<GameBoard gameState={state(domNext(), gridSize)} />);
+    });
+
+    const canvasNext = movingSnake(gridSize, length);
+    const renderer = new BoardRenderer(noopContext(500), gridSize);
+    bench('canvas', () => {
+      renderer.render(canvasNext(), { x: 0, y: gridSize - 1 });
+    });
+  });
+}
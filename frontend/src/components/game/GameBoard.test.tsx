@@ -17,9 +17,11 @@ describe('GameBoard', () => {
   it('should render the snake and food', () => {
     const { container } = render(<GameBoard gameState={mockGameState} />);
     
-    // Check for snake segments (all have transition-all)
-    const snakeSegments = container.querySelectorAll('.transition-all');
+    // Check for snake segments (all have rounded-sm)
+    const snakeSegments = container.querySelectorAll('.rounded-sm');
     expect(snakeSegments.length).toBe(3); // Head + 2 body
+    // Segments jump to their new cells rather than animating there
+    expect(container.querySelectorAll('.transition-all')).toHaveLength(0);
 
     // Check for food
     const food = container.querySelector('[style*="hsl(var(--food))"]');
@@ -49,4 +51,11 @@ describe('GameBoard', () => {
     const walls = container.querySelector('[style*="hsl(var(--destructive) / 0.5)"]');
     expect(walls).not.toBeInTheDocument();
   });
+
+  it('should draw on a canvas instead of segment elements with the canvas renderer', () => {
+    const { container, getByTestId } = render(<GameBoard gameState={mockGameState} renderer="canvas" />);
+
+    expect(getByTestId('board-canvas').querySelector('canvas')).toBeInTheDocument();
+    expect(container.querySelector('[style*="hsl(var(--food))"]')).not.toBeInTheDocument();
+  });
 });
@@ -1,26 +1,40 @@
 import React from 'react';
 import { GameState } from '@/hooks/useSnakeGame';
 import { cn } from '@/lib/utils';
+import { BoardCanvas } from './BoardCanvas';
+
+// Above this size cells are a few pixels wide: glows and rounded corners
+// cost more to paint than they show, so the DOM renderer draws plain cells
+const DETAILED_MAX_GRID_SIZE = 20;
+
+// "dom": an element per segment; "canvas": one canvas repainting only
+// changed cells; "offscreen": the same canvas drawn from a worker, falling
+// back to "canvas" where OffscreenCanvas is unavailable
+export type BoardRendererKind = 'dom' | 'canvas' | 'offscreen';
 
 interface GameBoardProps {
   gameState: GameState;
   className?: string;
   isSpectating?: boolean;
+  renderer?: BoardRendererKind;
 }
 
 export const GameBoard: React.FC<GameBoardProps> = ({ 
   gameState, 
   className,
-  isSpectating = false 
+  isSpectating = false,
+  renderer = 'dom',
 }) => {
   const { snake, food, gridSize } = gameState;
   const cellSize = 100 / gridSize;
+  const detailed = gridSize <= DETAILED_MAX_GRID_SIZE;
 
   return (
     <div 
       className={cn(
         "relative aspect-square w-full max-w-[500px] rounded-lg border-2 border-primary overflow-hidden",
-        "bg-background grid-pattern",
+        "bg-background",
+        detailed && "grid-pattern",
         isSpectating ? "box-glow-pink" : "box-glow",
         className
       )}
@@ -30,45 +44,58 @@ export const GameBoard: React.FC<GameBoardProps> = ({
           : '0 0 30px hsl(var(--primary) / 0.4), inset 0 0 60px hsl(var(--primary) / 0.1)',
       }}
     >
-      {/* Food */}
-      <div
-        className="absolute rounded-full animate-food-pulse"
-        style={{
-          left: `${food.x * cellSize}%`,
-          top: `${food.y * cellSize}%`,
-          width: `${cellSize}%`,
-          height: `${cellSize}%`,
-          backgroundColor: 'hsl(var(--food))',
-          boxShadow: '0 0 15px hsl(var(--food) / 0.8), 0 0 30px hsl(var(--food) / 0.5)',
-        }}
-      />
-
-      {/* Snake */}
-      {snake.map((segment, index) => {
-        const isHead = index === 0;
-        return (
+      {renderer !== 'dom' ? (
+        <BoardCanvas snake={snake} food={food} gridSize={gridSize} offscreen={renderer === 'offscreen'} />
+      ) : (
+        <>
+          {/* Food */}
           <div
-            key={`${segment.x}-${segment.y}-${index}`}
-            className={cn(
-              "absolute rounded-sm transition-all duration-75",
-              isHead && "rounded-md"
-            )}
+            className="absolute rounded-full animate-food-pulse"
             style={{
-              left: `${segment.x * cellSize}%`,
-              top: `${segment.y * cellSize}%`,
+              left: `${food.x * cellSize}%`,
+              top: `${food.y * cellSize}%`,
               width: `${cellSize}%`,
               height: `${cellSize}%`,
-              backgroundColor: isHead 
-                ? 'hsl(var(--snake-head))' 
-                : `hsl(160 ${80 - index * 2}% ${45 - index}%)`,
-              boxShadow: isHead 
-                ? '0 0 10px hsl(var(--snake-head) / 0.8), 0 0 20px hsl(var(--snake-head) / 0.5)'
-                : '0 0 5px hsl(var(--snake-body) / 0.5)',
-              transform: isHead ? 'scale(1.1)' : 'scale(0.95)',
+              backgroundColor: 'hsl(var(--food))',
+              boxShadow: detailed ? '0 0 15px hsl(var(--food) / 0.8), 0 0 30px hsl(var(--food) / 0.5)' : undefined,
             }}
           />
-        );
-      })}
+
+          {/* Snake */}
+          {snake.map((segment, index) => {
+            const isHead = index === 0;
+            return (
+              <div
+                // Keyed by position in the snake: a move restyles segments
+                // instead of remounting every one of them. No transitions:
+                // every segment moves each step, and a wrapping head would
+                // slide across the whole board
+                key={index}
+                className={cn(
+                  "absolute",
+                  detailed && "rounded-sm",
+                  detailed && isHead && "rounded-md"
+                )}
+                style={{
+                  left: `${segment.x * cellSize}%`,
+                  top: `${segment.y * cellSize}%`,
+                  width: `${cellSize}%`,
+                  height: `${cellSize}%`,
+                  backgroundColor: isHead 
+                    ? 'hsl(var(--snake-head))' 
+                    : `hsl(160 ${Math.max(20, 80 - index * 2)}% ${Math.max(15, 45 - index)}%)`,
+                  boxShadow: !detailed
+                    ? undefined
+                    : isHead
+                      ? '0 0 10px hsl(var(--snake-head) / 0.8), 0 0 20px hsl(var(--snake-head) / 0.5)'
+                      : '0 0 5px hsl(var(--snake-body) / 0.5)',
+                  transform: detailed ? (isHead ? 'scale(1.1)' : 'scale(0.95)') : undefined,
+                }}
+              />
+            );
+          })}
+        </>
+      )}
 
       {/* Walls indicator for walls mode */}
       {gameState.mode === 'walls' && (
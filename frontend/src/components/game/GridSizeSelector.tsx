@@ -0,0 +1,39 @@
+import React from 'react';
+import { GRID_SIZES, GridSize } from '@/hooks/useSnakeGame';
+import { cn } from '@/lib/utils';
+
+interface GridSizeSelectorProps {
+  gridSize: GridSize;
+  onGridSizeChange: (gridSize: GridSize) => void;
+  disabled?: boolean;
+}
+
+export const gridSizeLabel = (gridSize: number) =>
+  gridSize === 200 ? 'Arena' : `${gridSize}×${gridSize}`;
+
+export const GridSizeSelector: React.FC<GridSizeSelectorProps> = ({
+  gridSize,
+  onGridSizeChange,
+  disabled = false,
+}) => {
+  return (
+    <div className="flex gap-2">
+      {GRID_SIZES.map(size => (
+        <button
+          key={size}
+          onClick={() => onGridSizeChange(size)}
+          disabled={disabled}
+          className={cn(
+            "px-3 py-2 rounded-lg border-2 font-display text-xs uppercase tracking-wider transition-all",
+            "disabled:opacity-50 disabled:cursor-not-allowed",
+            gridSize === size
+              ? "border-primary bg-primary/10 text-primary"
+              : "border-border text-muted-foreground hover:border-primary/50"
+          )}
+        >
+          {gridSizeLabel(size)}
+        </button>
+      ))}
+    </div>
+  );
+};
@@ -0,0 +1,42 @@
+import { renderHook, act } from '@testing-library/react';
+import { usePolling } from './usePageVisibility';
+import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest';
+
+const setVisibility = (state: 'visible' | 'hidden') => {
+  Object.defineProperty(document, 'visibilityState', { value: state, configurable: true });
+  document.dispatchEvent(new Event('visibilitychange'));
+};
+
+describe('usePolling', () => {
+  beforeEach(() => {
+    vi.useFakeTimers();
+  });
+
+  afterEach(() => {
+    setVisibility('visible');
+    vi.useRealTimers();
+  });
+
+  it('should pause while the page is hidden and catch up when it is shown', () => {
+    const callback = vi.fn();
+    renderHook(() => usePolling(callback, 1000));
+
+    act(() => {
+      vi.advanceTimersByTime(2500);
+    });
+    expect(callback).toHaveBeenCalledTimes(2);
+
+    act(() => {
+      setVisibility('hidden');
+    });
+    act(() => {
+      vi.advanceTimersByTime(10000);
+    });
+    expect(callback).toHaveBeenCalledTimes(2);
+
+    act(() => {
+      setVisibility('visible');
+    });
+    expect(callback).toHaveBeenCalledTimes(3);
+  });
+});
@@ -0,0 +1,42 @@
+import { useEffect, useRef, useState } from 'react';
+
+const isVisible = () => typeof document === 'undefined' || document.visibilityState !== 'hidden';
+
+/** Whether the page is visible, following the Page Visibility API */
+export function usePageVisibility() {
+  const [visible, setVisible] = useState(isVisible);
+
+  useEffect(() => {
+    const onChange = () => setVisible(isVisible());
+    document.addEventListener('visibilitychange', onChange);
+    return () => document.removeEventListener('visibilitychange', onChange);
+  }, []);
+
+  return visible;
+}
+
+/**
+ * Call callback every interval milliseconds while the page is visible.
+ * Polling stops while the tab is hidden and catches up with one call as
+ * soon as it is visible again. A null interval disables polling.
+ */
+export function usePolling(callback: () => void, interval: number | null) {
+  const visible = usePageVisibility();
+  const callbackRef = useRef(callback);
+  callbackRef.current = callback;
+  const missedRef = useRef(false);
+
+  useEffect(() => {
+    if (interval === null) return;
+    if (!visible) {
+      missedRef.current = true;
+      return;
+    }
+    if (missedRef.current) {
+      missedRef.current = false;
+      callbackRef.current();
+    }
+    const timer = window.setInterval(() => callbackRef.current(), interval);
+    return () => clearInterval(timer);
+  }, [interval, visible]);
+}
@@ -0,0 +1,62 @@
+import { renderHook, act, waitFor } from '@testing-library/react';
+import { usePagedList, MAX_PAGE_SIZE } from './usePagedList';
+import { describe, it, expect, vi } from 'vitest';
+
+const rows = (from: number, to: number) =>
+  Array.from({ length: to - from }, (_, i) => ({ id: `row-${from + i}` }));
+
+describe('usePagedList', () => {
+  it('should not repeat items that shift onto the next page', async () => {
+    const fetchPage = vi.fn()
+      .mockResolvedValueOnce(rows(0, 3))
+      // A new item at the top pushed row-2 onto the second page
+      .mockResolvedValueOnce(rows(2, 5));
+    const { result } = renderHook(() => usePagedList(fetchPage, { pageSize: 3 }));
+    await waitFor(() => expect(result.current.items).toHaveLength(3));
+
+    act(() => result.current.loadMore());
+
+    await waitFor(() => expect(result.current.items).toHaveLength(5));
+    expect(result.current.items.map(item => item.id)).toEqual(rows(0, 5).map(item => item.id));
+  });
+
+  it('should refresh only the first page and keep the rest', async () => {
+    const fetchPage = vi.fn()
+      .mockResolvedValueOnce(rows(0, 2))
+      .mockResolvedValueOnce(rows(2, 4))
+      .mockResolvedValueOnce([{ id: 'new' }, { id: 'row-0' }]);
+    const { result } = renderHook(() => usePagedList(fetchPage, { pageSize: 2 }));
+    await waitFor(() => expect(result.current.items).toHaveLength(2));
+    act(() => result.current.loadMore());
+    await waitFor(() => expect(result.current.items).toHaveLength(4));
+
+    act(() => result.current.refresh());
+
+    await waitFor(() => expect(result.current.items[0].id).toBe('new'));
+    expect(fetchPage).toHaveBeenLastCalledWith(0, 2);
+    expect(result.current.items.map(item => item.id)).toEqual(['new', 'row-0', 'row-2', 'row-3']);
+  });
+
+  it('should keep what is loaded when a refresh fails or comes back empty', async () => {
+    const fetchPage = vi.fn()
+      .mockResolvedValueOnce(rows(0, 2))
+      .mockRejectedValueOnce(new Error('offline'))
+      .mockResolvedValueOnce([]);
+    const { result } = renderHook(() => usePagedList(fetchPage, { pageSize: 2 }));
+    await waitFor(() => expect(result.current.items).toHaveLength(2));
+
+    await act(async () => result.current.refresh());
+    await act(async () => result.current.refresh());
+
+    expect(fetchPage).toHaveBeenCalledTimes(3);
+    expect(result.current.items).toHaveLength(2);
+    expect(result.current.hasMore).toBe(true);
+  });
+
+  it('should never ask for more than the API serves in one page', async () => {
+    const fetchPage = vi.fn().mockResolvedValue([]);
+    renderHook(() => usePagedList(fetchPage, { pageSize: 5000 }));
+
+    await waitFor(() => expect(fetchPage).toHaveBeenCalledWith(0, MAX_PAGE_SIZE));
+  });
+});
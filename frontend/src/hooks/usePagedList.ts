@@ -0,0 +1,115 @@
+import { useCallback, useEffect, useRef, useState } from 'react';
+import { usePolling } from './usePageVisibility';
+
+export type FetchPage<T> = (offset: number, limit: number) => Promise<T[]>;
+
+// Largest page the API serves
+export const MAX_PAGE_SIZE = 1000;
+
+interface PagedListOptions {
+  pageSize?: number;
+  // Most items to load in total; unlimited by default
+  maxItems?: number;
+  // Reload the first page this often (ms) while the page is visible
+  pollInterval?: number | null;
+}
+
+// Items of page not already in items, appended to them. Offset paging over
+// a list that changes between requests can return an item twice.
+function appendUnique<T extends { id: string }>(items: T[], page: T[]): T[] {
+  const seen = new Set(items.map(item => item.id));
+  const added: T[] = [];
+  for (const item of page) {
+    if (!seen.has(item.id)) {
+      seen.add(item.id);
+      added.push(item);
+    }
+  }
+  return added.length ? items.concat(added) : items;
+}
+
+/**
+ * Items of a paginated list, loaded a page at a time by loadMore(). A new
+ * fetchPage (e.g. another filter) starts over from the first page; pass a
+ * memoised function. Responses for a superseded fetchPage are dropped.
+ * fetchPage should reject when a request fails, so a failed load or
+ * refresh keeps what is loaded.
+ */
+export function usePagedList<T extends { id: string }>(
+  fetchPage: FetchPage<T>,
+  { pageSize = 50, maxItems = Infinity, pollInterval = null }: PagedListOptions = {},
+) {
+  const [items, setItems] = useState<T[]>([]);
+  const [loading, setLoading] = useState(true);
+  const [hasMore, setHasMore] = useState(true);
+  const itemsRef = useRef<T[]>([]);
+  const hasMoreRef = useRef(true);
+  const busyRef = useRef(false);
+  const generationRef = useRef(0);
+  const pageLimit = Math.min(pageSize, MAX_PAGE_SIZE);
+
+  // Fetch a page and combine it with the loaded items into the new items
+  // and whether there are more; combine returns null to keep them as they are
+  const load = useCallback((
+    offset: number,
+    limit: number,
+    combine: (page: T[]) => { items: T[]; hasMore: boolean } | null,
+  ) => {
+    const generation = generationRef.current;
+    busyRef.current = true;
+    fetchPage(offset, limit)
+      .catch(() => null)
+      .then(page => {
+        if (generation !== generationRef.current) return;
+        busyRef.current = false;
+        setLoading(false);
+        const next = page && combine(page);
+        if (!next) return;
+        itemsRef.current = next.items;
+        hasMoreRef.current = next.hasMore && next.items.length < maxItems;
+        setItems(next.items);
+        setHasMore(hasMoreRef.current);
+      });
+  }, [fetchPage, maxItems]);
+
+  useEffect(() => {
+    generationRef.current++;
+    itemsRef.current = [];
+    hasMoreRef.current = true;
+    setItems([]);
+    setLoading(true);
+    setHasMore(true);
+    const limit = Math.min(pageLimit, maxItems);
+    load(0, limit, page => ({ items: page, hasMore: page.length === limit }));
+  }, [load, pageLimit, maxItems]);
+
+  const loadMore = useCallback(() => {
+    const loaded = itemsRef.current.length;
+    if (busyRef.current || !hasMoreRef.current || loaded >= maxItems) return;
+    const limit = Math.min(pageLimit, maxItems - loaded);
+    load(loaded, limit, page => ({
+      items: appendUnique(itemsRef.current, page),
+      hasMore: page.length === limit,
+    }));
+  }, [load, pageLimit, maxItems]);
+
+  // Re-fetch the first page and put it in front of the other loaded pages.
+  // An empty refresh is taken for a hiccup and keeps what is loaded.
+  const refresh = useCallback(() => {
+    if (busyRef.current) return;
+    const limit = Math.min(pageLimit, maxItems);
+    load(0, limit, page => {
+      if (page.length === 0) return null;
+      // A short first page is the whole list
+      if (page.length < limit) return { items: page, hasMore: false };
+      return {
+        items: appendUnique(page, itemsRef.current.slice(limit)),
+        hasMore: hasMoreRef.current,
+      };
+    });
+  }, [load, pageLimit, maxItems]);
+
+  usePolling(refresh, pollInterval);
+
+  return { items, loading, hasMore, loadMore, refresh };
+}
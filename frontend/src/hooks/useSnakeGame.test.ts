@@ -20,6 +20,30 @@ describe('useSnakeGame', () => {
     expect(result.current.gameState.direction).toBe('RIGHT');
   });
 
+  it('should place food off the snake', () => {
+    const { result } = renderHook(() => useSnakeGame());
+    const { snake, food } = result.current.gameState;
+
+    expect(snake.some(segment => segment.x === food.x && segment.y === food.y)).toBe(false);
+  });
+
+  it('should start in the centre of a larger grid', () => {
+    const { result, rerender } = renderHook(({ gridSize }) => useSnakeGame('walls', gridSize), {
+      initialProps: { gridSize: 200 as const } as { gridSize: 20 | 200 },
+    });
+
+    expect(result.current.gameState.gridSize).toBe(200);
+    expect(result.current.gameState.snake[0]).toEqual({ x: 100, y: 100 });
+
+    rerender({ gridSize: 20 });
+    act(() => {
+      result.current.resetGame();
+    });
+
+    expect(result.current.gameState.gridSize).toBe(20);
+    expect(result.current.gameState.snake[0]).toEqual({ x: 10, y: 10 });
+  });
+
   it('should start the game', () => {
     const { result } = renderHook(() => useSnakeGame());
     
@@ -49,6 +73,21 @@ describe('useSnakeGame', () => {
     expect(newHead.y).toBe(initialHead.y);
   });
 
+  it('should not re-render between steps', () => {
+    const { result } = renderHook(() => useSnakeGame());
+
+    act(() => {
+      result.current.startGame();
+    });
+    const before = result.current.gameState;
+
+    act(() => {
+      vi.advanceTimersByTime(100); // Frames run, but no step is due yet
+    });
+
+    expect(result.current.gameState).toBe(before);
+  });
+
   it('should change direction', () => {
     const { result } = renderHook(() => useSnakeGame());
     
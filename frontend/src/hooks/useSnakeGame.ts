@@ -1,4 +1,6 @@
 import { useState, useCallback, useEffect, useRef } from 'react';
+import { FreeCells } from '@/lib/freeCells';
+import { SnakeEngine, getOppositeDirection, initialSnake } from '@/lib/snakeEngine';
 
 export type Direction = 'UP' | 'DOWN' | 'LEFT' | 'RIGHT';
 export type GameMode = 'passthrough' | 'walls';
@@ -19,171 +21,122 @@ export interface GameState {
   gridSize: number;
 }
 
-const GRID_SIZE = 20;
-const INITIAL_SNAKE: Position[] = [
-  { x: 10, y: 10 },
-  { x: 9, y: 10 },
-  { x: 8, y: 10 },
-];
-
-const getRandomPosition = (gridSize: number, exclude: Position[] = []): Position => {
-  let pos: Position;
-  do {
-    pos = {
-      x: Math.floor(Math.random() * gridSize),
-      y: Math.floor(Math.random() * gridSize),
-    };
-  } while (exclude.some(p => p.x === pos.x && p.y === pos.y));
-  return pos;
+// Board sizes a game can be played on; 200x200 is the arena
+export const GRID_SIZES = [20, 50, 100, 200] as const;
+export type GridSize = typeof GRID_SIZES[number];
+export const DEFAULT_GRID_SIZE: GridSize = 20;
+
+// Free-cell index of a simulated game's board, created once per hook
+// instance and grid size. State updaters re-sync it from prev.snake, so it stays correct
+// when React replays an updater (StrictMode) or the state is replaced.
+const useFreeCells = (gridSize: number): FreeCells => {
+  const boardRef = useRef<FreeCells | null>(null);
+  if (boardRef.current === null || boardRef.current.width !== gridSize) {
+    boardRef.current = new FreeCells(gridSize);
+  }
+  return boardRef.current;
 };
 
-const getOppositeDirection = (dir: Direction): Direction => {
-  const opposites: Record<Direction, Direction> = {
-    UP: 'DOWN',
-    DOWN: 'UP',
-    LEFT: 'RIGHT',
-    RIGHT: 'LEFT',
-  };
-  return opposites[dir];
-};
-
-export function useSnakeGame(mode: GameMode = 'walls') {
-  const [gameState, setGameState] = useState<GameState>(() => ({
-    snake: [...INITIAL_SNAKE],
-    food: getRandomPosition(GRID_SIZE, INITIAL_SNAKE),
+const createInitialState = (mode: GameMode, status: GameStatus, board: FreeCells): GameState => {
+  const snake = initialSnake(board.width);
+  board.sync(snake);
+  return {
+    snake,
+    food: board.randomFree()!,
     direction: 'RIGHT',
     score: 0,
-    status: 'idle',
+    status,
     mode,
-    gridSize: GRID_SIZE,
-  }));
+    gridSize: board.width,
+  };
+};
 
-  const directionRef = useRef<Direction>(gameState.direction);
-  const nextDirectionRef = useRef<Direction | null>(null);
-  const gameLoopRef = useRef<number | null>(null);
+const samePosition = (a: Position, b: Position) => a.x === b.x && a.y === b.y;
+
+// Longest frame the loop catches up on, so a backgrounded tab does not
+// fast-forward the game when it becomes visible again
+const MAX_FRAME_TIME = 250;
+
+const requestFrame = (callback: (now: number) => void): number =>
+  typeof requestAnimationFrame === 'function'
+    ? requestAnimationFrame(callback)
+    : window.setTimeout(() => callback(performance.now()), 16);
+
+const cancelFrame = (handle: number) =>
+  typeof cancelAnimationFrame === 'function' ? cancelAnimationFrame(handle) : clearTimeout(handle);
+
+/**
+ * The player's game. A SnakeEngine held in a ref is advanced in fixed
+ * steps (stepInterval of the score) from a requestAnimationFrame loop with
+ * an accumulator, so moves keep their timing whatever the frame rate and a
+ * score change does not restart the loop. React state is a snapshot of the
+ * engine published at most once per frame, and only when a step happened.
+ */
+export function useSnakeGame(mode: GameMode = 'walls', gridSize: GridSize = DEFAULT_GRID_SIZE) {
+  const engineRef = useRef<SnakeEngine | null>(null);
+  if (engineRef.current === null) {
+    engineRef.current = new SnakeEngine(mode, gridSize);
+  }
+  const engine = engineRef.current;
+  const [gameState, setGameState] = useState<GameState>(() => engine.snapshot());
+
+  const publish = useCallback(() => {
+    setGameState(engine.snapshot());
+  }, [engine]);
 
   const resetGame = useCallback(() => {
-    const initialSnake = [...INITIAL_SNAKE];
-    setGameState({
-      snake: initialSnake,
-      food: getRandomPosition(GRID_SIZE, initialSnake),
-      direction: 'RIGHT',
-      score: 0,
-      status: 'idle',
-      mode,
-      gridSize: GRID_SIZE,
-    });
-    directionRef.current = 'RIGHT';
-    nextDirectionRef.current = null;
-  }, [mode]);
+    engine.reset(mode, gridSize);
+    publish();
+  }, [engine, mode, gridSize, publish]);
 
   const startGame = useCallback(() => {
-    setGameState(prev => ({ ...prev, status: 'playing' }));
-  }, []);
+    engine.setStatus('playing');
+    publish();
+  }, [engine, publish]);
 
   const pauseGame = useCallback(() => {
-    setGameState(prev => ({
-      ...prev,
-      status: prev.status === 'playing' ? 'paused' : 'playing',
-    }));
-  }, []);
+    engine.setStatus(engine.status === 'playing' ? 'paused' : 'playing');
+    publish();
+  }, [engine, publish]);
 
   const setDirection = useCallback((newDirection: Direction) => {
-    const currentDir = directionRef.current;
-    if (newDirection !== getOppositeDirection(currentDir) && newDirection !== currentDir) {
-      nextDirectionRef.current = newDirection;
-    }
-  }, []);
-
-  const moveSnake = useCallback(() => {
-    setGameState(prev => {
-      if (prev.status !== 'playing') return prev;
-
-      // Apply queued direction change
-      if (nextDirectionRef.current) {
-        directionRef.current = nextDirectionRef.current;
-        nextDirectionRef.current = null;
-      }
-
-      const direction = directionRef.current;
-      const head = prev.snake[0];
-      let newHead: Position;
+    engine.queueDirection(newDirection);
+  }, [engine]);
 
-      switch (direction) {
-        case 'UP':
-          newHead = { x: head.x, y: head.y - 1 };
-          break;
-        case 'DOWN':
-          newHead = { x: head.x, y: head.y + 1 };
-          break;
-        case 'LEFT':
-          newHead = { x: head.x - 1, y: head.y };
-          break;
-        case 'RIGHT':
-          newHead = { x: head.x + 1, y: head.y };
-          break;
-      }
-
-      // Handle wall collision based on mode
-      if (prev.mode === 'passthrough') {
-        // Wrap around
-        if (newHead.x < 0) newHead.x = prev.gridSize - 1;
-        if (newHead.x >= prev.gridSize) newHead.x = 0;
-        if (newHead.y < 0) newHead.y = prev.gridSize - 1;
-        if (newHead.y >= prev.gridSize) newHead.y = 0;
-      } else {
-        // Wall collision = game over
-        if (newHead.x < 0 || newHead.x >= prev.gridSize || 
-            newHead.y < 0 || newHead.y >= prev.gridSize) {
-          return { ...prev, status: 'gameover' as GameStatus, direction };
-        }
+  // Game loop
+  const playing = gameState.status === 'playing';
+  useEffect(() => {
+    if (!playing) return;
+    let last: number | null = null;
+    let accumulated = 0;
+    let frame = 0;
+
+    const tick = (now: number) => {
+      if (last !== null) {
+        accumulated += Math.min(now - last, MAX_FRAME_TIME);
       }
-
-      // Self collision check
-      if (prev.snake.some(segment => segment.x === newHead.x && segment.y === newHead.y)) {
-        return { ...prev, status: 'gameover' as GameStatus, direction };
+      last = now;
+      const version = engine.version;
+      while (engine.status === 'playing' && accumulated >= engine.stepInterval) {
+        accumulated -= engine.stepInterval;
+        engine.step();
       }
-
-      const newSnake = [newHead, ...prev.snake];
-      let newFood = prev.food;
-      let newScore = prev.score;
-
-      // Check food collision
-      if (newHead.x === prev.food.x && newHead.y === prev.food.y) {
-        newScore += 10;
-        newFood = getRandomPosition(prev.gridSize, newSnake);
-      } else {
-        newSnake.pop();
+      if (engine.version !== version) {
+        publish();
       }
-
-      return {
-        ...prev,
-        snake: newSnake,
-        food: newFood,
-        score: newScore,
-        direction,
-      };
-    });
-  }, []);
-
-  // Game loop
-  useEffect(() => {
-    if (gameState.status === 'playing') {
-      const speed = Math.max(50, 150 - Math.floor(gameState.score / 50) * 10);
-      gameLoopRef.current = window.setInterval(moveSnake, speed);
-    }
-
-    return () => {
-      if (gameLoopRef.current) {
-        clearInterval(gameLoopRef.current);
+      if (engine.status === 'playing') {
+        frame = requestFrame(tick);
       }
     };
-  }, [gameState.status, gameState.score, moveSnake]);
 
-  // Keyboard controls
+    frame = requestFrame(tick);
+    return () => cancelFrame(frame);
+  }, [playing, engine, publish]);
+
+  // Keyboard controls, registered once: the handler reads the engine
   useEffect(() => {
     const handleKeyDown = (e: KeyboardEvent) => {
-      if (gameState.status !== 'playing' && gameState.status !== 'paused') return;
+      if (engine.status !== 'playing' && engine.status !== 'paused') return;
 
       switch (e.key) {
         case 'ArrowUp':
@@ -219,7 +172,7 @@ export function useSnakeGame(mode: GameMode = 'walls') {
 
     window.addEventListener('keydown', handleKeyDown);
     return () => window.removeEventListener('keydown', handleKeyDown);
-  }, [gameState.status, setDirection, pauseGame]);
+  }, [engine, setDirection, pauseGame]);
 
   return {
     gameState,
@@ -231,20 +184,16 @@ export function useSnakeGame(mode: GameMode = 'walls') {
 }
 
 // Simulated game for watching others play
-export function useSimulatedGame(mode: GameMode = 'walls') {
-  const [gameState, setGameState] = useState<GameState>(() => ({
-    snake: [...INITIAL_SNAKE],
-    food: getRandomPosition(GRID_SIZE, INITIAL_SNAKE),
-    direction: 'RIGHT',
-    score: 0,
-    status: 'playing',
-    mode,
-    gridSize: GRID_SIZE,
-  }));
+export function useSimulatedGame(mode: GameMode = 'walls', gridSize: GridSize = DEFAULT_GRID_SIZE) {
+  const board = useFreeCells(gridSize);
+  const [gameState, setGameState] = useState<GameState>(() => createInitialState(mode, 'playing', board));
 
   const directionRef = useRef<Direction>('RIGHT');
 
   useEffect(() => {
+    // A new grid size comes with a new board: start over on it
+    setGameState(prev => (prev.gridSize === board.width ? prev : createInitialState(mode, 'playing', board)));
+
     const moveSnake = () => {
       setGameState(prev => {
         if (prev.status !== 'playing') return prev;
@@ -299,37 +248,36 @@ export function useSimulatedGame(mode: GameMode = 'walls') {
           if (newHead.x < 0 || newHead.x >= prev.gridSize || 
               newHead.y < 0 || newHead.y >= prev.gridSize) {
             // Reset instead of game over for simulation
-            return {
-              ...prev,
-              snake: [...INITIAL_SNAKE],
-              food: getRandomPosition(prev.gridSize, INITIAL_SNAKE),
-              direction: 'RIGHT',
-              score: 0,
-            };
+            return createInitialState(prev.mode, prev.status, board);
           }
         }
 
+        const newSnake = [newHead, ...prev.snake];
+        const ate = samePosition(newHead, prev.food);
+        board.sync(prev.snake);
+        // The tail moves out of the way unless the snake grows
+        if (!ate) {
+          board.release(newSnake.pop()!);
+        }
+
         // Self collision - reset
-        if (prev.snake.slice(0, -1).some(segment => segment.x === newHead.x && segment.y === newHead.y)) {
+        if (!board.isFree(newHead)) {
           directionRef.current = 'RIGHT';
-          return {
-            ...prev,
-            snake: [...INITIAL_SNAKE],
-            food: getRandomPosition(prev.gridSize, INITIAL_SNAKE),
-            direction: 'RIGHT',
-            score: 0,
-          };
+          return createInitialState(prev.mode, prev.status, board);
         }
 
-        const newSnake = [newHead, ...prev.snake];
+        board.occupy(newHead);
+        board.snake = newSnake;
         let newFood = prev.food;
         let newScore = prev.score;
 
-        if (newHead.x === prev.food.x && newHead.y === prev.food.y) {
+        if (ate) {
           newScore += 10;
-          newFood = getRandomPosition(prev.gridSize, newSnake);
-        } else {
-          newSnake.pop();
+          newFood = board.randomFree();
+          if (!newFood) {
+            directionRef.current = 'RIGHT';
+            return createInitialState(prev.mode, prev.status, board);
+          }
         }
 
         return {
@@ -344,7 +292,7 @@ export function useSimulatedGame(mode: GameMode = 'walls') {
 
     const interval = setInterval(moveSnake, 150);
     return () => clearInterval(interval);
-  }, [mode]);
+  }, [mode, board]);
 
   return gameState;
 }
@@ -0,0 +1,61 @@
+import { BoardRenderer } from './boardRenderer';
+import { describe, it, expect } from 'vitest';
+
+// Records the drawing calls a renderer makes (jsdom has no 2D context)
+const recordingContext = (width: number, height: number) => {
+  const calls: string[] = [];
+  const ctx = {
+    canvas: { width, height },
+    fillStyle: '',
+    clearRect: (x: number, y: number, w: number, h: number) => calls.push(`clear ${x},${y},${w},${h}`),
+    fillRect: (x: number, y: number, w: number, h: number) => calls.push(`fill ${x},${y},${w},${h}`),
+  };
+  return { ctx: ctx as unknown as CanvasRenderingContext2D, calls };
+};
+
+describe('BoardRenderer', () => {
+  const snake = [{ x: 2, y: 1 }, { x: 1, y: 1 }, { x: 0, y: 1 }];
+
+  it('should paint every cell of the first frame', () => {
+    const { ctx } = recordingContext(100, 100);
+    const renderer = new BoardRenderer(ctx, 10);
+
+    expect(renderer.render(snake, { x: 5, y: 5 })).toBe(4);
+  });
+
+  it('should only repaint the cells a move changes', () => {
+    const { ctx, calls } = recordingContext(100, 100);
+    const renderer = new BoardRenderer(ctx, 10);
+    renderer.render(snake, { x: 5, y: 5 });
+    calls.length = 0;
+
+    const moved = [{ x: 3, y: 1 }, ...snake.slice(0, 2)];
+    // New head, old head now body, tail cleared
+    expect(renderer.render(moved, { x: 5, y: 5 })).toBe(3);
+    expect(calls).toContain('clear 0,10,10,10');
+    expect(calls).toContain('fill 30,10,10,10');
+    expect(calls.filter(call => call.startsWith('fill'))).toHaveLength(2);
+
+    expect(renderer.render(moved, { x: 5, y: 5 })).toBe(0);
+  });
+
+  it('should repaint whatever the length of the snake', () => {
+    const { ctx } = recordingContext(200, 200);
+    const renderer = new BoardRenderer(ctx, 200);
+    const long = Array.from({ length: 150 }, (_, i) => ({ x: 150 - i, y: 100 }));
+    renderer.render(long, { x: 0, y: 0 });
+
+    const moved = [{ x: 151, y: 100 }, ...long.slice(0, -1)];
+    expect(renderer.render(moved, { x: 0, y: 0 })).toBe(3);
+  });
+
+  it('should repaint everything after a resize', () => {
+    const { ctx } = recordingContext(100, 100);
+    const renderer = new BoardRenderer(ctx, 10);
+    renderer.render(snake, { x: 5, y: 5 });
+
+    renderer.resize(200, 200);
+    expect(ctx.canvas.width).toBe(200);
+    expect(renderer.render(snake, { x: 5, y: 5 })).toBe(4);
+  });
+});
@@ -0,0 +1,157 @@
+import type { Position } from '@/hooks/useSnakeGame';
+
+export type BoardContext = CanvasRenderingContext2D | OffscreenCanvasRenderingContext2D;
+
+export interface BoardPalette {
+  head: string;
+  body: string;
+  food: string;
+}
+
+// Used when the theme's CSS variables cannot be read (e.g. in tests)
+export const DEFAULT_PALETTE: BoardPalette = {
+  head: 'hsl(160 100% 55%)',
+  body: 'hsl(160 80% 45%)',
+  food: 'hsl(0 100% 60%)',
+};
+
+const EMPTY = 0;
+const BODY = 1;
+const HEAD = 2;
+const FOOD = 3;
+
+/** Messages understood by workers/boardRenderer.worker.ts */
+export type BoardWorkerMessage =
+  | { type: 'init'; canvas: OffscreenCanvas; gridSize: number; palette: BoardPalette }
+  | { type: 'resize'; width: number; height: number }
+  | { type: 'render'; cells: Int32Array; food: number };
+
+/** Cell index (y * gridSize + x) of every segment, head first */
+export const toCellIndices = (snake: readonly Position[], gridSize: number, out?: Int32Array): Int32Array => {
+  const cells = out && out.length >= snake.length ? out : new Int32Array(snake.length);
+  for (let i = 0; i < snake.length; i++) {
+    cells[i] = snake[i].y * gridSize + snake[i].x;
+  }
+  return cells;
+};
+
+/**
+ * Draws a board onto a 2D context, repainting only the cells that changed.
+ *
+ * `drawn[index]` is what the canvas currently shows in each cell and
+ * `painted` lists the non-empty cells. Each render stamps the cells of the
+ * new frame with a generation number, paints those whose content differs
+ * and clears previously painted cells left unstamped. A normal move paints
+ * the new head and the old head and clears the tail: a handful of fillRect
+ * calls whatever the length of the snake.
+ */
+export class BoardRenderer {
+  readonly gridSize: number;
+  private ctx: BoardContext;
+  private palette: BoardPalette;
+  private drawn: Uint8Array;
+  private stamps: Uint32Array;
+  private generation = 0;
+  private painted: Int32Array;
+  private paintedCount = 0;
+  private next: Int32Array;
+  private indices = new Int32Array(0);
+
+  constructor(ctx: BoardContext, gridSize: number, palette: BoardPalette = DEFAULT_PALETTE) {
+    this.ctx = ctx;
+    this.gridSize = gridSize;
+    this.palette = palette;
+    const cells = gridSize * gridSize;
+    this.drawn = new Uint8Array(cells);
+    this.stamps = new Uint32Array(cells);
+    this.painted = new Int32Array(cells);
+    this.next = new Int32Array(cells);
+  }
+
+  /** Resize the backing canvas (device pixels); the next render repaints everything */
+  resize(width: number, height: number) {
+    this.ctx.canvas.width = width;
+    this.ctx.canvas.height = height;
+    this.invalidate();
+  }
+
+  /** Forget what is on the canvas and clear it */
+  invalidate() {
+    this.ctx.clearRect(0, 0, this.ctx.canvas.width, this.ctx.canvas.height);
+    this.drawn.fill(EMPTY);
+    this.paintedCount = 0;
+  }
+
+  render(snake: readonly Position[], food: Position | null): number {
+    this.indices = toCellIndices(snake, this.gridSize, this.indices);
+    return this.renderCells(this.indices, snake.length, food ? food.y * this.gridSize + food.x : -1);
+  }
+
+  /**
+   * Draw a frame given as cell indices, head first, and the food's index
+   * (-1 for none). Returns the number of cells painted or cleared.
+   */
+  renderCells(cells: ArrayLike<number>, length: number, food: number): number {
+    if (++this.generation === 0xffffffff) {
+      this.stamps.fill(0);
+      this.generation = 1;
+    }
+    const generation = this.generation;
+    const { drawn, stamps, next } = this;
+    let count = 0;
+    let changed = 0;
+
+    for (let i = 0; i < length; i++) {
+      const index = cells[i];
+      if (stamps[index] === generation) continue;
+      stamps[index] = generation;
+      next[count++] = index;
+      const kind = i === 0 ? HEAD : BODY;
+      if (drawn[index] !== kind) {
+        this.paint(index, kind);
+        changed++;
+      }
+    }
+    if (food >= 0 && stamps[food] !== generation) {
+      stamps[food] = generation;
+      next[count++] = food;
+      if (drawn[food] !== FOOD) {
+        this.paint(food, FOOD);
+        changed++;
+      }
+    }
+
+    for (let i = 0; i < this.paintedCount; i++) {
+      const index = this.painted[i];
+      if (stamps[index] !== generation) {
+        this.paint(index, EMPTY);
+        changed++;
+      }
+    }
+
+    this.next = this.painted;
+    this.painted = next;
+    this.paintedCount = count;
+    return changed;
+  }
+
+  private paint(index: number, kind: number) {
+    const { ctx, gridSize } = this;
+    const { width, height } = ctx.canvas;
+    const col = index % gridSize;
+    const row = (index - col) / gridSize;
+    // Cell edges rounded to whole pixels so neighbouring cells never overlap
+    const x = Math.round((col * width) / gridSize);
+    const y = Math.round((row * height) / gridSize);
+    const w = Math.round(((col + 1) * width) / gridSize) - x;
+    const h = Math.round(((row + 1) * height) / gridSize) - y;
+
+    ctx.clearRect(x, y, w, h);
+    this.drawn[index] = kind;
+    if (kind === EMPTY) return;
+    ctx.fillStyle = kind === HEAD ? this.palette.head : kind === FOOD ? this.palette.food : this.palette.body;
+    // A one pixel gap between body segments while cells are large enough to show it
+    const inset = kind === BODY && w >= 6 ? 1 : 0;
+    ctx.fillRect(x + inset, y + inset, w - 2 * inset, h - 2 * inset);
+  }
+}
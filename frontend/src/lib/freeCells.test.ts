@@ -0,0 +1,54 @@
+import { FreeCells } from './freeCells';
+import { describe, it, expect } from 'vitest';
+
+describe('FreeCells', () => {
+  it('should start with every cell free except the snake', () => {
+    const board = FreeCells.fromSnake(5, 4, [{ x: 0, y: 0 }, { x: 1, y: 0 }]);
+
+    expect(board.freeCount).toBe(18);
+    expect(board.isFree({ x: 0, y: 0 })).toBe(false);
+    expect(board.isFree({ x: 2, y: 0 })).toBe(true);
+  });
+
+  it('should only place food on free cells until the board is full', () => {
+    const board = new FreeCells(6);
+    const placed = new Set<string>();
+
+    for (let i = 0; i < 36; i++) {
+      const cell = board.randomFree();
+      expect(cell).not.toBeNull();
+      expect(board.isFree(cell!)).toBe(true);
+      board.occupy(cell!);
+      placed.add(`${cell!.x},${cell!.y}`);
+    }
+
+    expect(placed.size).toBe(36);
+    expect(board.randomFree()).toBeNull();
+  });
+
+  it('should make released cells available again', () => {
+    const board = new FreeCells(3);
+    for (let y = 0; y < 3; y++) {
+      for (let x = 0; x < 3; x++) board.occupy({ x, y });
+    }
+
+    board.release({ x: 2, y: 1 });
+    board.release({ x: 2, y: 1 });
+
+    expect(board.freeCount).toBe(1);
+    expect(board.randomFree()).toEqual({ x: 2, y: 1 });
+  });
+
+  it('should only rebuild when synced to a different snake', () => {
+    const snake = [{ x: 1, y: 1 }];
+    const board = FreeCells.fromSnake(4, 4, snake);
+    board.occupy({ x: 3, y: 3 });
+
+    board.sync(snake);
+    expect(board.isFree({ x: 3, y: 3 })).toBe(false);
+
+    board.sync([...snake]);
+    expect(board.isFree({ x: 3, y: 3 })).toBe(true);
+    expect(board.freeCount).toBe(15);
+  });
+});
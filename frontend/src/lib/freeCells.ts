@@ -0,0 +1,106 @@
+import type { Position } from '@/hooks/useSnakeGame';
+
+/**
+ * Index of the free cells of a grid, for O(1) food placement and collision
+ * checks regardless of snake length.
+ *
+ * `cells[0..size)` holds the indices (y * width + x) of the free cells in no
+ * particular order and `slots[index]` the position of a cell in `cells`, or
+ * -1 when it is occupied. Occupying a cell swaps the last free cell into its
+ * slot; releasing appends it.
+ */
+export class FreeCells {
+  readonly width: number;
+  readonly height: number;
+  /** Snake the index currently reflects, see sync() */
+  snake: readonly Position[] | null = null;
+  private cells: Int32Array;
+  private slots: Int32Array;
+  private size = 0;
+
+  constructor(width: number, height: number = width) {
+    this.width = width;
+    this.height = height;
+    this.cells = new Int32Array(width * height);
+    this.slots = new Int32Array(width * height);
+    this.clear();
+  }
+
+  static fromSnake(width: number, height: number, snake: readonly Position[]): FreeCells {
+    const board = new FreeCells(width, height);
+    board.sync(snake);
+    return board;
+  }
+
+  /** Mark every cell free */
+  clear() {
+    for (let i = 0; i < this.cells.length; i++) {
+      this.cells[i] = i;
+      this.slots[i] = i;
+    }
+    this.size = this.cells.length;
+    this.snake = null;
+  }
+
+  /** Rebuild from a snake (O(cells)) unless the index already reflects it */
+  sync(snake: readonly Position[]) {
+    if (this.snake === snake) return;
+    this.clear();
+    for (const segment of snake) this.occupy(segment);
+    this.snake = snake;
+  }
+
+  get freeCount(): number {
+    return this.size;
+  }
+
+  private index(p: Position): number {
+    return p.y * this.width + p.x;
+  }
+
+  isFree(p: Position): boolean {
+    return this.isFreeCell(this.index(p));
+  }
+
+  occupy(p: Position) {
+    this.occupyCell(this.index(p));
+  }
+
+  release(p: Position) {
+    this.releaseCell(this.index(p));
+  }
+
+  // Cell-index variants, for callers that keep positions as y * width + x
+
+  isFreeCell(index: number): boolean {
+    return this.slots[index] !== -1;
+  }
+
+  occupyCell(index: number) {
+    const slot = this.slots[index];
+    if (slot === -1) return;
+    const last = this.cells[--this.size];
+    this.cells[slot] = last;
+    this.slots[last] = slot;
+    this.slots[index] = -1;
+  }
+
+  releaseCell(index: number) {
+    if (this.slots[index] !== -1) return;
+    this.cells[this.size] = index;
+    this.slots[index] = this.size++;
+  }
+
+  /** Index of a uniformly random free cell, or -1 when the board is full */
+  randomFreeCell(random: () => number = Math.random): number {
+    if (this.size === 0) return -1;
+    return this.cells[Math.floor(random() * this.size)];
+  }
+
+  /** Uniformly random free cell, or null when the board is full */
+  randomFree(random: () => number = Math.random): Position | null {
+    const index = this.randomFreeCell(random);
+    if (index === -1) return null;
+    return { x: index % this.width, y: Math.floor(index / this.width) };
+  }
+}
@@ -0,0 +1,30 @@
+import { SnakeBody } from './snakeBody';
+import { describe, it, expect } from 'vitest';
+
+describe('SnakeBody', () => {
+  it('should keep segments head first across wrap-around', () => {
+    const body = new SnakeBody(2);
+    body.reset([{ x: 1, y: 0 }, { x: 0, y: 0 }]);
+
+    // Move around the 2x2 board more times than the buffer has slots
+    const loop = [3, 2, 0, 1];
+    for (let i = 0; i < 10; i++) {
+      body.pushHead(loop[i % 4]);
+      body.popTail();
+    }
+
+    expect(body.length).toBe(2);
+    expect(body.head).toBe(loop[9 % 4]);
+    expect(body.toPositions()).toEqual([{ x: 0, y: 1 }, { x: 1, y: 1 }]);
+  });
+
+  it('should grow when the tail is not popped', () => {
+    const body = new SnakeBody(5);
+    body.reset([{ x: 2, y: 2 }]);
+    body.pushHead(13);
+
+    expect(body.length).toBe(2);
+    expect(body.popTail()).toBe(12);
+    expect(body.toPositions()).toEqual([{ x: 3, y: 2 }]);
+  });
+});
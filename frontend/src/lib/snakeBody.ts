@@ -0,0 +1,61 @@
+import type { Position } from '@/hooks/useSnakeGame';
+
+/**
+ * A snake's segments as cell indices (y * width + x) in a ring buffer, head
+ * first. Moving pushes a head and pops the tail in O(1) without allocating;
+ * the buffer holds a snake covering the whole board, so it never grows.
+ */
+export class SnakeBody {
+  readonly width: number;
+  private cells: Int32Array;
+  private start = 0;
+  private count = 0;
+
+  constructor(width: number, height: number = width) {
+    this.width = width;
+    this.cells = new Int32Array(width * height);
+  }
+
+  get length(): number {
+    return this.count;
+  }
+
+  get head(): number {
+    return this.cells[this.start];
+  }
+
+  /** Cell index of segment i, 0 being the head */
+  at(i: number): number {
+    return this.cells[(this.start + i) % this.cells.length];
+  }
+
+  /** Replace the segments, head first */
+  reset(segments: readonly Position[]) {
+    this.start = 0;
+    this.count = segments.length;
+    segments.forEach((segment, i) => {
+      this.cells[i] = segment.y * this.width + segment.x;
+    });
+  }
+
+  pushHead(index: number) {
+    this.start = (this.start - 1 + this.cells.length) % this.cells.length;
+    this.cells[this.start] = index;
+    this.count++;
+  }
+
+  /** Remove the tail and return its cell index */
+  popTail(): number {
+    this.count--;
+    return this.cells[(this.start + this.count) % this.cells.length];
+  }
+
+  toPositions(): Position[] {
+    const positions = new Array<Position>(this.count);
+    for (let i = 0; i < this.count; i++) {
+      const index = this.at(i);
+      positions[i] = { x: index % this.width, y: (index - (index % this.width)) / this.width };
+    }
+    return positions;
+  }
+}
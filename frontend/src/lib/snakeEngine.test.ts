@@ -0,0 +1,67 @@
+import { SnakeEngine, stepInterval } from './snakeEngine';
+import { describe, it, expect } from 'vitest';
+
+describe('SnakeEngine', () => {
+  // Always the first free cell: food starts in the top-left corner
+  const first = () => 0;
+
+  it('should move one cell per step once playing', () => {
+    const engine = new SnakeEngine('walls', 20, first);
+    engine.step();
+    expect(engine.snapshot().snake[0]).toEqual({ x: 10, y: 10 });
+
+    engine.setStatus('playing');
+    engine.queueDirection('DOWN');
+    engine.step();
+
+    const { snake, direction } = engine.snapshot();
+    expect(direction).toBe('DOWN');
+    expect(snake).toEqual([{ x: 10, y: 11 }, { x: 10, y: 10 }, { x: 9, y: 10 }]);
+  });
+
+  it('should ignore reversing onto the snake', () => {
+    const engine = new SnakeEngine('walls', 20, first);
+    engine.setStatus('playing');
+    engine.queueDirection('LEFT');
+    engine.step();
+
+    expect(engine.snapshot().snake[0]).toEqual({ x: 11, y: 10 });
+  });
+
+  it('should wrap in passthrough mode and end the game at a wall otherwise', () => {
+    const wrapping = new SnakeEngine('passthrough', 5, first);
+    const walled = new SnakeEngine('walls', 5, first);
+    for (const engine of [wrapping, walled]) {
+      engine.setStatus('playing');
+      for (let i = 0; i < 3; i++) engine.step();
+    }
+
+    expect(wrapping.status).toBe('playing');
+    expect(wrapping.snapshot().snake[0]).toEqual({ x: 0, y: 2 });
+    expect(walled.status).toBe('gameover');
+  });
+
+  it('should grow and score when eating, placing food off the snake', () => {
+    const engine = new SnakeEngine('passthrough', 5, first);
+    expect(engine.snapshot().food).toEqual({ x: 0, y: 0 });
+    engine.setStatus('playing');
+    engine.queueDirection('UP');
+    engine.step();
+    engine.step();
+    engine.queueDirection('LEFT');
+    engine.step();
+    engine.step();
+
+    const { snake, score, food } = engine.snapshot();
+    expect(snake[0]).toEqual({ x: 0, y: 0 });
+    expect(score).toBe(10);
+    expect(snake).toHaveLength(4);
+    expect(snake.some(segment => segment.x === food.x && segment.y === food.y)).toBe(false);
+  });
+
+  it('should speed up as the score grows', () => {
+    expect(stepInterval(0)).toBe(150);
+    expect(stepInterval(100)).toBe(130);
+    expect(stepInterval(10000)).toBe(50);
+  });
+});
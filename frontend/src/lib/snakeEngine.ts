@@ -0,0 +1,160 @@
+import type { Direction, GameMode, GameState, GameStatus, Position } from '@/hooks/useSnakeGame';
+import { FreeCells } from './freeCells';
+import { SnakeBody } from './snakeBody';
+
+const FOOD_POINTS = 10;
+
+const OFFSETS: Record<Direction, [number, number]> = {
+  UP: [0, -1],
+  DOWN: [0, 1],
+  LEFT: [-1, 0],
+  RIGHT: [1, 0],
+};
+
+export const getOppositeDirection = (dir: Direction): Direction => {
+  const opposites: Record<Direction, Direction> = {
+    UP: 'DOWN',
+    DOWN: 'UP',
+    LEFT: 'RIGHT',
+    RIGHT: 'LEFT',
+  };
+  return opposites[dir];
+};
+
+// Three segments facing right from the centre; (10, 10) on the classic board
+export const initialSnake = (gridSize: number): Position[] => {
+  const centre = Math.floor(gridSize / 2);
+  return [
+    { x: centre, y: centre },
+    { x: centre - 1, y: centre },
+    { x: centre - 2, y: centre },
+  ];
+};
+
+// Milliseconds per move: 150, 10 less every 50 points, down to 50
+export const stepInterval = (score: number) => Math.max(50, 150 - Math.floor(score / 50) * 10);
+
+/**
+ * Mutable state of one game, advanced a step at a time.
+ *
+ * The snake lives in a SnakeBody ring buffer and occupancy in a FreeCells
+ * index, both sized for the board once, so a step allocates nothing unless
+ * food is eaten. `version` changes with every change of state; snapshot()
+ * builds the immutable GameState React renders from.
+ */
+export class SnakeEngine {
+  mode: GameMode;
+  gridSize: number;
+  direction: Direction = 'RIGHT';
+  score = 0;
+  status: GameStatus = 'idle';
+  version = 0;
+  private board: FreeCells;
+  private body: SnakeBody;
+  private food = -1;
+  private nextDirection: Direction | null = null;
+  private random: () => number;
+
+  constructor(mode: GameMode, gridSize: number, random: () => number = Math.random) {
+    this.mode = mode;
+    this.gridSize = gridSize;
+    this.random = random;
+    this.board = new FreeCells(gridSize);
+    this.body = new SnakeBody(gridSize);
+    this.reset(mode, gridSize);
+  }
+
+  reset(mode: GameMode = this.mode, gridSize: number = this.gridSize, status: GameStatus = 'idle') {
+    if (gridSize !== this.gridSize) {
+      this.board = new FreeCells(gridSize);
+      this.body = new SnakeBody(gridSize);
+    }
+    this.mode = mode;
+    this.gridSize = gridSize;
+    const snake = initialSnake(gridSize);
+    this.body.reset(snake);
+    this.board.sync(snake);
+    this.food = this.board.randomFreeCell(this.random);
+    this.direction = 'RIGHT';
+    this.nextDirection = null;
+    this.score = 0;
+    this.status = status;
+    this.version++;
+  }
+
+  setStatus(status: GameStatus) {
+    if (status === this.status) return;
+    this.status = status;
+    this.version++;
+  }
+
+  /** Turn on the next step; reversing onto the snake is ignored */
+  queueDirection(direction: Direction) {
+    if (direction !== getOppositeDirection(this.direction) && direction !== this.direction) {
+      this.nextDirection = direction;
+    }
+  }
+
+  get stepInterval(): number {
+    return stepInterval(this.score);
+  }
+
+  step() {
+    if (this.status !== 'playing') return;
+    this.version++;
+
+    if (this.nextDirection) {
+      this.direction = this.nextDirection;
+      this.nextDirection = null;
+    }
+
+    const size = this.gridSize;
+    const head = this.body.head;
+    const [dx, dy] = OFFSETS[this.direction];
+    let x = (head % size) + dx;
+    let y = (head - (head % size)) / size + dy;
+
+    if (this.mode === 'passthrough') {
+      x = (x + size) % size;
+      y = (y + size) % size;
+    } else if (x < 0 || x >= size || y < 0 || y >= size) {
+      this.status = 'gameover';
+      return;
+    }
+
+    // As before, moving into the current tail cell is a collision
+    const next = y * size + x;
+    if (!this.board.isFreeCell(next)) {
+      this.status = 'gameover';
+      return;
+    }
+
+    this.body.pushHead(next);
+    this.board.occupyCell(next);
+
+    if (next === this.food) {
+      this.score += FOOD_POINTS;
+      const food = this.board.randomFreeCell(this.random);
+      if (food === -1) {
+        // The snake fills the board
+        this.status = 'gameover';
+        return;
+      }
+      this.food = food;
+    } else {
+      this.board.releaseCell(this.body.popTail());
+    }
+  }
+
+  snapshot(): GameState {
+    return {
+      snake: this.body.toPositions(),
+      food: { x: this.food % this.gridSize, y: Math.floor(this.food / this.gridSize) },
+      direction: this.direction,
+      score: this.score,
+      status: this.status,
+      mode: this.mode,
+      gridSize: this.gridSize,
+    };
+  }
+}
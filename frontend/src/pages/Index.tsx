@@ -3,14 +3,15 @@ import { Header } from '@/components/Header';
 import { GameBoard } from '@/components/game/GameBoard';
 import { GameControls } from '@/components/game/GameControls';
 import { ModeSelector } from '@/components/game/ModeSelector';
+import { GridSizeSelector } from '@/components/game/GridSizeSelector';
 import { GameOverModal } from '@/components/game/GameOverModal';
 import { AuthModal } from '@/components/auth/AuthModal';
 import { Leaderboard } from '@/components/Leaderboard';
 import { LiveGames } from '@/components/LiveGames';
 import { WatchGame } from '@/components/WatchGame';
 import { useAuth } from '@/hooks/useAuth';
-import { useSnakeGame, GameMode } from '@/hooks/useSnakeGame';
-import { leaderboardApi } from '@/api/mockApi';
+import { useSnakeGame, GameMode, GridSize, GRID_SIZES, DEFAULT_GRID_SIZE } from '@/hooks/useSnakeGame';
+import { ActiveGame, leaderboardApi } from '@/api/mockApi';
 import { useToast } from '@/hooks/use-toast';
 
 type View = 'game' | 'leaderboard' | 'watch';
@@ -19,22 +20,24 @@ interface WatchingState {
   gameId: string;
   playerName: string;
   mode: GameMode;
+  gridSize: GridSize;
 }
 
 const Index = () => {
   const { user, login, signup, logout } = useAuth();
   const [currentView, setCurrentView] = useState<View>('game');
   const [gameMode, setGameMode] = useState<GameMode>('walls');
+  const [gridSize, setGridSize] = useState<GridSize>(DEFAULT_GRID_SIZE);
   const [showAuthModal, setShowAuthModal] = useState(false);
   const [watching, setWatching] = useState<WatchingState | null>(null);
   const { toast } = useToast();
   
-  const { gameState, startGame, pauseGame, resetGame, setDirection } = useSnakeGame(gameMode);
+  const { gameState, startGame, pauseGame, resetGame, setDirection } = useSnakeGame(gameMode, gridSize);
 
-  // Reset game when mode changes
+  // Reset game when mode or grid size changes
   useEffect(() => {
     resetGame();
-  }, [gameMode, resetGame]);
+  }, [gameMode, gridSize, resetGame]);
 
   // Submit score when game ends
   useEffect(() => {
@@ -43,6 +46,7 @@ const Index = () => {
         leaderboardApi.submitScore({
           score: gameState.score,
           mode: gameState.mode,
+          gridSize: gameState.gridSize,
         }).then(result => {
           if (result.success && result.rank && result.rank <= 10) {
             toast({
@@ -53,7 +57,7 @@ const Index = () => {
         });
       }
     }
-  }, [gameState.status, gameState.score, gameState.mode, user, toast]);
+  }, [gameState.status, gameState.score, gameState.mode, gameState.gridSize, user, toast]);
 
   const handleModeChange = useCallback((mode: GameMode) => {
     if (gameState.status === 'idle' || gameState.status === 'gameover') {
@@ -61,27 +65,27 @@ const Index = () => {
     }
   }, [gameState.status]);
 
+  const handleGridSizeChange = useCallback((size: GridSize) => {
+    if (gameState.status === 'idle' || gameState.status === 'gameover') {
+      setGridSize(size);
+    }
+  }, [gameState.status]);
+
   const handleGoHome = useCallback(() => {
     resetGame();
     setCurrentView('game');
   }, [resetGame]);
 
-  const handleWatchGame = useCallback((gameId: string) => {
-    // Mock data for watching
-    const mockPlayers: Record<string, { name: string; mode: GameMode }> = {
-      'game1': { name: 'LivePlayer1', mode: 'walls' },
-      'game2': { name: 'LivePlayer2', mode: 'passthrough' },
-      'game3': { name: 'LivePlayer3', mode: 'walls' },
-    };
-    
-    const player = mockPlayers[gameId];
-    if (player) {
-      setWatching({
-        gameId,
-        playerName: player.name,
-        mode: player.mode,
-      });
-    }
+  const handleWatchGame = useCallback((game: ActiveGame) => {
+    setWatching({
+      gameId: game.id,
+      playerName: game.username,
+      mode: game.mode,
+      // Boards the client cannot draw fall back to the classic one
+      gridSize: (GRID_SIZES as readonly number[]).includes(game.gridSize)
+        ? game.gridSize as GridSize
+        : DEFAULT_GRID_SIZE,
+    });
   }, []);
 
   const handleBackFromWatch = useCallback(() => {
@@ -116,10 +120,17 @@ const Index = () => {
                   disabled={gameState.status === 'playing' || gameState.status === 'paused'}
                 />
               </div>
+              <div className="flex justify-center mt-4">
+                <GridSizeSelector
+                  gridSize={gridSize}
+                  onGridSizeChange={handleGridSizeChange}
+                  disabled={gameState.status === 'playing' || gameState.status === 'paused'}
+                />
+              </div>
             </div>
 
             <div className="flex justify-center">
-              <GameBoard gameState={gameState} />
+              <GameBoard gameState={gameState} renderer="canvas" />
             </div>
 
             <GameControls
@@ -162,6 +173,7 @@ const Index = () => {
               <WatchGame
                 playerName={watching.playerName}
                 mode={watching.mode}
+                gridSize={watching.gridSize}
                 onBack={handleBackFromWatch}
               />
             ) : (
@@ -0,0 +1,21 @@
+// Draws a GameBoard's OffscreenCanvas off the main thread (renderer="offscreen")
+import { BoardRenderer, BoardWorkerMessage } from '@/lib/boardRenderer';
+
+let renderer: BoardRenderer | null = null;
+
+self.addEventListener('message', (event: MessageEvent<BoardWorkerMessage>) => {
+  const message = event.data;
+  switch (message.type) {
+    case 'init': {
+      const ctx = message.canvas.getContext('2d');
+      renderer = ctx ? new BoardRenderer(ctx, message.gridSize, message.palette) : null;
+      break;
+    }
+    case 'resize':
+      renderer?.resize(message.width, message.height);
+      break;
+    case 'render':
+      renderer?.renderCells(message.cells, message.cells.length, message.food);
+      break;
+  }
+});